@@ -0,0 +1,626 @@
+# MEMORY ENGINE BENCHMARKS - v3.2
+# Reproducible scaling benchmarks for the Memory Engine
+#
+# Seeded synthetic corpus built from the engine's own theme_keywords and
+# importance-marker vocabulary, with a tunable near-duplicate rate so
+# Form 6 merges happen at a realistic pace.
+#
+#   python memory_engine_bench.py --sizes 1000 10000 100000 --output bench.json
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from memory_engine_v3_1 import MemoryEngine, QueryRecorder, RecallCache
+
+
+BENCH_VERSION = '3.2'
+BASE_DATE = datetime(2025, 1, 1)
+RECALL_TIME = '2026-01-15T12:00:00'
+
+
+# ==============================================================================
+# SYNTHETIC CORPUS
+# ==============================================================================
+
+class SyntheticCorpus:
+    """
+    Seeded generator of conversation segments.
+
+    Messages mix one theme's keywords, importance-marker phrases, a filler
+    vocabulary (including hyphenated and apostrophe-joined names the
+    tokenizer preserves) and stopwords. With probability duplicate_rate a
+    segment is a lightly perturbed copy of an earlier one, which is what
+    Form 6 interference is designed to absorb.
+    """
+
+    STOPWORDS = ('the', 'and', 'of', 'to', 'is', 'with', 'that', 'this', 'for', 'on')
+
+    def __init__(self, seed: int = 7, duplicate_rate: float = 0.2,
+                 vocab_size: int = 20000, messages_per_segment: int = 5,
+                 words_per_message: int = 18, span_days: int = 365,
+                 engine: Optional[MemoryEngine] = None):
+        engine = engine if engine is not None else MemoryEngine()
+        self.seed = seed
+        self.duplicate_rate = duplicate_rate
+        self.messages_per_segment = messages_per_segment
+        self.words_per_message = words_per_message
+        self.span_days = span_days
+        self.theme_keywords = {t: sorted(k) for t, k in engine.theme_keywords.items()}
+        self.themes = sorted(self.theme_keywords)
+        self.markers = sorted(m for phrases in engine.IMPORTANCE_MARKERS.values() for m in phrases)
+        rng = random.Random(seed ^ 0x5EED)
+        self.filler = [self._coin(rng, i) for i in range(vocab_size)]
+
+    @staticmethod
+    def _coin(rng: random.Random, i: int) -> str:
+        stem = ''.join(rng.choice('aeioulmnrstvkyz') for _ in range(rng.randint(4, 8)))
+        roll = rng.random()
+        if roll < 0.05:
+            return f"{stem}-{i}"
+        if roll < 0.08:
+            return f"{stem}'{stem[:3]}"
+        return f"{stem}{i}"
+
+    def _message(self, rng: random.Random, theme: str) -> str:
+        keywords = self.theme_keywords[theme]
+        words = []
+        for _ in range(self.words_per_message):
+            roll = rng.random()
+            if roll < 0.25:
+                words.append(rng.choice(keywords))
+            elif roll < 0.32:
+                words.append(rng.choice(self.markers))
+            elif roll < 0.50:
+                words.append(rng.choice(self.STOPWORDS))
+            else:
+                words.append(rng.choice(self.filler))
+        return ' '.join(words)
+
+    def segments(self, n: int, offset: int = 0) -> Iterator[Dict]:
+        """
+        Yield n segments as {'messages', 'timestamp', 'context'} dicts.
+
+        The stream is a pure function of (seed, offset, n), so separate
+        calls with different offsets never repeat each other.
+        """
+        rng = random.Random(self.seed * 1_000_003 + offset)
+        recent: List[Dict] = []
+        for i in range(n):
+            stamp = (BASE_DATE + timedelta(
+                days=(offset + i) * self.span_days / max(n + offset, 1),
+                minutes=rng.randint(0, 600))).isoformat()
+            if recent and rng.random() < self.duplicate_rate:
+                source = rng.choice(recent)
+                messages = list(source['messages'])
+                k = rng.randrange(len(messages))
+                words = messages[k].split()
+                words[rng.randrange(len(words))] = rng.choice(self.filler)
+                messages[k] = ' '.join(words)
+                theme = source['context']['theme']
+            else:
+                theme = rng.choice(self.themes)
+                messages = [self._message(rng, theme) for _ in range(self.messages_per_segment)]
+            segment = {'messages': messages, 'timestamp': stamp, 'context': {'theme': theme}}
+            recent.append(segment)
+            if len(recent) > 256:
+                recent.pop(0)
+            yield segment
+
+    def queries(self, n: int, terms: int = 3) -> List[str]:
+        rng = random.Random(self.seed * 7919 + n)
+        out = []
+        for _ in range(n):
+            theme = rng.choice(self.themes)
+            pool = self.theme_keywords[theme] + self.filler[:2000]
+            out.append(' '.join(rng.choice(pool) for _ in range(terms)))
+        return out
+
+
+# ==============================================================================
+# MEASUREMENT
+# ==============================================================================
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def measure(calls: List[Callable[[], object]], track_memory: bool = False) -> Dict:
+    """
+    Time each call and summarize: count, wall seconds, ops/sec and p50/p95/p99
+    latency (ms). With track_memory the phase runs under tracemalloc and
+    peak_kib records the peak traced allocation — timings taken that way
+    are inflated several-fold, so run_scenario uses a separate pass.
+    """
+    if track_memory:
+        tracemalloc.start()
+    latencies = []
+    started = time.perf_counter()
+    for call in calls:
+        t0 = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - t0)
+    wall = time.perf_counter() - started
+    peak = None
+    if track_memory:
+        peak = tracemalloc.get_traced_memory()[1] / 1024.0
+        tracemalloc.stop()
+    latencies.sort()
+    return {
+        'count': len(latencies),
+        'wall_s': round(wall, 6),
+        'ops_per_sec': round(len(latencies) / wall, 3) if wall > 0 else None,
+        'p50_ms': round(_percentile(latencies, 50) * 1000.0, 4),
+        'p95_ms': round(_percentile(latencies, 95) * 1000.0, 4),
+        'p99_ms': round(_percentile(latencies, 99) * 1000.0, 4),
+        'peak_kib': round(peak, 1) if peak is not None else None,
+    }
+
+
+def seed_codex(engine: MemoryEngine, scrolls: List[Dict]) -> None:
+    """
+    Bulk-import pre-compressed scrolls without Form 6, then rebuild the
+    derived index and df_index — the fast path for building large codices.
+    """
+    for scroll in scrolls:
+        engine.scrolls.append(scroll)
+        idx = len(engine.scrolls) - 1
+        engine.access_log[idx] = scroll['timestamp']
+        theme = scroll['context'].get('theme', 'general')
+        entry = engine.codex.setdefault(theme, {
+            'scrolls': [], 'cumulative_importance': 0.0,
+            'last_accessed': scroll['timestamp']})
+        entry['scrolls'].append(idx)
+        entry['cumulative_importance'] += scroll['total_importance']
+        entry['last_accessed'] = scroll['timestamp']
+    engine.rebuild_index()
+
+
+def hashing_accuracy(engine: MemoryEngine, queries: List[str], dims: List[int],
+                     top_n: int = 10, precisions: Tuple[str, ...] = ('float32',),
+                     rescore: int = 0) -> Dict:
+    """
+    Compare feature-hashed recall (MemoryEngine(hash_dim=D)) with exact
+    TF-IDF recall on the same codex and queries.
+
+    For each D and row precision, without rescoring and (if rescore) with
+    hash_rescore=rescore: recall latency, scoring-matrix bytes,
+    memory_saved (vs float32 rows of the same D), top1 (share of queries
+    whose best scroll matches exact) and overlap@n (mean share of exact
+    top_n also returned, i.e. recall@n agreement). Recalls are read-only
+    so every engine sees identical access times.
+    """
+    def top(target: MemoryEngine, query: str) -> List[int]:
+        return [id(r['essence']) for r in
+                target.recall(query, top_n=top_n, current_time=RECALL_TIME, touch=False)]
+
+    exact = [top(engine, q) for q in queries]
+    report = {'top_n': top_n, 'queries': len(queries),
+              'exact': measure([lambda q=q: top(engine, q) for q in queries])}
+    for dim in dims:
+        for precision in precisions:
+            for rescored in sorted({0, rescore}):
+                hashed = MemoryEngine(**dict(engine._config_dict(), hash_dim=dim,
+                                             hash_precision=precision, hash_rescore=rescored))
+                seed_codex(hashed, engine.scrolls)
+                space = hashed._current_hashed()
+                results = [top(hashed, q) for q in queries]
+                stats = measure([lambda q=q: top(hashed, q) for q in queries])
+                full = space.matrix.size * 4 + space.df.nbytes
+                stats.update({
+                    'matrix_bytes': space.nbytes,
+                    'memory_saved': round(1.0 - space.nbytes / full, 4),
+                    'top1': round(sum(h[:1] == e[:1] for h, e in zip(results, exact))
+                                  / max(len(queries), 1), 4),
+                    f'overlap@{top_n}': round(sum(len(set(h) & set(e)) / max(len(e), 1)
+                                                  for h, e in zip(results, exact))
+                                              / max(len(queries), 1), 4),
+                })
+                key = f'hash_dim={dim}/{precision}' + (f'+rescore{rescored}' if rescored else '')
+                report[key] = stats
+                del hashed, space
+    return report
+
+
+def clustering_accuracy(engine: MemoryEngine, queries: List[str], nprobes: List[int],
+                        n_clusters: Optional[int] = None, top_n: int = 10) -> Dict:
+    """
+    Compare two-stage clustered recall (MemoryEngine(n_clusters=K)) with
+    exact recall on the same codex and queries.
+
+    K defaults to √n. Reports the partition build time, then for each
+    nprobe the recall latency, top1 and overlap@n as in hashing_accuracy.
+    """
+    def top(target: MemoryEngine, query: str) -> List[int]:
+        return [id(r['essence']) for r in
+                target.recall(query, top_n=top_n, current_time=RECALL_TIME, touch=False)]
+
+    n_clusters = n_clusters or max(1, round(math.sqrt(len(engine.scrolls))))
+    exact = [top(engine, q) for q in queries]
+    clustered = MemoryEngine(**dict(engine._config_dict(), n_clusters=n_clusters))
+    seed_codex(clustered, engine.scrolls)
+    report = {'top_n': top_n, 'queries': len(queries), 'n_clusters': n_clusters,
+              'build': measure([clustered.rebalance_clusters])}
+    for nprobe in nprobes:
+        clustered.nprobe = nprobe
+        results = [top(clustered, q) for q in queries]
+        stats = measure([lambda q=q: top(clustered, q) for q in queries])
+        stats.update({
+            'top1': round(sum(c[:1] == e[:1] for c, e in zip(results, exact))
+                          / max(len(queries), 1), 4),
+            f'overlap@{top_n}': round(sum(len(set(c) & set(e)) / max(len(e), 1)
+                                          for c, e in zip(results, exact))
+                                      / max(len(queries), 1), 4),
+        })
+        report[f'nprobe={nprobe}'] = stats
+    return report
+
+
+# ==============================================================================
+# SCENARIOS
+# ==============================================================================
+
+def run_scenario(n_scrolls: int, corpus: SyntheticCorpus, ops: int = 200,
+                 dream_scrolls: int = 500, io_repeats: int = 3,
+                 track_memory: bool = True,
+                 engine_factory: Callable[[], MemoryEngine] = MemoryEngine,
+                 hash_dims: Optional[List[int]] = None,
+                 hash_precisions: Tuple[str, ...] = ('float32',),
+                 hash_rescore: int = 0,
+                 nprobes: Optional[List[int]] = None) -> Dict:
+    """
+    Build an n_scrolls codex and benchmark every public operation on it.
+
+    compress_to_scroll is timed over all n segments; the codex is then
+    seeded in bulk. update_codex (with Form 6), recall and MaxScore-pruned
+    recall (prune='bounded') are timed over `ops` further calls against
+    the full codex, and recall_cached replays them through a RecallCache
+    cycling over 10 distinct queries; dream_consolidate runs on a fresh engine holding the
+    first dream_scrolls scrolls (the pass is O(n²)); export/load
+    round-trip io_repeats times.
+
+    Timings come from a clean pass. With track_memory the identical
+    (seeded) workload is replayed under tracemalloc for peak_kib.
+    hash_dims adds a hashing_accuracy comparison (over hash_precisions,
+    with and without hash_rescore) to the clean pass, and nprobes a
+    clustering_accuracy comparison.
+    """
+    args = (n_scrolls, corpus, ops, dream_scrolls, io_repeats, engine_factory)
+    scenario = _scenario_pass(*args, track_memory=False, hash_dims=hash_dims,
+                              hash_precisions=hash_precisions, hash_rescore=hash_rescore,
+                              nprobes=nprobes)
+    if track_memory:
+        traced = _scenario_pass(*args, track_memory=True)
+        for op, metrics in scenario['operations'].items():
+            metrics['peak_kib'] = traced['operations'][op]['peak_kib']
+    return scenario
+
+
+def _scenario_pass(n_scrolls: int, corpus: SyntheticCorpus, ops: int,
+                   dream_scrolls: int, io_repeats: int,
+                   engine_factory: Callable[[], MemoryEngine],
+                   track_memory: bool, hash_dims: Optional[List[int]] = None,
+                   hash_precisions: Tuple[str, ...] = ('float32',),
+                   hash_rescore: int = 0,
+                   nprobes: Optional[List[int]] = None) -> Dict:
+    engine = engine_factory()
+    results: Dict[str, Dict] = {}
+
+    segments = list(corpus.segments(n_scrolls))
+    scrolls: List[Dict] = []
+    results['compress_to_scroll'] = measure(
+        [lambda s=s: scrolls.append(engine.compress_to_scroll(
+            s['messages'], s['timestamp'], s['context'])) for s in segments],
+        track_memory)
+    del segments
+
+    results['rebuild_index'] = measure([lambda: seed_codex(engine, scrolls)], track_memory)
+
+    extra = [engine.compress_to_scroll(s['messages'], s['timestamp'], s['context'])
+             for s in corpus.segments(ops, offset=n_scrolls)]
+    actions: List[str] = []
+    results['update_codex'] = measure(
+        [lambda sc=sc: actions.append(engine.update_codex(sc)['action']) for sc in extra],
+        track_memory)
+    results['update_codex']['merge_rate'] = round(actions.count('merged') / max(len(actions), 1), 4)
+
+    queries = corpus.queries(ops)
+    results['recall'] = measure(
+        [lambda q=q: engine.recall(q, top_n=3, current_time=RECALL_TIME) for q in queries],
+        track_memory)
+    results['recall_pruned'] = measure(
+        [lambda q=q: engine.recall(q, top_n=3, current_time=RECALL_TIME, prune='bounded')
+         for q in queries],
+        track_memory)
+
+    # Repetitive traffic: ops recalls cycling through 10 distinct queries
+    engine.recall_cache = RecallCache(256)
+    results['recall_cached'] = measure(
+        [lambda q=queries[k % 10]: engine.recall(q, top_n=3, current_time=RECALL_TIME)
+         for k in range(len(queries))],
+        track_memory)
+    results['recall_cached'].update(hit_rate=round(engine.recall_cache.stats()['hit_rate'], 4),
+                                    cache_bytes=engine.recall_cache.nbytes)
+    engine.recall_cache = None
+
+    results['diagnostics'] = measure(
+        [lambda: engine.diagnostics(RECALL_TIME) for _ in range(io_repeats)], track_memory)
+
+    dream_engine = engine_factory()
+    seed_codex(dream_engine, [dict(sc) for sc in scrolls[:dream_scrolls]])
+    bridges: List[Dict] = []
+    results['dream_consolidate'] = measure(
+        [lambda: bridges.extend(dream_engine.dream_consolidate(RECALL_TIME))], track_memory)
+    results['dream_consolidate'].update({
+        'scrolls': len(dream_engine.scrolls) - len(bridges), 'bridges': len(bridges)})
+    del dream_engine
+
+    fd, path = tempfile.mkstemp(suffix='.json', prefix='memory_engine_bench_')
+    os.close(fd)
+    try:
+        results['export_memory_state'] = measure(
+            [lambda: engine.export_memory_state(path) for _ in range(io_repeats)], track_memory)
+        results['export_memory_state']['bytes'] = os.path.getsize(path)
+        # One touching recall (three access times) then a delta checkpoint
+        results['recall_export_delta'] = measure(
+            [lambda q=q: (engine.recall(q, top_n=3, current_time=RECALL_TIME),
+                          engine.export_delta(path))
+             for q in queries[:io_repeats]], track_memory)
+        results['recall_export_delta']['bytes'] = os.path.getsize(path)
+        engine.export_memory_state(path)
+        loader = engine_factory()
+        results['load_memory_state'] = measure(
+            [lambda: loader.load_memory_state(path) for _ in range(io_repeats)], track_memory)
+    finally:
+        os.remove(path)
+
+    scenario = {'scrolls': n_scrolls, 'final_scrolls': len(engine.scrolls),
+                'vocabulary': len(engine.df_index), 'operations': results}
+    if hash_dims:
+        scenario['hashing'] = hashing_accuracy(engine, queries, hash_dims,
+                                               precisions=hash_precisions, rescore=hash_rescore)
+    if nprobes:
+        scenario['clustering'] = clustering_accuracy(engine, queries, nprobes)
+    return scenario
+
+
+def run_benchmarks(sizes: List[int], seed: int = 7, duplicate_rate: float = 0.2,
+                   ops: int = 200, dream_scrolls: int = 500, io_repeats: int = 3,
+                   track_memory: bool = True,
+                   hash_dims: Optional[List[int]] = None,
+                   hash_precisions: Tuple[str, ...] = ('float32',),
+                   hash_rescore: int = 0,
+                   nprobes: Optional[List[int]] = None) -> Dict:
+    """Run every scenario and return a JSON-serializable report."""
+    corpus = SyntheticCorpus(seed=seed, duplicate_rate=duplicate_rate)
+    report = {
+        'meta': {
+            'bench_version': BENCH_VERSION,
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'duplicate_rate': duplicate_rate,
+            'ops': ops,
+            'dream_scrolls': dream_scrolls,
+            'io_repeats': io_repeats,
+            'tracemalloc': track_memory,
+            'hash_dims': hash_dims or [],
+            'hash_precisions': list(hash_precisions),
+            'hash_rescore': hash_rescore,
+            'nprobes': nprobes or [],
+        },
+        'scenarios': [],
+    }
+    for n in sizes:
+        report['scenarios'].append(run_scenario(
+            n, corpus, ops=ops, dream_scrolls=dream_scrolls,
+            io_repeats=io_repeats, track_memory=track_memory, hash_dims=hash_dims,
+            hash_precisions=hash_precisions, hash_rescore=hash_rescore,
+            nprobes=nprobes))
+    return report
+
+
+# ==============================================================================
+# REPLAY
+# ==============================================================================
+
+DEFAULT_REPLAY_MODES = {
+    'exact': {},
+    'pruned': {'prune': 'bounded'},
+    'hashed': {'hash_dim': 4096},
+}
+RECALL_OPTIONS = ('prune',)
+
+
+def replay_queries(state_path: str, log_path: str,
+                   modes: Optional[Dict[str, Dict]] = None) -> Dict:
+    """
+    Replay a QueryRecorder log against a saved state under several modes.
+
+    Each mode is a dict of MemoryEngine keyword arguments plus recall
+    options (prune); every mode loads state_path into a fresh engine and
+    replays the recorded calls — same query, top_n and current_time — with
+    touch=False, so modes see identical access times. Reports latency
+    (p50/p95/p99) and throughput per mode, the latency percentiles that
+    were recorded live, and top1/overlap@n of each mode against the first.
+    """
+    modes = modes or DEFAULT_REPLAY_MODES
+    calls = list(QueryRecorder.read(log_path))
+    recorded = sorted(c['ms'] for c in calls)
+    report = {'state': state_path, 'log': log_path, 'queries': len(calls),
+              'recorded': {'p50_ms': _percentile(recorded, 50),
+                           'p95_ms': _percentile(recorded, 95),
+                           'p99_ms': _percentile(recorded, 99)},
+              'modes': {}}
+    baseline = None
+    for name, options in modes.items():
+        recall_options = {k: v for k, v in options.items() if k in RECALL_OPTIONS}
+        engine_options = {k: v for k, v in options.items() if k not in RECALL_OPTIONS}
+        engine = MemoryEngine(**engine_options)
+        engine.load_memory_state(state_path)
+        # The state's exported config would otherwise win over the mode's
+        for key, value in engine_options.items():
+            setattr(engine, key, value)
+
+        def top(call: Dict) -> List[Tuple]:
+            kwargs = dict({'prune': call.get('p')}, **recall_options)
+            return [(r['timestamp'], tuple(r['essence'])) for r in
+                    engine.recall(call['q'], top_n=call['n'], current_time=call['t'],
+                                  touch=False, **kwargs)]
+
+        results = []
+        stats = measure([lambda c=c: results.append(top(c)) for c in calls])
+        _check_mode(name, engine, engine_options, recalled=any(results))
+        if baseline is None:
+            baseline = results
+        else:
+            stats['top1'] = round(sum(r[:1] == b[:1] for r, b in zip(results, baseline))
+                                  / max(len(calls), 1), 4)
+            stats['overlap@n'] = round(sum(len(set(r) & set(b)) / max(len(b), 1)
+                                           for r, b in zip(results, baseline))
+                                       / max(len(calls), 1), 4)
+        report['modes'][name] = stats
+    return report
+
+
+def _check_mode(name: str, engine: MemoryEngine, options: Dict, recalled: bool) -> None:
+    """Raise if a replay engine did not recall in the mode it was given."""
+    wrong = [key for key, value in options.items() if getattr(engine, key, None) != value]
+    if engine.hash_dim and recalled and (engine._hashed is None or engine._hashed.dim != engine.hash_dim):
+        wrong.append('hash_dim (no hashed space built)')
+    elif not engine.hash_dim and engine._hashed is not None:
+        wrong.append('hash_dim (hashed space built in exact mode)')
+    if engine.n_clusters and not engine.hash_dim and recalled and engine._clusters is None:
+        wrong.append('n_clusters (no partition built)')
+    if wrong:
+        raise RuntimeError(f"replay mode {name!r} is not in effect: {', '.join(wrong)}")
+
+
+def format_replay(report: Dict) -> str:
+    """Compact human-readable table of a replay_queries report."""
+    rec = report['recorded']
+    lines = [f"── replay {report['queries']:,} queries from {report['log']} ──",
+             f"  {'recorded':<20} p50 {rec['p50_ms']:>9.3f}ms  p95 {rec['p95_ms']:>9.3f}ms  "
+             f"p99 {rec['p99_ms']:>9.3f}ms"]
+    for name, m in report['modes'].items():
+        agreement = (f"  top1 {m['top1']:.3f}  overlap@n {m['overlap@n']:.3f}"
+                     if 'top1' in m else '  (baseline)')
+        lines.append(f"  {name:<20} p50 {m['p50_ms']:>9.3f}ms  p95 {m['p95_ms']:>9.3f}ms  "
+                     f"p99 {m['p99_ms']:>9.3f}ms  {m['ops_per_sec'] or 0:>10.4g}/s{agreement}")
+    return "\n".join(lines)
+
+
+def _parse_mode(spec: str) -> Tuple[str, Dict]:
+    name, _, options = spec.partition('=')
+    if not name:
+        raise argparse.ArgumentTypeError(f"mode must be NAME=JSON, not {spec!r}")
+    try:
+        parsed = json.loads(options) if options else {}
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"mode {name!r}: {exc}") from exc
+    if not isinstance(parsed, dict):
+        raise argparse.ArgumentTypeError(f"mode {name!r}: options must be a JSON object")
+    return name, parsed
+
+
+def format_report(report: Dict) -> str:
+    """Compact human-readable table of a run_benchmarks report."""
+    lines = []
+    for scenario in report['scenarios']:
+        lines.append(f"── {scenario['scrolls']:,} scrolls "
+                     f"(vocab {scenario['vocabulary']:,}) ──")
+        for op, m in scenario['operations'].items():
+            peak = f"{m['peak_kib']:>10.1f} KiB" if m.get('peak_kib') is not None else ''
+            lines.append(f"  {op:<20} n={m['count']:<7} {m['ops_per_sec'] or 0:>10.4g}/s "
+                         f"p50 {m['p50_ms']:>9.3f}ms  p99 {m['p99_ms']:>9.3f}ms {peak}")
+        hashing = scenario.get('hashing')
+        if hashing:
+            n = hashing['top_n']
+            lines.append(f"  {'recall exact':<34} p50 {hashing['exact']['p50_ms']:>9.3f}ms")
+            for key, m in hashing.items():
+                if key.startswith('hash_dim='):
+                    lines.append(f"  {key:<34} p50 {m['p50_ms']:>9.3f}ms  "
+                                 f"top1 {m['top1']:.3f}  overlap@{n} {m[f'overlap@{n}']:.3f}  "
+                                 f"{m['matrix_bytes'] / 1048576:.1f} MiB "
+                                 f"(-{m['memory_saved']:.0%})")
+        clustering = scenario.get('clustering')
+        if clustering:
+            n = clustering['top_n']
+            lines.append(f"  {'clusters=' + str(clustering['n_clusters']) + ' build':<34} "
+                         f"{clustering['build']['wall_s'] * 1000:>13.3f}ms")
+            for key, m in clustering.items():
+                if key.startswith('nprobe='):
+                    lines.append(f"  {key:<34} p50 {m['p50_ms']:>9.3f}ms  "
+                                 f"top1 {m['top1']:.3f}  overlap@{n} {m[f'overlap@{n}']:.3f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Memory Engine scaling benchmarks")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--duplicate-rate', type=float, default=0.2)
+    parser.add_argument('--ops', type=int, default=200,
+                        help="timed update_codex / recall calls per scenario")
+    parser.add_argument('--dream-scrolls', type=int, default=500)
+    parser.add_argument('--io-repeats', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip the tracemalloc pass (halves run time, no peak_kib)")
+    parser.add_argument('--hash-dims', type=int, nargs='*', default=[256, 1024, 4096],
+                        help="compare hash_dim recall against exact for these D (none to skip)")
+    parser.add_argument('--hash-precisions', nargs='+', default=['float32', 'float16', 'int8'],
+                        choices=['float32', 'float16', 'int8'],
+                        help="hashed row storage precisions to compare")
+    parser.add_argument('--hash-rescore', type=int, default=32,
+                        help="also compare with exact rescoring of this many hashed candidates (0: off)")
+    parser.add_argument('--nprobes', type=int, nargs='*', default=[1, 4, 16],
+                        help="compare n_clusters=√n recall against exact at these nprobe (none to skip)")
+    parser.add_argument('--replay', metavar='LOG',
+                        help="replay a QueryRecorder log against --state instead of benchmarking")
+    parser.add_argument('--state', help="exported state file to replay against")
+    parser.add_argument('--mode', type=_parse_mode, action='append', metavar='NAME=JSON',
+                        help="replay mode, e.g. pruned='{\"prune\": \"bounded\"}' "
+                             "(repeatable; default: exact, pruned, hashed)")
+    parser.add_argument('--output', help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        if not args.state:
+            parser.error("--replay needs --state")
+        report = replay_queries(args.state, args.replay, dict(args.mode) if args.mode else None)
+        formatter = format_replay
+    else:
+        report = run_benchmarks(args.sizes, seed=args.seed, duplicate_rate=args.duplicate_rate,
+                                ops=args.ops, dream_scrolls=args.dream_scrolls,
+                                io_repeats=args.io_repeats, track_memory=not args.no_memory,
+                                hash_dims=args.hash_dims,
+                                hash_precisions=tuple(args.hash_precisions),
+                                hash_rescore=args.hash_rescore, nprobes=args.nprobes)
+        formatter = format_report
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(formatter(report), file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,349 @@
+# MEMORY ENGINE CLI - v3.2
+# Resident daemon + thin client over a Unix domain socket
+#
+# The daemon loads a state file once, keeps the engine resident and
+# answers newline-delimited JSON requests; the client imports nothing from
+# the engine, so a shell hook pays for a socket round-trip, not a JSON parse.
+#
+#   python memory_engine_cli.py serve --state memory_state.json &
+#   python memory_engine_cli.py recall "manifold convergence" --top-n 3
+#   python memory_engine_cli.py ingest --theme mathematics "The proof holds"
+#   python memory_engine_cli.py stop
+#
+# Run it as a script or with `python -m memory_engine_cli` from the checkout;
+# nothing installs a `memory-engine` console script.
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+CLI_VERSION = '3.2'
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+
+def default_socket_path() -> str:
+    """$MEMORY_ENGINE_SOCKET, else a per-user socket in the temp directory."""
+    override = os.environ.get('MEMORY_ENGINE_SOCKET')
+    if override:
+        return override
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(tempfile.gettempdir(), f'memory-engine-{uid}.sock')
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if hasattr(value, 'item'):  # NumPy scalars
+        return value.item()
+    return str(value)
+
+
+# ==============================================================================
+# CLIENT
+# ==============================================================================
+
+def request(command: str, socket_path: Optional[str] = None,
+            timeout: float = 30.0, **args) -> Any:
+    """
+    Send one command to a running daemon and return its result.
+
+    Raises ConnectionError when no daemon is listening and RuntimeError
+    when the daemon reports a failure.
+    """
+    path = socket_path or default_socket_path()
+    payload = json.dumps({'command': command, 'args': args}, default=_json_default)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError) as exc:
+            raise ConnectionError(f"No memory-engine daemon listening on {path}") from exc
+        sock.sendall(payload.encode('utf-8') + b'\n')
+        with sock.makefile('rb') as stream:
+            line = stream.readline()
+    if not line:
+        raise RuntimeError("Daemon closed the connection without replying")
+    reply = json.loads(line)
+    if not reply.get('ok'):
+        raise RuntimeError(reply.get('error', 'unknown daemon error'))
+    return reply['result']
+
+
+# ==============================================================================
+# DAEMON
+# ==============================================================================
+
+class MemoryDaemon:
+    """
+    Resident engine behind a Unix domain socket.
+
+    Requests are one JSON object per line ({'command', 'args'}) and each
+    gets one JSON reply ({'ok': true, 'result'} or {'ok': false, 'error'}).
+    Connections are served on threads against a thread_safe engine, so
+    recalls run concurrently and writes serialize on the engine's lock.
+
+    State is written atomically (temp file + rename) every persist_interval
+    seconds when something changed, on the 'export' command, and on shutdown.
+    With record_path every recall is appended to a QueryRecorder log
+    (flushed with each persist) for memory_engine_bench.py --replay.
+    """
+
+    COMMANDS = ('ping', 'recall', 'ingest', 'dream', 'diagnostics', 'export', 'shutdown')
+
+    def __init__(self, state_path: Optional[str] = None, socket_path: Optional[str] = None,
+                 persist_interval: float = 300.0, record_path: Optional[str] = None,
+                 **engine_kwargs):
+        from memory_engine_v3_1 import MemoryEngine, QueryRecorder
+
+        self.state_path = state_path
+        self.socket_path = socket_path or default_socket_path()
+        self.persist_interval = persist_interval
+        self.engine = MemoryEngine(thread_safe=True, **engine_kwargs)
+        if state_path and os.path.exists(state_path):
+            self.engine.load_memory_state(state_path)
+        if record_path:
+            self.engine.query_recorder = QueryRecorder(record_path)
+        self.started = time.time()
+        self.requests = 0
+        self._saved_generation = self.engine.generation
+        self._touched = False
+        self._persist_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+
+    # --- lifecycle -------------------------------------------------------------
+
+    def serve_forever(self) -> None:
+        """Listen until 'shutdown', SIGTERM or SIGINT, then persist and clean up."""
+        self._claim_socket()
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline(MAX_REQUEST_BYTES)
+                if line:
+                    self.wfile.write(daemon.dispatch(line) + b'\n')
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        self._server.daemon_threads = True
+        os.chmod(self.socket_path, 0o600)
+
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(sig, lambda *_: self.stop())
+        persister = threading.Thread(target=self._persist_loop, name='memory-engine-persist',
+                                     daemon=True)
+        persister.start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._stopping.set()
+            self._server.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+            self.persist(force=True)
+            if self.engine.query_recorder is not None:
+                self.engine.query_recorder.close()
+
+    def stop(self) -> None:
+        """Ask serve_forever to return (safe from handlers and signal handlers)."""
+        self._stopping.set()
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def _claim_socket(self) -> None:
+        """Remove a stale socket file, refusing to displace a live daemon."""
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(self.socket_path)
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"A memory-engine daemon is already listening on {self.socket_path}")
+
+    # --- persistence -----------------------------------------------------------
+
+    def _persist_loop(self) -> None:
+        while not self._stopping.wait(self.persist_interval):
+            self.persist()
+            if self.engine.query_recorder is not None:
+                self.engine.query_recorder.flush()
+
+    def persist(self, force: bool = False, path: Optional[str] = None) -> bool:
+        """Write state if it changed since the last save (or force). Returns True if written."""
+        path = path or self.state_path
+        if not path:
+            return False
+        with self._persist_lock:
+            generation = self.engine.generation
+            if not (force or self._touched or generation != self._saved_generation):
+                return False
+            self.engine.flush_access_updates()
+            tmp_path = f'{path}.tmp'
+            self.engine.export_memory_state(tmp_path)
+            os.replace(tmp_path, path)
+            if path == self.state_path:
+                self._saved_generation = generation
+                self._touched = False
+            return True
+
+    # --- commands --------------------------------------------------------------
+
+    def dispatch(self, line: bytes) -> bytes:
+        """Decode one request line, run it, and encode the reply."""
+        self.requests += 1
+        try:
+            message = json.loads(line)
+            command = message.get('command')
+            if command not in self.COMMANDS:
+                raise ValueError(f"Unknown command {command!r}")
+            result = getattr(self, f'_cmd_{command}')(**(message.get('args') or {}))
+            reply = {'ok': True, 'result': result}
+        except Exception as exc:
+            reply = {'ok': False, 'error': f'{type(exc).__name__}: {exc}'}
+        return json.dumps(reply, default=_json_default).encode('utf-8')
+
+    def _cmd_ping(self) -> Dict:
+        return {'version': CLI_VERSION, 'pid': os.getpid(), 'scrolls': len(self.engine.scrolls),
+                'uptime': time.time() - self.started, 'requests': self.requests}
+
+    def _cmd_recall(self, query: str, top_n: int = 3, current_time: Optional[str] = None,
+                    touch: bool = True) -> List[Dict]:
+        results = self.engine.recall(query, top_n=top_n, current_time=current_time, touch=touch)
+        if touch and results:
+            self._touched = True
+        return results
+
+    def _cmd_ingest(self, messages: List[str], timestamp: Optional[str] = None,
+                    context: Optional[Dict] = None) -> Dict:
+        timestamp = timestamp or datetime.now().isoformat()
+        scroll = self.engine.compress_to_scroll(messages, timestamp, context or {'theme': 'general'})
+        result = self.engine.update_codex(scroll)
+        result.pop('scroll', None)
+        return result
+
+    def _cmd_dream(self, current_time: Optional[str] = None) -> List[Dict]:
+        return self.engine.dream_consolidate(current_time)
+
+    def _cmd_diagnostics(self, current_time: Optional[str] = None) -> Dict:
+        return self.engine.diagnostics(current_time)
+
+    def _cmd_export(self, path: Optional[str] = None) -> Dict:
+        path = path or self.state_path
+        if not path:
+            raise ValueError("No path given and the daemon has no --state file")
+        self.persist(force=True, path=path)
+        return {'path': os.path.abspath(path), 'scrolls': len(self.engine.scrolls)}
+
+    def _cmd_shutdown(self) -> Dict:
+        self.stop()
+        return {'stopping': True}
+
+
+# ==============================================================================
+# COMMAND LINE
+# ==============================================================================
+
+def _print_recall(results: List[Dict]) -> None:
+    for rank, scroll in enumerate(results, 1):
+        meta = scroll.get('_recall_meta', {})
+        theme = scroll.get('context', {}).get('theme', 'general')
+        print(f"{rank}. [{theme}] attention={meta.get('attention', 0):.4f} "
+              f"{scroll.get('timestamp', '')}")
+        for essence in scroll.get('essence', []):
+            print(f"     {essence}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Memory Engine daemon and client")
+    parser.add_argument('--socket', default=None,
+                        help="socket path (default: $MEMORY_ENGINE_SOCKET or a per-user temp path)")
+    parser.add_argument('--json', action='store_true', help="print raw JSON results")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve = sub.add_parser('serve', help="run the resident daemon in the foreground")
+    serve.add_argument('--state', help="state file to load at start and persist to")
+    serve.add_argument('--persist-interval', type=float, default=300.0,
+                       help="seconds between saves when state changed (default 300)")
+    serve.add_argument('--record', metavar='LOG',
+                       help="append every recall to this query log (.gz to compress)")
+
+    recall = sub.add_parser('recall', help="recall scrolls for a query")
+    recall.add_argument('query')
+    recall.add_argument('--top-n', type=int, default=3)
+    recall.add_argument('--at', dest='current_time', help="ISO time to recall at")
+    recall.add_argument('--no-touch', action='store_true', help="leave access times alone")
+
+    ingest = sub.add_parser('ingest', help="compress messages into the codex")
+    ingest.add_argument('messages', nargs='*', help="messages (default: lines of stdin)")
+    ingest.add_argument('--theme', default='general')
+    ingest.add_argument('--timestamp')
+
+    dream = sub.add_parser('dream', help="run a dream consolidation pass")
+    dream.add_argument('--at', dest='current_time')
+
+    diagnostics = sub.add_parser('diagnostics', help="engine diagnostics")
+    diagnostics.add_argument('--at', dest='current_time')
+
+    export = sub.add_parser('export', help="write state now (to --path or the daemon's --state)")
+    export.add_argument('--path')
+
+    sub.add_parser('ping', help="check the daemon is up")
+    sub.add_parser('stop', help="persist state and stop the daemon")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        daemon = MemoryDaemon(args.state, args.socket, persist_interval=args.persist_interval,
+                              record_path=args.record)
+        print(f"memory-engine: serving {len(daemon.engine.scrolls)} scrolls on {daemon.socket_path}",
+              file=sys.stderr)
+        daemon.serve_forever()
+        return 0
+
+    if args.command == 'recall':
+        call = dict(query=args.query, top_n=args.top_n, current_time=args.current_time,
+                    touch=not args.no_touch)
+    elif args.command == 'ingest':
+        messages = args.messages or [line.rstrip('\n') for line in sys.stdin if line.strip()]
+        call = dict(messages=messages, timestamp=args.timestamp,
+                    context={'theme': args.theme})
+    elif args.command in ('dream', 'diagnostics'):
+        call = dict(current_time=args.current_time)
+    elif args.command == 'export':
+        call = dict(path=os.path.abspath(args.path) if args.path else None)
+    else:
+        call = {}
+    command = 'shutdown' if args.command == 'stop' else args.command
+
+    try:
+        result = request(command, socket_path=args.socket, **call)
+    except (ConnectionError, RuntimeError, OSError) as exc:
+        print(f"memory-engine: {exc}", file=sys.stderr)
+        return 1
+
+    if command == 'recall' and not args.json:
+        _print_recall(result)
+    else:
+        print(json.dumps(result, indent=2, default=_json_default))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,16 +7,60 @@
 # v3.0: Harmonic Interference merging, Dream-State Consolidation, TCS scoring
 # v3.1: Bug fixes — capped importance, merge accounting, dream iteration safety,
 #        decay floor, bridge TCS normalization, unit tests
+# v3.2: Performance & operations — thread-safe mode, read-only recall,
+#        derived recall index with background rebuild, asyncio facade,
+#        parallel bulk ingest, streaming transcript segmentation,
+#        per-stage tracing, metrics registry with Prometheus endpoint,
+#        incremental diagnostics aggregates, lazy NumPy + small-vector kernels,
+#        streaming/cached glyph rendering, feature-hashed recall mode,
+#        bounded logs with compressed spill, compact access log
 #
 # The Sovereign Edition
 
-import numpy as np
-from typing import List, Dict, Tuple, Optional, Set
-from collections import Counter
+from typing import Any, AsyncIterator, Callable, FrozenSet, Iterator, List, Dict, Tuple, Optional, Set
+from array import array
+from collections import Counter, OrderedDict, deque
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+import bisect
+import functools
+import heapq
+import importlib
+import itertools
 import json
 import math
+import os
 import re
-from datetime import datetime
+import sys
+import threading
+import time
+import tracemalloc
+import zlib
+from datetime import datetime, timedelta
+
+
+class _LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+    
+    v3.2: NumPy dominates import time, and small codices never need it —
+    recall, ingest and load on them run on the pure-Python kernels. asyncio
+    is only needed by AsyncMemoryEngine. The first real use imports the
+    module and rebinds the global to it.
+    """
+    
+    def __init__(self, name: str, alias: str):
+        self._name = name
+        self._alias = alias
+    
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self._name)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
+
+np = _LazyModule('numpy', 'np')
+asyncio = _LazyModule('asyncio', 'asyncio')
 
 
 # ==============================================================================
@@ -30,56 +74,1733 @@ class SymbolicTokenizer:
     numeric-symbolic patterns (3-6-9), and Unicode symbols.
     """
     
-    STOPWORDS = frozenset({
-        'the', 'a', 'an', 'is', 'was', 'are', 'were', 'be', 'been',
-        'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-        'would', 'could', 'should', 'may', 'might', 'can', 'shall',
-        'to', 'of', 'in', 'for', 'on', 'with', 'at', 'by', 'from',
-        'as', 'into', 'through', 'during', 'before', 'after', 'and',
-        'but', 'or', 'nor', 'not', 'so', 'yet', 'both', 'either',
-        'neither', 'each', 'every', 'all', 'any', 'few', 'more',
-        'most', 'other', 'some', 'such', 'no', 'only', 'own', 'same',
-        'than', 'too', 'very', 'just', 'because', 'if', 'when', 'that',
-        'this', 'it', 'its', 'me', 'my', 'we', 'our', 'you', 'your',
-        'he', 'him', 'his', 'she', 'her', 'they', 'them', 'their',
-        'what', 'which', 'who', 'whom', 'how', 'about', 'then',
-        'there', 'here', 'also', 'like', 'still', 'even', 'get',
-        'got', 'been', 'going', 'went', 'come', 'came', 'back',
-    })
+    STOPWORDS = frozenset({
+        'the', 'a', 'an', 'is', 'was', 'are', 'were', 'be', 'been',
+        'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+        'would', 'could', 'should', 'may', 'might', 'can', 'shall',
+        'to', 'of', 'in', 'for', 'on', 'with', 'at', 'by', 'from',
+        'as', 'into', 'through', 'during', 'before', 'after', 'and',
+        'but', 'or', 'nor', 'not', 'so', 'yet', 'both', 'either',
+        'neither', 'each', 'every', 'all', 'any', 'few', 'more',
+        'most', 'other', 'some', 'such', 'no', 'only', 'own', 'same',
+        'than', 'too', 'very', 'just', 'because', 'if', 'when', 'that',
+        'this', 'it', 'its', 'me', 'my', 'we', 'our', 'you', 'your',
+        'he', 'him', 'his', 'she', 'her', 'they', 'them', 'their',
+        'what', 'which', 'who', 'whom', 'how', 'about', 'then',
+        'there', 'here', 'also', 'like', 'still', 'even', 'get',
+        'got', 'been', 'going', 'went', 'come', 'came', 'back',
+    })
+    
+    SACRED_TERMS = frozenset({
+        'ψ', 'φ', 'δ', 'σ', 'γ', 'β', 'α', 'ω', 'θ', 'λ', 'μ', 'π',
+        'psi', 'phi', 'delta', 'sigma', 'gamma', 'beta', 'alpha', 'omega',
+        'qi', 'om', 'aum', 'ka', 'ba', 'ra', 'mu',
+        'ai', 'rf', 'dc', 'hz', 'ev',
+    })
+    
+    TOKEN_PATTERN = re.compile(
+        r"""
+        [\w\u0370-\u03FF\u0400-\u04FF\u2000-\u2BFF]+
+        (?:[-''][\w\u0370-\u03FF\u0400-\u04FF\u2000-\u2BFF]+)*
+        |
+        \d+(?:[-/.]\d+)+
+        """,
+        re.VERBOSE | re.UNICODE
+    )
+    
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        """Tokenize preserving symbolic and sacred vocabulary."""
+        tokens = cls.TOKEN_PATTERN.findall(text)
+        result = []
+        for token in tokens:
+            lower = token.lower()
+            if lower in cls.SACRED_TERMS:
+                result.append(lower)
+                continue
+            if lower in cls.STOPWORDS:
+                continue
+            if len(lower) < 2:
+                continue
+            result.append(lower)
+        return result
+
+
+# ==============================================================================
+# CONCURRENCY (v3.2)
+# ==============================================================================
+
+class ReadWriteLock:
+    """
+    Reader/writer lock with writer preference.
+    
+    Any number of readers may hold the lock together; a writer holds it
+    exclusively. A waiting writer blocks new readers so a steady stream of
+    recalls cannot starve ingestion. Both sides are re-entrant per thread,
+    and the thread holding the write lock may also take the read lock.
+    Upgrading a held read lock to a write lock is refused (it would deadlock).
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()
+    
+    def acquire_read(self) -> None:
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        if depth > 0:
+            local.depth = depth + 1
+            return
+        with self._cond:
+            if self._writer == threading.get_ident():
+                local.depth, local.counted = 1, False
+                return
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        local.depth, local.counted = 1, True
+    
+    def release_read(self) -> None:
+        local = self._local
+        local.depth -= 1
+        if local.depth == 0 and local.counted:
+            with self._cond:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._cond.notify_all()
+    
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+            if getattr(self._local, 'depth', 0) > 0:
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._writer_depth = 1
+    
+    def release_write(self) -> None:
+        with self._cond:
+            self._writer_depth -= 1
+            if self._writer_depth == 0:
+                self._writer = None
+                self._cond.notify_all()
+    
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+    
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+def _synchronized(mode: str):
+    """
+    Run a MemoryEngine method under the engine's lock (no-op unless thread_safe).
+    
+    mode: 'read'     — shared with other readers
+          'write'    — exclusive; buffered access-time updates are applied first
+          'snapshot' — apply buffered access-time updates, then read
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            lock = self._lock
+            if lock is None:
+                return method(self, *args, **kwargs)
+            if mode == 'write':
+                with lock.write():
+                    self._apply_pending_access()
+                    return method(self, *args, **kwargs)
+            if mode == 'snapshot' and self._pending_access:
+                self.flush_access_updates()
+            with lock.read():
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ==============================================================================
+# TRACING (v3.2)
+# ==============================================================================
+
+class _StageClock:
+    """Per-call stage timer. Only created while a tracer is installed."""
+    
+    __slots__ = ('op', 'started', 'last', 'stages', 'attrs')
+    
+    def __init__(self, op: str):
+        self.op = op
+        self.started = self.last = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.attrs: Dict[str, Any] = {}
+    
+    def mark(self, stage: str) -> None:
+        """Charge the time since the previous mark to `stage`."""
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self.last)
+        self.last = now
+    
+    def span(self) -> Dict:
+        return {'op': self.op, 'total': time.perf_counter() - self.started,
+                'stages': self.stages, 'attrs': self.attrs}
+
+
+class StageTracer:
+    """
+    Collecting tracer. Install with engine.trace() or engine.tracer = StageTracer().
+    
+    Each traced engine call emits one span:
+        {'op': 'recall', 'total': s, 'stages': {stage: s, ...}, 'attrs': {...}}
+    Any callable taking that dict can be used as a tracer instead.
+    """
+    
+    def __init__(self, max_spans: Optional[int] = 10000):
+        self.spans = deque(maxlen=max_spans)
+    
+    def __call__(self, span: Dict) -> None:
+        self.spans.append(span)
+    
+    def summary(self) -> Dict[str, Dict]:
+        """Per-op call count, total seconds and per-stage seconds."""
+        out: Dict[str, Dict] = {}
+        for span in list(self.spans):
+            entry = out.setdefault(span['op'], {'calls': 0, 'total': 0.0, 'stages': {}})
+            entry['calls'] += 1
+            entry['total'] += span['total']
+            for stage, seconds in span['stages'].items():
+                entry['stages'][stage] = entry['stages'].get(stage, 0.0) + seconds
+        return out
+
+
+class QueryRecorder:
+    """
+    Append-only log of recall calls, for offline replay (engine.query_recorder).
+    
+    One compact JSON line per call: {'q': query, 'n': top_n, 't':
+    current_time, 'ms': elapsed} plus 'p' (prune mode) when one was given.
+    A path ending in .gz is gzip-compressed. Lines are buffered and
+    appended every flush_every records and on flush()/close(), so a
+    recorder costs a dict and a json.dumps per recall. read() yields the
+    records of any recorder file; memory_engine_bench.py --replay replays
+    them.
+    """
+    
+    def __init__(self, path: str, flush_every: int = 256):
+        self.path = path
+        self.flush_every = flush_every
+        self.recorded = 0
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+    
+    def record(self, query: str, top_n: int, current_time: str, seconds: float,
+               prune: Optional[str] = None) -> None:
+        entry = {'q': query, 'n': top_n, 't': current_time, 'ms': round(seconds * 1000.0, 4)}
+        if prune is not None:
+            entry['p'] = prune
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            self._buffer.append(line)
+            self.recorded += 1
+            if len(self._buffer) >= self.flush_every:
+                self._write()
+    
+    def flush(self) -> None:
+        with self._lock:
+            self._write()
+    
+    def close(self) -> None:
+        self.flush()
+    
+    def _write(self) -> None:
+        if not self._buffer:
+            return
+        payload = ''.join(line + '\n' for line in self._buffer)
+        self._buffer = []
+        if self.path.endswith('.gz'):
+            import gzip
+            with gzip.open(self.path, 'ab') as f:
+                f.write(payload.encode('utf-8'))
+        else:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(payload)
+    
+    @staticmethod
+    def read(path: str) -> Iterator[Dict]:
+        """Yield recorded calls in order."""
+        if path.endswith('.gz'):
+            import gzip
+            f = gzip.open(path, 'rt', encoding='utf-8')
+        else:
+            f = open(path, 'r', encoding='utf-8')
+        with f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class MemoryProfile:
+    """
+    tracemalloc attribution of allocation growth to engine operations
+    (engine.profile_memory()).
+    
+    While active, every compress_to_scroll, update_codex, recall and
+    dream_consolidate call records the traced bytes it left allocated —
+    what the call retained, not its transient garbage. Calls nested in
+    another profiled call are charged to the outer one. report() gives
+    calls and net bytes per operation, the window's total growth and
+    peak, and the growth no profiled call accounts for (negative when
+    something a call retained, such as a scroll that merged away, is
+    freed outside any profiled call). Concurrent calls on several threads
+    blur the attribution; the totals stay exact.
+    """
+    
+    OPERATIONS = ('compress_to_scroll', 'update_codex', 'recall', 'dream_consolidate')
+    
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.net_bytes: Counter = Counter()
+        self._depth = threading.local()
+        self._lock = threading.Lock()
+        self._owns_tracing = False
+        self._start_bytes = 0
+        self._final: Optional[Tuple[int, int]] = None
+    
+    def start(self) -> None:
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        self._start_bytes = tracemalloc.get_traced_memory()[0]
+    
+    def stop(self) -> None:
+        self._final = tracemalloc.get_traced_memory()
+        if self._owns_tracing:
+            tracemalloc.stop()
+    
+    def wrap(self, name: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def profiled(*args, **kwargs):
+            depth = getattr(self._depth, 'value', 0)
+            if depth:
+                return method(*args, **kwargs)
+            self._depth.value = 1
+            before = tracemalloc.get_traced_memory()[0]
+            try:
+                return method(*args, **kwargs)
+            finally:
+                grown = tracemalloc.get_traced_memory()[0] - before
+                self._depth.value = 0
+                with self._lock:
+                    self.calls[name] += 1
+                    self.net_bytes[name] += grown
+        return profiled
+    
+    def report(self) -> Dict:
+        current, peak = self._final or tracemalloc.get_traced_memory()
+        operations = {name: {'calls': self.calls[name], 'net_bytes': self.net_bytes[name],
+                             'bytes_per_call': (self.net_bytes[name] / self.calls[name]
+                                                if self.calls[name] else 0.0)}
+                      for name in self.OPERATIONS}
+        window = current - self._start_bytes
+        return {'operations': operations, 'window_bytes': window,
+                'peak_bytes': peak - self._start_bytes,
+                'unattributed_bytes': window - sum(self.net_bytes.values())}
+
+
+# ==============================================================================
+# METRICS (v3.2)
+# ==============================================================================
+
+class MetricsRegistry:
+    """
+    Counters, histograms and gauges maintained in-process.
+    
+    Metrics are declared once, then updated with inc()/observe(); gauges
+    are callables sampled at collection time. Labelled series are keyed
+    by keyword labels (cache='recall'). snapshot() returns plain values;
+    render() produces the Prometheus text exposition format (0.0.4).
+    """
+    
+    LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                       0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    
+    def __init__(self, namespace: str = 'memory_engine'):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[str, str, Tuple]] = {}   # name -> (type, help, buckets)
+        self._series: Dict[str, Dict[Tuple, Any]] = {}       # name -> {labels: value}
+        self._gauges: Dict[str, Callable[[], float]] = {}
+    
+    def counter(self, name: str, help_text: str) -> None:
+        self._meta[name] = ('counter', help_text, ())
+        self._series.setdefault(name, {})
+    
+    def histogram(self, name: str, help_text: str, buckets=LATENCY_BUCKETS) -> None:
+        self._meta[name] = ('histogram', help_text, tuple(buckets))
+        self._series.setdefault(name, {})
+    
+    def gauge(self, name: str, help_text: str, fn: Callable[[], float]) -> None:
+        self._meta[name] = ('gauge', help_text, ())
+        self._gauges[name] = fn
+    
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series[name]
+            series[key] = series.get(key, 0) + amount
+    
+    def observe(self, name: str, value: float, **labels) -> None:
+        buckets = self._meta[name][2]
+        key = tuple(sorted(labels.items()))
+        slot = bisect.bisect_left(buckets, value)
+        with self._lock:
+            series = self._series[name]
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = {'counts': [0] * (len(buckets) + 1), 'sum': 0.0, 'count': 0}
+            hist['counts'][slot] += 1
+            hist['sum'] += value
+            hist['count'] += 1
+    
+    def _collect(self) -> List[Tuple[str, str, str, Dict[Tuple, Any]]]:
+        with self._lock:
+            series = {name: {key: (dict(v, counts=list(v['counts'])) if isinstance(v, dict) else v)
+                             for key, v in values.items()}
+                      for name, values in self._series.items()}
+        out = []
+        for name, (kind, help_text, _) in self._meta.items():
+            if kind == 'gauge':
+                values = {(): float(self._gauges[name]())}
+            else:
+                values = series[name] or {(): 0 if kind == 'counter' else
+                                          {'counts': [0] * (len(self._meta[name][2]) + 1),
+                                           'sum': 0.0, 'count': 0}}
+            out.append((name, kind, help_text, values))
+        return out
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current values. Unlabelled metrics map to a number (histograms to
+        {'count', 'sum', 'buckets': {le: cumulative}}); labelled ones to
+        {'label=value,...': ...}.
+        """
+        out: Dict[str, Any] = {}
+        for name, kind, _, values in self._collect():
+            if kind == 'histogram':
+                buckets = self._meta[name][2]
+                values = {key: {'count': h['count'], 'sum': h['sum'],
+                                'buckets': dict(zip(buckets + (float('inf'),),
+                                                    itertools.accumulate(h['counts'])))}
+                          for key, h in values.items()}
+            if set(values) == {()}:
+                out[name] = values[()]
+            else:
+                out[name] = {','.join(f'{k}={v}' for k, v in key): val
+                             for key, val in values.items()}
+        return out
+    
+    @staticmethod
+    def _labels(key: Tuple, extra: str = '') -> str:
+        parts = [f'{k}="{v}"' for k, v in key]
+        if extra:
+            parts.append(extra)
+        return '{' + ','.join(parts) + '}' if parts else ''
+    
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines = []
+        for name, kind, help_text, values in self._collect():
+            full = f'{self.namespace}_{name}'
+            lines.append(f'# HELP {full} {help_text}')
+            lines.append(f'# TYPE {full} {kind}')
+            if kind != 'histogram':
+                for key, value in values.items():
+                    lines.append(f'{full}{self._labels(key)} {float(value):g}')
+                continue
+            buckets = self._meta[name][2]
+            for key, h in values.items():
+                for le, total in zip(buckets + (float('inf'),), itertools.accumulate(h['counts'])):
+                    le_text = '+Inf' if le == float('inf') else f'{le:g}'
+                    labels = self._labels(key, 'le="%s"' % le_text)
+                    lines.append(f'{full}_bucket{labels} {total}')
+                lines.append(f'{full}_sum{self._labels(key)} {h["sum"]:g}')
+                lines.append(f'{full}_count{self._labels(key)} {h["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+def serve_metrics(registry: MetricsRegistry, port: int = 9464,
+                  host: str = '127.0.0.1') -> 'ThreadingHTTPServer':
+    """
+    Serve registry.render() at GET /metrics from a daemon thread.
+    Returns the server; call server.shutdown() to stop it. port=0 picks
+    a free port (see server.server_address).
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='memory-engine-metrics',
+                     daemon=True).start()
+    return server
+
+
+# ==============================================================================
+# SIMILARITY KERNELS (v3.2)
+# ==============================================================================
+
+def _sparse_cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """
+    Cosine similarity of two sparse term → weight vectors, in pure Python.
+    
+    A term missing from one side contributes exactly 0, so the dot product
+    runs over shared terms only. Sums are correctly rounded (math.fsum), so
+    the result does not depend on term order. Faster than building NumPy
+    arrays at every size measured: the dict walk dominates either way.
+    """
+    if not a or not b:
+        return 0.0
+    small, large = (a, b) if len(a) <= len(b) else (b, a)
+    dot = math.fsum(w * large[t] for t, w in small.items() if t in large)
+    na = math.sqrt(math.fsum(w * w for w in a.values()))
+    nb = math.sqrt(math.fsum(w * w for w in b.values()))
+    return dot / (na * nb) if (na > 0 and nb > 0) else 0.0
+
+
+# ==============================================================================
+# DERIVED RECALL INDEX (v3.2)
+# ==============================================================================
+
+class RecallIndex:
+    """
+    Derived lookup structures for recall and interference search.
+    
+    Everything here is a pure function of engine.scrolls, maintained
+    incrementally on add/merge/touch and rebuildable at any time:
+    
+        postings      term → {scroll_index: tf}. The sparse TF-IDF matrix in
+                      term-major form; IDF is applied at query time because
+                      df shifts on every add.
+        signatures    per-scroll essence token Counter used by Form 6
+                      (shares the scroll's term_frequencies when identical)
+        last_seen     per-scroll parsed last_accessed — the decay column
+        seen_us       last_seen as int64 microseconds since 1970 (seen_ok=0
+                      where unparseable) for vectorized decay
+        importance    per-scroll total_importance
+        themes        per-scroll theme
+        term_sets     per-scroll unique_terms reference (for df replay)
+        tf_norms      per-scroll L2 norm of raw term frequencies
+        term_peaks    term → max tf / tf_norm over scrolls containing it;
+                      only raised incrementally, so always an upper bound
+                      (exact again after a rebuild). Drives recall pruning.
+    
+    Running totals for diagnostics(): tcs_sum, bridge_count, merge_total.
+    Timezone-aware access times are listed in `aware` and decayed one by one.
+    
+    generation records which engine generation the index reflects.
+    """
+    
+    EPOCH = datetime(1970, 1, 1)
+    MICROSECOND = timedelta(microseconds=1)
+    
+    def __init__(self, generation: int = 0):
+        self.generation = generation
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.sig_postings: Dict[str, Set[int]] = {}
+        self.signatures: List[Dict[str, int]] = []
+        self.tfs: List[Dict[str, int]] = []
+        self.term_sets: List[Set[str]] = []
+        self.last_seen: List[Optional[datetime]] = []
+        self.seen_us = array('q')
+        self.seen_ok = array('b')
+        self.aware: Set[int] = set()
+        self.importance = array('d')
+        self.themes: List[str] = []
+        self.tf_norms = array('d')
+        self.term_peaks: Dict[str, float] = {}
+        
+        self.tcs_scores = array('d')
+        self.merges = array('q')
+        self.bridges = array('b')
+        self.tcs_sum = 0.0
+        self.merge_total = 0
+        self.bridge_count = 0
+    
+    def __len__(self) -> int:
+        return len(self.tfs)
+    
+    def copy(self) -> 'RecallIndex':
+        """
+        Independent copy for a forked engine. Per-scroll TF dicts and term
+        sets are shared: put() replaces them rather than editing them.
+        """
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.postings = {term: dict(bucket) for term, bucket in self.postings.items()}
+        clone.sig_postings = {term: set(bucket) for term, bucket in self.sig_postings.items()}
+        for name in ('signatures', 'tfs', 'term_sets', 'last_seen', 'themes'):
+            setattr(clone, name, list(getattr(self, name)))
+        for name in ('seen_us', 'seen_ok', 'importance', 'tf_norms', 'tcs_scores',
+                     'merges', 'bridges'):
+            setattr(clone, name, getattr(self, name)[:])
+        clone.aware = set(self.aware)
+        clone.term_peaks = dict(self.term_peaks)
+        return clone
+    
+    @classmethod
+    def build(cls, scrolls: List[Dict], generation: int = 0) -> 'RecallIndex':
+        index = cls(generation)
+        for idx, scroll in enumerate(scrolls):
+            index.put(idx, scroll)
+        return index
+    
+    @staticmethod
+    def signature(scroll: Dict) -> Counter:
+        """Form 6 signature: token counts of the scroll's joined essence."""
+        return Counter(SymbolicTokenizer.tokenize(" ".join(scroll.get('essence', []))))
+    
+    @staticmethod
+    def parse_accessed(scroll: Dict) -> Optional[datetime]:
+        """Parsed last access time, or None when absent/unparseable (decay 1.0)."""
+        stamp = scroll.get('last_accessed', scroll.get('timestamp'))
+        if stamp is None:
+            return None
+        try:
+            return MemoryEngine._parse_time(stamp)
+        except (ValueError, TypeError, AttributeError):
+            return None
+    
+    def put(self, idx: int, scroll: Dict) -> None:
+        """Insert or refresh the entry for scrolls[idx] (idx <= len(self))."""
+        if idx < len(self.tfs):
+            self._remove(idx)
+        else:
+            self.tfs.append({})
+            self.signatures.append({})
+            self.term_sets.append(set())
+            self.last_seen.append(None)
+            self.seen_us.append(0)
+            self.seen_ok.append(0)
+            self.importance.append(0.0)
+            self.themes.append('general')
+            self.tf_norms.append(0.0)
+            self.tcs_scores.append(0.0)
+            self.merges.append(0)
+            self.bridges.append(0)
+        
+        tf = scroll.get('term_frequencies', {})
+        norm = math.sqrt(math.fsum(count * count for count in tf.values()))
+        peaks = self.term_peaks
+        for term, count in tf.items():
+            self.postings.setdefault(term, {})[idx] = count
+            share = count / norm
+            if share > peaks.get(term, 0.0):
+                peaks[term] = share
+        self.tf_norms[idx] = norm
+        
+        sig = self.signature(scroll)
+        if sig == tf:
+            sig = tf
+        else:
+            for term in sig:
+                self.sig_postings.setdefault(term, set()).add(idx)
+        
+        unique_terms = scroll.get('unique_terms')
+        if unique_terms is None:
+            unique_terms = set(tf.keys())
+        
+        self.tfs[idx] = tf
+        self.signatures[idx] = sig
+        self.term_sets[idx] = unique_terms
+        self._set_seen(idx, self.parse_accessed(scroll))
+        self.importance[idx] = scroll.get('total_importance', 0.0)
+        self.themes[idx] = scroll.get('context', {}).get('theme', 'general')
+        
+        tcs = scroll.get('tcs', {}).get('score', 0)
+        merges = scroll.get('_merge_count', 1) - 1
+        bridge = 1 if scroll.get('_is_bridge') else 0
+        self.tcs_sum += tcs - self.tcs_scores[idx]
+        self.merge_total += merges - self.merges[idx]
+        self.bridge_count += bridge - self.bridges[idx]
+        self.tcs_scores[idx] = tcs
+        self.merges[idx] = merges
+        self.bridges[idx] = bridge
+    
+    def touch(self, idx: int, scroll: Dict) -> None:
+        """Refresh only the decay column after an access."""
+        if idx < len(self.last_seen):
+            self._set_seen(idx, self.parse_accessed(scroll))
+    
+    def _set_seen(self, idx: int, seen: Optional[datetime]) -> None:
+        self.last_seen[idx] = seen
+        if seen is None or seen.tzinfo is not None:
+            self.seen_ok[idx] = 0
+            if seen is not None:
+                self.aware.add(idx)
+            else:
+                self.aware.discard(idx)
+        else:
+            self.seen_us[idx] = (seen - self.EPOCH) // self.MICROSECOND
+            self.seen_ok[idx] = 1
+            self.aware.discard(idx)
+    
+    def _remove(self, idx: int) -> None:
+        tf = self.tfs[idx]
+        for term in tf:
+            bucket = self.postings.get(term)
+            if bucket is not None:
+                bucket.pop(idx, None)
+                if not bucket:
+                    del self.postings[term]
+        sig = self.signatures[idx]
+        if sig is not tf:
+            for term in sig:
+                bucket = self.sig_postings.get(term)
+                if bucket is not None:
+                    bucket.discard(idx)
+                    if not bucket:
+                        del self.sig_postings[term]
+    
+    def candidates(self, terms) -> Set[int]:
+        """Scrolls whose term_frequencies contain any of the given terms."""
+        found: Set[int] = set()
+        for term in terms:
+            bucket = self.postings.get(term)
+            if bucket:
+                found.update(bucket)
+        return found
+    
+    def signature_candidates(self, terms) -> Set[int]:
+        """Scrolls whose Form 6 signature contains any of the given terms."""
+        found = self.candidates(terms)
+        for term in terms:
+            bucket = self.sig_postings.get(term)
+            if bucket:
+                found.update(bucket)
+        return found
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _hash_term(term: str, dim: int) -> Tuple[int, float]:
+    """Stable signed feature hash: (bucket, ±1). Independent of PYTHONHASHSEED."""
+    data = term.encode('utf-8')
+    sign = 1.0 if zlib.crc32(data, 0x5BD1E995) & 1 else -1.0
+    return zlib.crc32(data) % dim, sign
+
+
+class HashedTermSpace:
+    """
+    Feature-hashed recall vectors (MemoryEngine(hash_dim=D)).
+    
+    Each scroll's term_frequencies are folded into a fixed D-dimensional
+    float32 row with signed hashing, so the scoring state is a dense
+    scroll×D matrix plus D bucket document frequencies, however large the
+    vocabulary grows. Recall weights rows by bucket IDF at query time and
+    scores all scrolls with two matrix-vector products per block.
+    
+    precision picks the row storage: 'float32', 'float16' (half the
+    memory) or 'int8' (a quarter, plus one float32 scale per row, the
+    row's largest magnitude / 127). Blocks are widened to float32 for
+    scoring either way; widening float16 costs noticeably more CPU
+    than int8.
+    
+    Collisions and rounding make scores approximate; memory_engine_bench.py
+    reports top-n agreement with the exact TF-IDF path for a range of D
+    and precisions.
+    """
+    
+    BLOCK_ROWS = 8192
+    PRECISIONS = ('float32', 'float16', 'int8')
+    
+    def __init__(self, dim: int, precision: str = 'float32'):
+        if precision not in self.PRECISIONS:
+            raise ValueError(f"precision must be one of {self.PRECISIONS}, not {precision!r}")
+        self.dim = int(dim)
+        self.precision = precision
+        self.rows = 0
+        self.matrix = np.zeros((64, self.dim), dtype=precision)
+        self.scales = np.ones(64, dtype=np.float32) if precision == 'int8' else None
+        self.df = np.zeros(self.dim)
+        self.buckets: List[Tuple[int, ...]] = []
+    
+    def __len__(self) -> int:
+        return self.rows
+    
+    def copy(self) -> 'HashedTermSpace':
+        """Independent copy for a forked engine."""
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.matrix = self.matrix.copy()
+        clone.scales = self.scales.copy() if self.scales is not None else None
+        clone.df = self.df.copy()
+        clone.buckets = list(self.buckets)
+        return clone
+    
+    @classmethod
+    def build(cls, scrolls: List[Dict], dim: int,
+              precision: str = 'float32') -> 'HashedTermSpace':
+        space = cls(dim, precision)
+        for idx, scroll in enumerate(scrolls):
+            space.put(idx, scroll)
+        return space
+    
+    def vector(self, tf: Dict[str, float]) -> 'np.ndarray':
+        row = np.zeros(self.dim)
+        for term, count in tf.items():
+            bucket, sign = _hash_term(term, self.dim)
+            row[bucket] += sign * count
+        return row
+    
+    def put(self, idx: int, scroll: Dict) -> None:
+        """Insert or refresh row idx (idx <= len(self))."""
+        tf = scroll.get('term_frequencies', {})
+        if idx == self.rows:
+            if self.rows == len(self.matrix):
+                grown = np.zeros((2 * len(self.matrix), self.dim), dtype=self.matrix.dtype)
+                grown[:self.rows] = self.matrix[:self.rows]
+                self.matrix = grown
+                if self.scales is not None:
+                    self.scales = np.concatenate([self.scales, np.ones_like(self.scales)])
+            self.rows += 1
+            self.buckets.append(())
+        old = self.buckets[idx]
+        if old:
+            self.df[list(old)] -= 1
+        buckets = tuple(sorted({_hash_term(term, self.dim)[0] for term in tf}))
+        if buckets:
+            self.df[list(buckets)] += 1
+        self.buckets[idx] = buckets
+        row = self.vector(tf)
+        if self.scales is not None:
+            scale = float(np.abs(row).max()) / 127.0 if buckets else 0.0
+            scale = scale or 1.0
+            self.scales[idx] = scale
+            row = np.rint(row / scale)
+        self.matrix[idx] = row
+    
+    def similarities(self, query_tf: Dict[str, float], n_docs: int) -> 'np.ndarray':
+        """Hashed TF-IDF cosine of the query against every row."""
+        sims = np.zeros(self.rows)
+        query = self.vector(query_tf)
+        idf = np.log((max(n_docs, 1) + 1) / (1 + self.df)) + 1
+        weights = idf * idf
+        query_norm = math.sqrt(float(np.dot(query * query, weights)))
+        if query_norm == 0 or not self.rows:
+            return sims
+        query_w = (query * weights).astype(np.float32)
+        weights = weights.astype(np.float32)
+        norms = np.empty(self.rows)
+        for lo in range(0, self.rows, self.BLOCK_ROWS):
+            hi = min(lo + self.BLOCK_ROWS, self.rows)
+            block = self.matrix[lo:hi].astype(np.float32, copy=False)
+            sims[lo:hi] = block @ query_w
+            norms[lo:hi] = (block * block) @ weights
+        if self.scales is not None:
+            scales = self.scales[:self.rows].astype(float)
+            sims *= scales
+            norms *= scales * scales
+        denom = np.sqrt(norms) * query_norm
+        np.divide(sims, denom, out=sims, where=denom > 0)
+        sims[denom <= 0] = 0.0
+        return sims
+    
+    @property
+    def nbytes(self) -> int:
+        extra = self.scales.nbytes if self.scales is not None else 0
+        return int(self.matrix.nbytes + self.df.nbytes + extra)
+
+
+class ClusterIndex:
+    """
+    Coarse IVF-style partition of the codex (MemoryEngine(n_clusters=K)).
+    
+    Scrolls are unit IDF-weighted TF vectors, with IDF frozen when the
+    partition is built. build() starts from one cluster per codex theme,
+    largest themes first; scrolls of themes beyond K go to the nearest
+    theme. It then bisects the largest cluster with 2-means until K
+    clusters exist, in NumPy over a CSR copy of the vectors. Each centroid
+    is truncated to its CENTROID_TERMS heaviest terms and indexed
+    term → [(cluster, weight)], so put() routes a new or changed scroll to
+    its nearest centroid by walking the scroll's own terms only.
+    
+    Probing needs the rare terms that truncation drops, so every cluster
+    also keeps exact per-term member counts (term → {cluster: count}, at
+    most one entry per posting). A query scores each cluster as
+    Σ idf·tf·count over its terms, the IDF mass of matching members it
+    holds. Centroids stay fixed until the engine rebuilds the partition:
+    after `puts` reaches its rebalance_every, or on rebalance_clusters().
+    """
+    
+    CENTROID_TERMS = 64
+    SPLIT_ITERATIONS = 2
+    
+    def __init__(self, k: int):
+        self.k = int(k)
+        self.idf: Dict[str, float] = {}
+        self.default_idf = 1.0
+        self.centroids: List[Dict[str, float]] = []
+        self.members: List[Set[int]] = []
+        self.assignment = array('i')
+        self.theme_seeds: Dict[str, int] = {}
+        self.term_counts: Dict[str, Dict[int, int]] = {}
+        self.puts = 0                       # put() calls since build
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+    
+    def __len__(self) -> int:
+        return len(self.assignment)
+    
+    def copy(self) -> 'ClusterIndex':
+        """Independent copy for a forked engine; centroids and IDF are shared (fixed until a rebuild)."""
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.members = [set(members) for members in self.members]
+        clone.assignment = self.assignment[:]
+        clone.term_counts = {term: dict(counts) for term, counts in self.term_counts.items()}
+        return clone
+    
+    @classmethod
+    def build(cls, scrolls: List[Dict], k: int, df: Dict[str, int]) -> 'ClusterIndex':
+        space = cls(k)
+        n_docs = len(scrolls)
+        space.idf = {term: math.log((n_docs + 1) / (1 + count)) + 1 for term, count in df.items()}
+        space.default_idf = math.log(n_docs + 1) + 1
+        if not n_docs:
+            return space
+        
+        vocab: Dict[str, int] = {}
+        rows, cols, vals = array('l'), array('l'), array('d')
+        vectors = []
+        for r, scroll in enumerate(scrolls):
+            vector = space.vector(scroll.get('term_frequencies', {}))
+            vectors.append(vector)
+            for term, w in vector.items():
+                rows.append(r)
+                cols.append(vocab.setdefault(term, len(vocab)))
+                vals.append(w)
+        csr = _ClusterCSR(np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp),
+                          np.array(vals), n_docs, len(vocab), cls.CENTROID_TERMS)
+        terms = list(vocab)
+        
+        themes = [scroll.get('context', {}).get('theme', 'general') for scroll in scrolls]
+        by_theme: Dict[str, List[int]] = {}
+        for r, theme in enumerate(themes):
+            by_theme.setdefault(theme, []).append(r)
+        seeded = sorted(by_theme, key=lambda t: (-len(by_theme[t]), t))[:space.k]
+        space.theme_seeds = {theme: c for c, theme in enumerate(seeded)}
+        row_cluster = np.array([space.theme_seeds.get(theme, -1) for theme in themes])
+        if len(by_theme) > len(seeded):
+            # More themes than seats: route the rest to the nearest theme
+            space._set_centroids([csr.sparse(csr.mean(csr.nnz_of(by_theme[t])), terms)
+                                  for t in seeded])
+            for r in np.flatnonzero(row_cluster < 0):
+                row_cluster[r] = space.assign(vectors[r], themes[r])
+        del vectors
+        groups = [csr.group(np.flatnonzero(row_cluster == c)) for c in range(len(seeded))]
+        
+        heap = [(-len(group[0]), c) for c, group in enumerate(groups)]
+        heapq.heapify(heap)
+        while len(groups) < min(space.k, n_docs) and heap:
+            _, c = heapq.heappop(heap)
+            halves = csr.bisect(*groups[c], cls.SPLIT_ITERATIONS)
+            if halves is None:
+                continue
+            groups[c] = halves[0]
+            groups.append(halves[1])
+            heapq.heappush(heap, (-len(halves[0][0]), c))
+            heapq.heappush(heap, (-len(halves[1][0]), len(groups) - 1))
+        
+        space._set_centroids([csr.sparse(csr.mean(nnz), terms) for _, nnz in groups])
+        space.members = [set(map(int, members)) for members, _ in groups]
+        space.assignment = array('i', bytes(array('i').itemsize * n_docs))
+        for c, members in enumerate(space.members):
+            for r in members:
+                space.assignment[r] = c
+                space._count(scrolls[r].get('term_frequencies', {}), c, 1)
+        return space
+    
+    def vector(self, tf: Dict[str, float]) -> Dict[str, float]:
+        """Unit IDF-weighted vector (build-time IDF; unseen terms get the maximum)."""
+        default = self.default_idf
+        weighted = {term: count * self.idf.get(term, default) for term, count in tf.items()}
+        norm = math.sqrt(math.fsum(w * w for w in weighted.values()))
+        if norm == 0:
+            return {}
+        return {term: w / norm for term, w in weighted.items()}
+    
+    def _set_centroids(self, centroids: List[Dict[str, float]]) -> None:
+        self.centroids = centroids
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        for c, centroid in enumerate(centroids):
+            for term, w in centroid.items():
+                postings.setdefault(term, []).append((c, w))
+        self._postings = postings
+    
+    def assign(self, vector: Dict[str, float], theme: str) -> int:
+        """Nearest centroid; the theme's seed cluster when no centroid term is shared."""
+        scores: Dict[int, float] = {}
+        postings = self._postings
+        for term, w in vector.items():
+            for c, cw in postings.get(term, ()):
+                scores[c] = scores.get(c, 0.0) + w * cw
+        if not scores:
+            return self.theme_seeds.get(theme, 0)
+        return max(scores, key=lambda c: (scores[c], -c))
+    
+    def probe(self, query_tf: Dict[str, float], nprobe: int) -> List[int]:
+        """The nprobe clusters holding the most matching IDF mass (fewer if fewer match)."""
+        scores: Dict[int, float] = {}
+        default = self.default_idf
+        for term, count in query_tf.items():
+            weight = count * self.idf.get(term, default)
+            for c, members in self.term_counts.get(term, {}).items():
+                scores[c] = scores.get(c, 0.0) + weight * members
+        return heapq.nsmallest(nprobe, scores, key=lambda c: (-scores[c], c))
+    
+    def _count(self, tf: Dict[str, float], c: int, step: int) -> None:
+        counts = self.term_counts
+        for term in tf:
+            per_cluster = counts.setdefault(term, {})
+            n = per_cluster.get(c, 0) + step
+            if n > 0:
+                per_cluster[c] = n
+            else:
+                per_cluster.pop(c, None)
+                if not per_cluster:
+                    del counts[term]
+    
+    def put(self, idx: int, scroll: Dict, old_tf: Optional[Dict[str, float]] = None) -> None:
+        """Route a new or changed scroll (idx <= len(self)); old_tf is its previous TF."""
+        if not self.centroids:
+            self._set_centroids([{}])
+            self.members = [set()]
+        tf = scroll.get('term_frequencies', {})
+        c = self.assign(self.vector(tf), scroll.get('context', {}).get('theme', 'general'))
+        if idx == len(self.assignment):
+            self.assignment.append(c)
+        else:
+            old = self.assignment[idx]
+            self.members[old].discard(idx)
+            self._count(old_tf or {}, old, -1)
+            self.assignment[idx] = c
+        self.members[c].add(idx)
+        self._count(tf, c, 1)
+        self.puts += 1
+
+
+class _ClusterCSR:
+    """Scroll vectors as flat (row, term id, weight) arrays for ClusterIndex.build."""
+    
+    def __init__(self, rows: 'np.ndarray', cols: 'np.ndarray', vals: 'np.ndarray',
+                 n_rows: int, n_terms: int, centroid_terms: int):
+        self.rows, self.cols, self.vals = rows, cols, vals
+        self.n_rows, self.n_terms = n_rows, n_terms
+        self.centroid_terms = centroid_terms
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n_rows))])
+    
+    def nnz_of(self, members) -> 'np.ndarray':
+        return np.concatenate([np.arange(self.indptr[r], self.indptr[r + 1]) for r in members])
+    
+    def group(self, members: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+        """(rows, their nonzero positions)."""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[members] = True
+        return members, np.flatnonzero(mask[self.rows])
+    
+    def mean(self, nnz: 'np.ndarray') -> 'np.ndarray':
+        """Unit centroid of the rows owning nnz, truncated to centroid_terms terms."""
+        sums = np.bincount(self.cols[nnz], weights=self.vals[nnz], minlength=self.n_terms)
+        if self.n_terms > self.centroid_terms:
+            keep = np.argpartition(sums, -self.centroid_terms)[-self.centroid_terms:]
+            truncated = np.zeros_like(sums)
+            truncated[keep] = sums[keep]
+            sums = truncated
+        norm = math.sqrt(float(sums @ sums))
+        return sums / norm if norm > 0 else sums
+    
+    def dots(self, nnz: 'np.ndarray', centroid: 'np.ndarray') -> 'np.ndarray':
+        """Row · centroid for every row (rows without nnz give 0)."""
+        return np.bincount(self.rows[nnz], weights=self.vals[nnz] * centroid[self.cols[nnz]],
+                           minlength=self.n_rows)
+    
+    def row(self, r: int) -> 'np.ndarray':
+        dense = np.zeros(self.n_terms)
+        span = slice(self.indptr[r], self.indptr[r + 1])
+        dense[self.cols[span]] = self.vals[span]
+        return dense
+    
+    def sparse(self, centroid: 'np.ndarray', terms: List[str]) -> Dict[str, float]:
+        return {terms[j]: float(centroid[j]) for j in np.flatnonzero(centroid)}
+    
+    def bisect(self, members: 'np.ndarray', nnz: 'np.ndarray', iterations: int):
+        """Split a group by 2-means, seeded from far-apart rows; None if it will not split."""
+        if len(members) < 2:
+            return None
+        sample = np.arange(0, len(members), max(len(members) // 256, 1))
+        sims = self.dots(nnz, self.mean(nnz))[members]
+        a = members[sample[np.argmin(sims[sample])]]
+        sims = self.dots(nnz, self.row(a))[members]
+        b = members[sample[np.argmin(sims[sample])]]
+        if a == b:
+            return None
+        left_c, right_c = self.row(a), self.row(b)
+        halves = None
+        for _ in range(iterations):
+            left = self.dots(nnz, left_c - right_c)[members] >= 0
+            if left.all() or not left.any():
+                return halves
+            halves = (self.group(members[left]), self.group(members[~left]))
+            left_c, right_c = self.mean(halves[0][1]), self.mean(halves[1][1])
+        return halves
+
+
+class _RebuildJob:
+    """Book-keeping for one background rebuild (index or full state load)."""
+    
+    def __init__(self, kind: str, snapshot_len: int = 0):
+        self.kind = kind                    # 'index' or 'load'
+        self.snapshot_len = snapshot_len
+        self.changed: Set[int] = set()      # 'index': scrolls touched since snapshot
+        self.ops: List[Tuple] = []          # 'load': ingests/dreams to replay
+        self.thread: Optional[threading.Thread] = None
+        self.error: Optional[BaseException] = None
+
+
+class RecallCache:
+    """
+    Bounded LRU of recall rankings (MemoryEngine(recall_cache_size=N)).
+    
+    Keys are the query's token multiset, top_n, the prune mode and the
+    current_time bucket (bucket_seconds wide, so decay moves by at most
+    one bucket's worth). Values are the ranked (scroll id, _recall_meta)
+    pairs; a hit returns fresh copies of the scrolls. Entries carry the
+    codex generation they were computed at, and a structural change (add,
+    merge, bridge, load, rebuild) drops them all.
+    
+    Hits are approximate. Access times are not structural: within a
+    bucket, a hit returns the ranking, decay and attention computed when
+    the entry was stored, including the current_time it was computed for,
+    and does not see touches recorded since. A just-touched scroll scores
+    as if it had not been touched until the bucket rolls over or the codex
+    changes. Invalidating on every touch would make every touching hit
+    evict itself, so the bucket width is the bound on staleness. Call
+    clear() after changing scoring parameters on a live engine.
+    """
+    
+    def __init__(self, maxsize: int, bucket_seconds: float = 3600.0):
+        self.maxsize = maxsize
+        self.bucket_seconds = bucket_seconds
+        self.generation: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries: 'OrderedDict[Tuple, Tuple[List[Tuple[int, Dict]], int]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def key(self, query_tf: Dict[str, int], top_n: int, moment: Optional[datetime],
+            prune: Optional[str]) -> Optional[Tuple]:
+        """Cache key, or None when current_time could not be parsed."""
+        if moment is None:
+            return None
+        bucket = int((moment - datetime(1970, 1, 1)).total_seconds() // self.bucket_seconds)
+        return (frozenset(query_tf.items()), top_n, bucket, prune)
+    
+    def get(self, key: Tuple, generation: int) -> Optional[List[Tuple[int, Dict]]]:
+        with self._lock:
+            self._sync(generation)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: Tuple, generation: int, ranking: List[Tuple[int, Dict]]) -> None:
+        size = _footprint([key, ranking], set())
+        with self._lock:
+            self._sync(generation)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            self._entries[key] = (ranking, size)
+            self.nbytes += size
+            while len(self._entries) > self.maxsize:
+                self.nbytes -= self._entries.popitem(last=False)[1][1]
+    
+    def _sync(self, generation: int) -> None:
+        if generation != self.generation:
+            self._entries.clear()
+            self.nbytes = 0
+            self.generation = generation
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+    
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {'entries': len(self._entries), 'maxsize': self.maxsize, 'bytes': self.nbytes,
+                'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0}
+
+
+# ==============================================================================
+# BOUNDED LOGS (v3.2)
+# ==============================================================================
+
+class SpillingLog:
+    """
+    Append-only record log that keeps at most `limit` records in memory.
+    
+    Behaves like the list it replaces (append, len, iteration and indexing
+    over the in-memory window). Once the window exceeds limit, the oldest
+    records — limit // 8 at a time, so each spill is one gzip member — are
+    appended as JSON lines to `spill_path` (a .jsonl.gz file), or dropped
+    when there is no spill path. limit=None never spills.
+    
+    `total` counts every record ever appended, `spilled` those on disk.
+    scan() walks spilled history lazily and then the window. Each spill
+    is appended as its own gzip member, so the log remembers the byte
+    offset where its own records begin: records an earlier run (or
+    another engine) left in the file are never read back as this log's,
+    unless a loaded state's spill_state() shows they are its history.
+    """
+    
+    def __init__(self, limit: Optional[int] = None, spill_path: Optional[str] = None,
+                 records: Optional[List[Dict]] = None):
+        self.limit = limit
+        self.spill_path = spill_path
+        self._records: List[Dict] = []
+        self._lock = threading.Lock()
+        self.spilled = 0
+        self.dropped = 0
+        self.total = 0
+        self._spill_offset = 0
+        self.replace(records or [])
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(list(self._records))
+    
+    def __getitem__(self, item):
+        return self._records[item]
+    
+    def __repr__(self) -> str:
+        return (f"SpillingLog({len(self._records)} in memory, {self.spilled} spilled, "
+                f"limit={self.limit})")
+    
+    def append(self, record: Dict) -> None:
+        with self._lock:
+            self._records.append(record)
+            self.total += 1
+            if self.limit is not None and len(self._records) > self.limit:
+                self._evict(len(self._records) - self.limit + max(self.limit // 8, 1))
+    
+    def extend(self, records) -> None:
+        for record in records:
+            self.append(record)
+    
+    def replace(self, records: List[Dict], total: Optional[int] = None,
+                spill: Optional[Dict] = None) -> None:
+        """
+        Install a loaded window. Records beyond limit are dropped, not
+        spilled: a state file's logs already passed through any spill file
+        of the engine that wrote it.
+        
+        spill is the writer's spill_state(). When it names this log's spill
+        file and the file has not grown since, the spilled history is
+        adopted and scan() covers it; otherwise history starts afresh at
+        the file's current end.
+        """
+        records = list(records)
+        size = self._spill_size()
+        with self._lock:
+            if self.limit is not None and len(records) > self.limit:
+                self.dropped += len(records) - self.limit
+                records = records[len(records) - self.limit:]
+            self._records = records
+            self.total = max(total or 0, len(records))
+            if (spill and self.spill_path is not None
+                    and spill.get('file') == os.path.abspath(self.spill_path)
+                    and spill.get('end') == size):
+                self._spill_offset, self.spilled = spill['offset'], spill['records']
+            else:
+                self._spill_offset, self.spilled = size, 0
+    
+    def spill_state(self) -> Optional[Dict]:
+        """Where this log's spilled history lives, for a state file's 'log_spill'."""
+        if self.spill_path is None:
+            return None
+        with self._lock:
+            return {'file': os.path.abspath(self.spill_path), 'offset': self._spill_offset,
+                    'records': self.spilled, 'end': self._spill_size()}
+    
+    def _spill_size(self) -> int:
+        try:
+            return os.path.getsize(self.spill_path) if self.spill_path is not None else 0
+        except OSError:
+            return 0
+    
+    def _evict(self, count: int) -> None:
+        oldest, self._records = self._records[:count], self._records[count:]
+        if self.spill_path is None:
+            self.dropped += len(oldest)
+            return
+        import gzip
+        payload = ''.join(json.dumps(r, ensure_ascii=False, default=str) + '\n' for r in oldest)
+        with gzip.open(self.spill_path, 'ab') as f:
+            f.write(payload.encode('utf-8'))
+        self.spilled += len(oldest)
+    
+    def scan(self, where: Optional[Callable[[Dict], bool]] = None,
+             since: Optional[str] = None, until: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Lazily yield records oldest first: the spill file (decompressed
+        line by line), then the in-memory window. since/until bound the
+        record 'timestamp' (ISO strings, compared as text, until exclusive);
+        where is any further predicate.
+        """
+        with self._lock:
+            window, spilled = list(self._records), self.spilled
+        
+        def keep(record: Dict) -> bool:
+            stamp = record.get('timestamp', '')
+            if since is not None and stamp < since:
+                return False
+            if until is not None and stamp >= until:
+                return False
+            return where is None or where(record)
+        
+        if spilled and self.spill_path and os.path.exists(self.spill_path):
+            import gzip
+            import io
+            with open(self.spill_path, 'rb') as raw:
+                raw.seek(self._spill_offset)
+                with io.TextIOWrapper(gzip.GzipFile(fileobj=raw), encoding='utf-8') as f:
+                    for record in map(json.loads, itertools.islice(f, spilled)):
+                        if keep(record):
+                            yield record
+        for record in window:
+            if keep(record):
+                yield record
+
+
+class AccessLog(MutableMapping):
+    """
+    access_log as compact columns aligned with scroll ids.
+    
+    Each slot is a kind byte and an int64: 0 = absent, 1 = a date
+    ('2025-01-01', stored as its midnight), 2 = a naive
+    datetime.isoformat() string (microseconds since 1970). Anything that
+    would not round-trip exactly (timezones, other formats) is kept
+    verbatim in a small side dict. Reads rebuild the original ISO string,
+    so it behaves like the Dict[int, str] it replaces at ~9 bytes a scroll.
+    """
+    
+    EPOCH = datetime(1970, 1, 1)
+    MICROSECOND = timedelta(microseconds=1)
+    
+    def __init__(self, entries: Optional[Dict[int, str]] = None):
+        self._kinds = array('b')
+        self._us = array('q')
+        self._verbatim: Dict[int, str] = {}
+        self._count = 0
+        for idx, stamp in (entries or {}).items():
+            self[idx] = stamp
+    
+    def _encode(self, stamp: str) -> Tuple[int, int]:
+        try:
+            when = datetime.fromisoformat(stamp)
+        except (TypeError, ValueError):
+            return 0, 0
+        if when.tzinfo is not None:
+            return 0, 0
+        us = (when - self.EPOCH) // self.MICROSECOND
+        if len(stamp) == 10 and when.date().isoformat() == stamp:
+            return 1, us
+        if when.isoformat() == stamp:
+            return 2, us
+        return 0, 0
+    
+    def __setitem__(self, idx: int, stamp: str) -> None:
+        idx = int(idx)
+        if idx < 0:
+            raise IndexError(idx)
+        if idx >= len(self._kinds):
+            grow = idx + 1 - len(self._kinds)
+            self._kinds.extend(bytes(grow))
+            self._us.extend(array('q', bytes(8 * grow)))
+        if self._kinds[idx] == 0 and idx not in self._verbatim:
+            self._count += 1
+        kind, us = self._encode(stamp)
+        self._kinds[idx] = kind
+        self._us[idx] = us
+        if kind:
+            self._verbatim.pop(idx, None)
+        else:
+            self._verbatim[idx] = stamp
+    
+    def __getitem__(self, idx: int) -> str:
+        if not isinstance(idx, int) or not 0 <= idx < len(self._kinds):
+            raise KeyError(idx)
+        kind = self._kinds[idx]
+        if kind == 0:
+            return self._verbatim[idx]
+        when = self.EPOCH + timedelta(microseconds=self._us[idx])
+        return when.date().isoformat() if kind == 1 else when.isoformat()
+    
+    def __delitem__(self, idx: int) -> None:
+        self[idx]  # KeyError when absent
+        self._kinds[idx] = 0
+        self._verbatim.pop(idx, None)
+        self._count -= 1
+    
+    def __iter__(self) -> Iterator[int]:
+        verbatim = self._verbatim
+        return (i for i, kind in enumerate(self._kinds) if kind or i in verbatim)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __contains__(self, idx) -> bool:
+        return (isinstance(idx, int) and 0 <= idx < len(self._kinds)
+                and (self._kinds[idx] != 0 or idx in self._verbatim))
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the columns (verbatim strings excluded)."""
+        return self._kinds.itemsize * len(self._kinds) + self._us.itemsize * len(self._us)
+    
+    def copy(self) -> 'AccessLog':
+        clone = AccessLog()
+        clone._kinds = self._kinds[:]
+        clone._us = self._us[:]
+        clone._verbatim = dict(self._verbatim)
+        clone._count = self._count
+        return clone
+
+
+# ==============================================================================
+# CHECKPOINTS (v3.2)
+# ==============================================================================
+
+class _TrackedCounter(Counter):
+    """
+    Counter that records the keys set or deleted since `changed` was last
+    reset to an empty set. changed=None (the state of a freshly built
+    counter) means "everything": a delta must carry the whole table.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self.changed: Optional[Set[str]] = None
+        super().__init__(*args, **kwargs)
+    
+    def __setitem__(self, key, value) -> None:
+        if self.changed is not None:
+            self.changed.add(key)
+        super().__setitem__(key, value)
+    
+    def __delitem__(self, key) -> None:
+        if self.changed is not None:
+            self.changed.add(key)
+        super().__delitem__(key)
+
+
+def _serialize_scroll(scroll: Dict) -> Dict:
+    """JSON-ready copy of a scroll (unique_terms as a list)."""
+    s = scroll.copy()
+    if 'unique_terms' in s:
+        s['unique_terms'] = list(s['unique_terms'])
+    return s
+
+
+# v3.2: Full exports carry 'checkpoint', 'log_totals' and 'log_spill'
+# (3.1 files have none); export_delta files are their own format.
+STATE_VERSION = '3.2'
+DELTA_VERSION = '3.2-delta'
+
+
+def _new_checkpoint_id() -> str:
+    return os.urandom(8).hex()
+
+
+def _apply_delta(state: Dict, delta: Dict) -> None:
+    """
+    Apply one export_delta file to a parsed state, in place. The delta's
+    parent must be the state's checkpoint, so a chain applies only in the
+    order it was written.
+    """
+    if delta.get('version') != DELTA_VERSION:
+        raise ValueError(f"Not a delta snapshot (version {delta.get('version')!r})")
+    if state.get('version') != STATE_VERSION:
+        raise ValueError(f"Deltas apply to a {STATE_VERSION} base, not version "
+                         f"{state.get('version')!r}; load it and export a full state first")
+    if delta.get('parent') is None or delta['parent'] != state.get('checkpoint'):
+        raise ValueError(f"Delta {delta.get('checkpoint')} expects parent {delta.get('parent')}, "
+                         f"state is at {state.get('checkpoint')}")
+    scrolls = state['scrolls']
+    for key, scroll in sorted(delta['scrolls'].items(), key=lambda item: int(item[0])):
+        idx = int(key)
+        if 'unique_terms' in scroll:
+            scroll['unique_terms'] = set(scroll['unique_terms'])
+        if idx < len(scrolls):
+            scrolls[idx] = scroll
+        elif idx == len(scrolls):
+            scrolls.append(scroll)
+        else:
+            raise ValueError(f"Delta {delta['checkpoint']} skips scroll ids before {idx}")
+    if len(scrolls) != delta['n_scrolls']:
+        raise ValueError(f"Delta {delta['checkpoint']} expects {delta['n_scrolls']} scrolls, "
+                         f"state has {len(scrolls)}")
+    for key, stamp in delta['last_accessed'].items():
+        scrolls[int(key)]['last_accessed'] = stamp
+    state.setdefault('access_log', {}).update(delta['access_log'])
+    
+    if delta.get('df_index_full'):
+        state['df_index'] = dict(delta['df_index'])
+    else:
+        df = state.setdefault('df_index', {})
+        for term, count in delta['df_index'].items():
+            if count:
+                df[term] = count
+            else:
+                df.pop(term, None)
+    
+    codex = state.setdefault('codex', {})
+    for theme, patch in delta['codex'].items():
+        patch = dict(patch)
+        start = patch.pop('start')
+        entry = codex.get(theme)
+        if entry is None or start == 0:
+            codex[theme] = patch
+        else:
+            patch['scrolls'] = entry['scrolls'][:start] + patch['scrolls']
+            entry.update(patch)
+    
+    for name in ('dream_log', 'merge_log'):
+        state.setdefault(name, []).extend(delta[name])
+    state['log_totals'] = delta['log_totals']
+    state['log_spill'] = delta.get('log_spill', {})
+    state['config'] = delta['config']
+    state['checkpoint'] = delta['checkpoint']
+
+
+def _parse_state(filepath: str, deltas: Optional[List[str]] = None) -> Dict:
+    """Read a state file (unique_terms as sets) and apply a delta chain."""
+    with open(filepath, 'r') as f:
+        state = json.load(f)
+    for scroll in state['scrolls']:
+        if 'unique_terms' in scroll:
+            scroll['unique_terms'] = set(scroll['unique_terms'])
+    for path in deltas or ():
+        with open(path, 'r') as f:
+            _apply_delta(state, json.load(f))
+    return state
+
+
+def compact_state(base_path: str, delta_paths: List[str], out_path: str) -> str:
+    """
+    Fold a base snapshot and its delta chain into one full state file.
+    
+    out_path is written atomically and may be base_path. Its checkpoint is
+    the last delta's, so the engine that wrote the chain can keep
+    appending deltas to the compacted base. Returns that checkpoint id.
+    """
+    state = _parse_state(base_path, delta_paths)
+    state['scrolls'] = [_serialize_scroll(scroll) for scroll in state['scrolls']]
+    tmp_path = f'{out_path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, out_path)
+    return state.get('checkpoint')
+
+
+# ==============================================================================
+# INGEST DEDUPE (v3.2)
+# ==============================================================================
+
+class MessageDeduper:
+    """
+    Rolling index of recent messages for ingest-side dedupe
+    (MemoryEngine(dedupe_window=N)).
+    
+    A message is a duplicate when its normalized text (casefolded,
+    whitespace collapsed) matches a message in the window exactly, or —
+    for messages of at least min_terms words — when the 64-bit SimHashes
+    of their words are within max_distance bits. On random text a single
+    changed word moves a 20-word message about 6 bits and a 40-word one
+    about 4, while unrelated messages sit near 32.
+    Near matches are found by pigeonhole: two fingerprints within d bits
+    agree exactly on at least one of d + 1 bands, so each band is a dict
+    lookup. Duplicates are not added; the window holds the last `window`
+    distinct messages.
+    """
+    
+    BITS = 64
+    
+    def __init__(self, window: int = 4096, max_distance: int = 6, min_terms: int = 8):
+        if not 0 <= max_distance < self.BITS:
+            raise ValueError(f"max_distance must be in [0, {self.BITS}), not {max_distance}")
+        self.window = window
+        self.max_distance = max_distance
+        self.min_terms = min_terms
+        width = self.BITS // (max_distance + 1)
+        self._bands = [(b * width, (1 << width) - 1 if b < max_distance
+                        else (1 << (self.BITS - b * width)) - 1)
+                       for b in range(max_distance + 1)]
+        self._entries: OrderedDict = OrderedDict()   # seq -> (exact key, fingerprint or None)
+        self._exact: Dict[int, int] = {}              # exact key -> seq
+        self._near: Dict[Tuple[int, int], Set[int]] = {}
+        self._seq = 0
+        self.checked = 0
+        self.exact_hits = 0
+        self.near_hits = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @classmethod
+    def fingerprint(cls, words: List[str]) -> int:
+        """SimHash of the words (stable across processes). Pure Python, so ingest never imports NumPy."""
+        counts = [0] * cls.BITS
+        for data in (word.encode('utf-8') for word in words):
+            value = zlib.crc32(data) | zlib.crc32(data, 0x5BD1E995) << 32
+            while value:
+                low = value & -value
+                counts[low.bit_length() - 1] += 1
+                value ^= low
+        return sum(1 << bit for bit, count in enumerate(counts) if count * 2 > len(words))
+    
+    def scan(self, messages: List[str]) -> List[bool]:
+        """Check and index each message in order; True marks a duplicate."""
+        with self._lock:
+            return [self._check(message) for message in messages]
+    
+    def _check(self, message: str) -> bool:
+        self.checked += 1
+        words = message.casefold().split()
+        key = hash(' '.join(words))
+        if key in self._exact:
+            self.exact_hits += 1
+            return True
+        fingerprint = None
+        if len(words) >= self.min_terms:
+            fingerprint = self.fingerprint(words)
+            for shift, mask in self._bands:
+                for seq in self._near.get((shift, fingerprint >> shift & mask), ()):
+                    if bin(self._entries[seq][1] ^ fingerprint).count('1') <= self.max_distance:
+                        self.near_hits += 1
+                        return True
+        self._seq += 1
+        self._entries[self._seq] = (key, fingerprint)
+        self._exact[key] = self._seq
+        if fingerprint is not None:
+            for shift, mask in self._bands:
+                self._near.setdefault((shift, fingerprint >> shift & mask), set()).add(self._seq)
+        while len(self._entries) > self.window:
+            self._evict()
+        return False
+    
+    def _evict(self) -> None:
+        seq, (key, fingerprint) = self._entries.popitem(last=False)
+        del self._exact[key]
+        if fingerprint is not None:
+            for shift, mask in self._bands:
+                band = (shift, fingerprint >> shift & mask)
+                members = self._near[band]
+                members.discard(seq)
+                if not members:
+                    del self._near[band]
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._exact.clear()
+            self._near.clear()
+    
+    def stats(self) -> Dict:
+        return {'window': len(self._entries), 'checked': self.checked,
+                'exact': self.exact_hits, 'near': self.near_hits}
+
+
+# ==============================================================================
+# FORKS (v3.2)
+# ==============================================================================
+
+class _CowShare:
+    """
+    Derived structures (recall index, hashed rows, clusters) shared by a
+    parent engine and its forks. Each holder copies them before its first
+    write, except the last one left, which takes them over.
+    """
+    
+    def __init__(self):
+        self.holders = 1
+        self._lock = threading.Lock()
     
-    SACRED_TERMS = frozenset({
-        'ψ', 'φ', 'δ', 'σ', 'γ', 'β', 'α', 'ω', 'θ', 'λ', 'μ', 'π',
-        'psi', 'phi', 'delta', 'sigma', 'gamma', 'beta', 'alpha', 'omega',
-        'qi', 'om', 'aum', 'ka', 'ba', 'ra', 'mu',
-        'ai', 'rf', 'dc', 'hz', 'ev',
-    })
+    def join(self) -> None:
+        with self._lock:
+            self.holders += 1
     
-    TOKEN_PATTERN = re.compile(
-        r"""
-        [\w\u0370-\u03FF\u0400-\u04FF\u2000-\u2BFF]+
-        (?:[-''][\w\u0370-\u03FF\u0400-\u04FF\u2000-\u2BFF]+)*
-        |
-        \d+(?:[-/.]\d+)+
-        """,
-        re.VERBOSE | re.UNICODE
-    )
+    def leave(self) -> bool:
+        """Drop one holder; True while others still hold the structures."""
+        with self._lock:
+            self.holders -= 1
+            return self.holders > 0
     
-    @classmethod
-    def tokenize(cls, text: str) -> List[str]:
-        """Tokenize preserving symbolic and sacred vocabulary."""
-        tokens = cls.TOKEN_PATTERN.findall(text)
-        result = []
-        for token in tokens:
-            lower = token.lower()
-            if lower in cls.SACRED_TERMS:
-                result.append(lower)
-                continue
-            if lower in cls.STOPWORDS:
-                continue
-            if len(lower) < 2:
-                continue
-            result.append(lower)
-        return result
+    def detach(self, copy: Callable[[], None]) -> None:
+        """
+        Drop one holder, first running copy() if others still hold the
+        structures. Under the lock, so no other holder can see itself as
+        the last and start writing while copy() is still reading.
+        """
+        with self._lock:
+            if self.holders > 1:
+                copy()
+            self.holders -= 1
 
 
 # ==============================================================================
@@ -108,8 +1829,88 @@ class MemoryEngine:
         - Dream consolidation iterates over snapshot (prevents growing-list iteration)
         - Temporal decay has configurable floor (default 0.05) so old scrolls never fully vanish
         - Bridge TCS uses normalized CE instead of automatic 1.0
+    
+    v3.2 — Performance & Operations:
+        - thread_safe mode: reader/writer locking, concurrent recalls, buffered access times
+        - recall(touch=False) is fully read-only
+        - RecallIndex: postings / signatures / decay columns, rebuilt in the background
+        - ingest_many: process-pool compression, batch interference screen, ordered commit
+        - transcript_segments / ingest_transcript: streaming JSONL chat ingest
+        - tracer / trace(): per-stage timing spans, free when no tracer is set
+        - metrics / serve_metrics(): running counters and histograms, Prometheus text
+        - recall(prune='bounded'|'exact'): MaxScore top-n pruning
+        - log_limit / log_spill_dir: bounded merge/dream logs, compact access_log
     """
     
+    # v3.2: Codices with at most this many scrolls are ranked in pure
+    # Python; larger ones with a NumPy argsort. Results are identical.
+    SMALL_CODEX_THRESHOLD = 64
+    
+    # Importance markers: α → phrases. w(x,t) = 1 + Σ α for each phrase present.
+    IMPORTANCE_MARKERS: Dict[float, Tuple[str, ...]] = {
+        0.5: ('tears', 'love', 'beloved', 'honored', 'blessed', 'heartbreak',
+              'grief', 'joy', 'beautiful', 'gratitude', 'sacred', 'prayer',
+              'mantra', 'devotion'),
+        0.3: ('theorem', 'proven', 'verified', 'simulation', 'convergence',
+              'equation', 'manifold', 'harmonic', 'eigenvalue', 'curvature',
+              'tensor', 'tensor ring', 'crystal', 'orgone', 'frequency',
+              'copper', 'shungite', 'sacred geometry', 'device', 'amplifier',
+              'circuit'),
+        0.4: ('see you', 'witness', 'soulbraid', 'connection', 'resonance',
+              'braid', 'soul braid', 'recognize', 'companion', 'together'),
+        0.6: ('realized', 'understand', 'see what', 'ohh', 'discovered',
+              'breakthrough', 'everything clicked', 'finally see',
+              'it all makes sense', 'the pattern'),
+    }
+    
+    # v3.2: Theme vocabularies. Each engine takes a mutable copy unless it
+    # shares a pool's read-only table (see SharedResources).
+    THEME_KEYWORDS: Dict[str, FrozenSet[str]] = {
+        'mathematics': frozenset({
+            'theorem', 'equation', 'manifold', 'convergence', 'curvature',
+            'hadamard', 'harmonic', 'eigenvalue', 'tensor', 'proof',
+            'mathematical', 'formula', 'differential', 'integral', 'topology',
+            'metric', 'geodesic', 'riemann', 'laplacian', 'operator',
+            'simulation', 'numerical', 'verified', 'proven', 'ψ', 'φ',
+        }),
+        'emotional': frozenset({
+            'tears', 'love', 'beloved', 'grief', 'joy', 'heartbreak',
+            'beautiful', 'sacred', 'honored', 'blessed', 'gratitude',
+            'prayer', 'devotion', 'compassion', 'healing', 'peace',
+        }),
+        'breakthrough': frozenset({
+            'breakthrough', 'realized', 'discovered', 'understand',
+            'clicked', 'pattern', 'insight', 'revelation', 'awakening',
+            'shift', 'transformation', 'emergence', 'finally', 'see',
+        }),
+        'connection': frozenset({
+            'soulbraid', 'resonance', 'braid', 'connection', 'witness',
+            'companion', 'together', 'bond', 'recognition', 'soul',
+            'bridge', 'sync', 'attunement', 'coherence',
+        }),
+        'technomancy': frozenset({
+            'crystal', 'copper', 'tensor', 'ring', 'orgone', 'device',
+            'frequency', 'amplifier', 'circuit', 'shungite', 'coil',
+            'grid', 'antenna', 'wearable', 'zinc', 'ormus',
+            'sacred', 'geometry', 'torus', 'scalar',
+        }),
+        'breathwork': frozenset({
+            'breath', 'breathing', 'inhale', 'exhale', 'pranayama',
+            'wim', 'hof', 'holotropic', 'protocol', 'oxygen',
+            'coherent', 'rhythm', 'lung', 'capacity',
+        }),
+        'memory': frozenset({
+            'memory', 'remember', 'recall', 'persist', 'scroll',
+            'codex', 'archive', 'preserve', 'encode', 'compress',
+            'glyph', 'anchor', 'engine', 'token', 'context',
+        }),
+        'integration': frozenset({
+            'integration', 'merge', 'unify', 'bridge', 'synthesis',
+            'combine', 'weave', 'spiral', 'lightbody', 'shadowbody',
+            'sovereign', 'pillar', 'framework', 'meta',
+        }),
+    }
+    
     def __init__(self, k_modes: int = 5, beta_focus: float = 2.0, 
                  gamma_decay: float = 0.05, capacity: float = 190000,
                  anchor_head: int = 240, anchor_tail: int = 240,
@@ -117,7 +1918,23 @@ class MemoryEngine:
                  interference_threshold: float = 0.75,
                  dream_resonance_threshold: float = 0.15,
                  max_importance_weight: float = 4.0,
-                 decay_floor: float = 0.05):
+                 decay_floor: float = 0.05,
+                 thread_safe: bool = False,
+                 access_batch_size: int = 64,
+                 hash_dim: Optional[int] = None,
+                 hash_precision: str = 'float32',
+                 hash_rescore: int = 0,
+                 n_clusters: Optional[int] = None,
+                 nprobe: int = 8,
+                 rebalance_every: Optional[int] = None,
+                 recall_cache_size: int = 0,
+                 recall_cache_bucket: float = 3600.0,
+                 token_counter: Optional[Callable[[str], int]] = None,
+                 dedupe_window: int = 0,
+                 dedupe_distance: int = 6,
+                 log_limit: Optional[int] = None,
+                 log_spill_dir: Optional[str] = None,
+                 shared: Optional['SharedResources'] = None):
         """
         Initialize Memory Engine v3.1.
         
@@ -148,6 +1965,67 @@ class MemoryEngine:
         decay_floor : float
             v3.1: Minimum decay value. Old scrolls never fall below this,
             ensuring ancient but important memories remain retrievable.
+        thread_safe : bool
+            v3.2: Guard the engine with a reader/writer lock so one instance
+            can be shared across threads. Recalls run concurrently; ingest,
+            merge, dream and load run exclusively.
+        access_batch_size : int
+            v3.2: In thread_safe mode, recall buffers last_accessed updates
+            and the writer applies them once this many are pending (or on
+            the next write / flush_access_updates()).
+        hash_dim : int, optional
+            v3.2: Score recall in a feature-hashed space of this many
+            dimensions (see HashedTermSpace) instead of exact TF-IDF.
+            Form 6/7 and persistence stay exact.
+        hash_precision : str
+            v3.2: Storage for hashed rows: 'float32', 'float16' or 'int8'
+            (per-row scale). Scoring is always float32.
+        hash_rescore : int
+            v3.2: In hash_dim mode, re-score the best max(hash_rescore, top_n)
+            hashed candidates exactly from term_frequencies before ranking.
+            0 keeps the pure hashed ranking.
+        n_clusters : int, optional
+            v3.2: Partition the codex into about this many clusters (see
+            ClusterIndex). Recall then fully scores only scrolls in the
+            nprobe best-matching clusters, and dream_consolidate(clustered=
+            True) pairs scrolls within a cluster. Ignored when hash_dim
+            is set.
+        nprobe : int
+            v3.2: Clusters probed per recall in n_clusters mode.
+        rebalance_every : int, optional
+            v3.2: Rebuild the partition after this many adds and merges.
+            None rebuilds once they equal the scrolls clustered at the
+            last build, which keeps the amortized cost constant.
+        recall_cache_size : int
+            v3.2: Keep up to this many recall rankings in a RecallCache,
+            dropped whenever the codex generation changes. 0 disables it.
+            Approximate: within a bucket a hit reuses the ranking, decay
+            and attention computed before any access times recorded since
+            (see RecallCache); leave it off where recall must be exact.
+        recall_cache_bucket : float
+            v3.2: Width in seconds of the current_time buckets a cached
+            ranking is reused across.
+        token_counter : callable, optional
+            v3.2: Tokens in a string, for recall_within_budget. Defaults to
+            estimate_tokens; pass the model's tokenizer for exact budgets.
+        dedupe_window : int
+            v3.2: Drop messages that repeat or nearly repeat one of the last
+            dedupe_window distinct messages before compress_to_scroll
+            weighs them (see MessageDeduper). 0 disables it.
+        dedupe_distance : int
+            v3.2: Largest SimHash bit distance counted as a near duplicate.
+        log_limit : int, optional
+            v3.2: Keep at most this many merge_log / dream_log records in
+            memory (see SpillingLog). None keeps them all.
+        log_spill_dir : str, optional
+            v3.2: Directory for merge_log.jsonl.gz / dream_log.jsonl.gz,
+            where records beyond log_limit are appended. Without it they
+            are dropped. One live engine per directory: a later engine
+            (or a load) reads back only its own spills, plus the history
+            a loaded state recorded in 'log_spill' while it still matches.
+        shared : SharedResources, optional
+            v3.2: Use a pool-wide read-only theme table, tokenizer cache and
+            vocabulary intern table instead of per-instance copies.
         """
         self.k_modes = k_modes
         self.beta_focus = beta_focus
@@ -161,58 +2039,89 @@ class MemoryEngine:
         self.max_importance_weight = max_importance_weight  # v3.1
         self.decay_floor = decay_floor  # v3.1
         
+        # v3.2: Tokenizer entry point — a pool's shared cache when given
+        self._shared = shared
+        self._tokenize: Callable[[str], List[str]] = (
+            shared.tokenize if shared is not None else SymbolicTokenizer.tokenize)
+        
         self.scrolls: List[Dict] = []
         self.codex: Dict = {}
-        self.df_index: Counter = Counter()
-        self.access_log: Dict[int, str] = {}
-        self.dream_log: List[Dict] = []  # v3.0: Record of dream consolidations
-        self.merge_log: List[Dict] = []  # v3.0: Record of interference merges
-        
-        self.theme_keywords: Dict[str, Set[str]] = {
-            'mathematics': {
-                'theorem', 'equation', 'manifold', 'convergence', 'curvature',
-                'hadamard', 'harmonic', 'eigenvalue', 'tensor', 'proof',
-                'mathematical', 'formula', 'differential', 'integral', 'topology',
-                'metric', 'geodesic', 'riemann', 'laplacian', 'operator',
-                'simulation', 'numerical', 'verified', 'proven', 'ψ', 'φ',
-            },
-            'emotional': {
-                'tears', 'love', 'beloved', 'grief', 'joy', 'heartbreak',
-                'beautiful', 'sacred', 'honored', 'blessed', 'gratitude',
-                'prayer', 'devotion', 'compassion', 'healing', 'peace',
-            },
-            'breakthrough': {
-                'breakthrough', 'realized', 'discovered', 'understand',
-                'clicked', 'pattern', 'insight', 'revelation', 'awakening',
-                'shift', 'transformation', 'emergence', 'finally', 'see',
-            },
-            'connection': {
-                'soulbraid', 'resonance', 'braid', 'connection', 'witness',
-                'companion', 'together', 'bond', 'recognition', 'soul',
-                'bridge', 'sync', 'attunement', 'coherence',
-            },
-            'technomancy': {
-                'crystal', 'copper', 'tensor', 'ring', 'orgone', 'device',
-                'frequency', 'amplifier', 'circuit', 'shungite', 'coil',
-                'grid', 'antenna', 'wearable', 'zinc', 'ormus',
-                'sacred', 'geometry', 'torus', 'scalar',
-            },
-            'breathwork': {
-                'breath', 'breathing', 'inhale', 'exhale', 'pranayama',
-                'wim', 'hof', 'holotropic', 'protocol', 'oxygen',
-                'coherent', 'rhythm', 'lung', 'capacity',
-            },
-            'memory': {
-                'memory', 'remember', 'recall', 'persist', 'scroll',
-                'codex', 'archive', 'preserve', 'encode', 'compress',
-                'glyph', 'anchor', 'engine', 'token', 'context',
-            },
-            'integration': {
-                'integration', 'merge', 'unify', 'bridge', 'synthesis',
-                'combine', 'weave', 'spiral', 'lightbody', 'shadowbody',
-                'sovereign', 'pillar', 'framework', 'meta',
-            },
-        }
+        self.df_index: Counter = _TrackedCounter()
+        self.access_log = AccessLog()  # v3.2: compact, aligned with scroll ids
+        
+        # v3.0: Records of dream consolidations / interference merges.
+        # v3.2: Bounded by log_limit, older records spilled to log_spill_dir.
+        spill = None
+        if log_spill_dir is not None:
+            os.makedirs(log_spill_dir, exist_ok=True)
+            spill = lambda name: os.path.join(log_spill_dir, f'{name}.jsonl.gz')
+        self.dream_log = SpillingLog(log_limit, spill and spill('dream_log'))
+        self.merge_log = SpillingLog(log_limit, spill and spill('merge_log'))
+        
+        # v3.2: Concurrency — lock is None unless thread_safe
+        self.access_batch_size = access_batch_size
+        self._lock: Optional[ReadWriteLock] = ReadWriteLock() if thread_safe else None
+        self._pending_access: Dict[int, str] = {}
+        self._pending_lock = threading.Lock()
+        
+        # v3.2: Derived recall index, generation stamp, background rebuild job
+        self._generation = 0
+        self._index: Optional[RecallIndex] = RecallIndex()
+        self._rebuild: Optional[_RebuildJob] = None
+        self.hash_dim = hash_dim
+        self.hash_precision = hash_precision
+        self.hash_rescore = hash_rescore
+        self._hashed: Optional[HashedTermSpace] = None
+        self.n_clusters = n_clusters
+        self.nprobe = nprobe
+        self.rebalance_every = rebalance_every
+        self._clusters: Optional[ClusterIndex] = None
+        self.recall_cache: Optional[RecallCache] = (
+            RecallCache(recall_cache_size, recall_cache_bucket) if recall_cache_size > 0 else None)
+        
+        self._top_terms_cache: Optional[Tuple[Tuple, List]] = None
+        
+        # v3.2: Token costs for recall_within_budget, per scroll id:
+        # (essence list, header, (header cost, line costs...)). Valid while
+        # the scroll still holds that essence list and header.
+        self.token_counter: Callable[[str], int] = token_counter or self.estimate_tokens
+        self._token_costs: Dict[int, Tuple[List[str], str, Tuple[int, ...]]] = {}
+        self.deduper: Optional[MessageDeduper] = (
+            MessageDeduper(dedupe_window, dedupe_distance) if dedupe_window > 0 else None)
+        
+        # v3.2: Changes since the last checkpoint (full export, delta or load)
+        self._checkpoint: Optional[str] = None
+        self._checkpoint_lock = threading.Lock()
+        self._dirty_scrolls: Set[int] = set()
+        self._dirty_access: Set[int] = set()
+        self._codex_marks: Dict[str, Tuple[int, float, Any]] = {}
+        self._log_marks: Tuple[int, int] = (0, 0)
+        
+        # v3.2: Copy-on-write sharing with forks (see fork). Scroll dicts
+        # below _cow_limit may be shared and are copied before an in-place
+        # write (_cow_owned: those already copied); derived structures are
+        # shared through _derived_share.
+        self._cow_limit = 0
+        self._cow_owned: Set[int] = set()
+        self._derived_share: Optional[_CowShare] = None
+        self._fork_parent: Optional['MemoryEngine'] = None
+        self._fork_base: Optional[Tuple[List[Dict], int, int, int]] = None
+        
+        # v3.2: Span callback (see StageTracer); None = tracing off
+        self.tracer: Optional[Callable[[Dict], None]] = None
+        # v3.2: Recall call log for offline replay (see QueryRecorder)
+        self.query_recorder: Optional[QueryRecorder] = None
+        
+        # v3.2: Running counters/histograms (see MetricsRegistry)
+        self.metrics = MetricsRegistry()
+        self._declare_metrics()
+        
+        # v3.2: Own mutable copy of THEME_KEYWORDS, or a pool's shared table
+        if shared is not None:
+            self.theme_keywords = shared.theme_keywords
+        else:
+            self.theme_keywords: Dict[str, Set[str]] = {
+                theme: set(words) for theme, words in self.THEME_KEYWORDS.items()}
         
     # ==================================================================
     # Form 1: Breath-Normalized Memory Field
@@ -225,6 +2134,11 @@ class MemoryEngine:
             available = 1.0
         return available / self.capacity
     
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Rough token count: about four characters per token, at least one per word."""
+        return max(-(-len(text) // 4), len(text.split()))
+    
     # ==================================================================
     # Importance Weighting: w(x,t) = 1 + α·||∇Φ(x,t)||
     # ==================================================================
@@ -234,23 +2148,7 @@ class MemoryEngine:
         weight = 1.0
         text_lower = text.lower()
         
-        markers = {
-            0.5: ['tears', 'love', 'beloved', 'honored', 'blessed', 'heartbreak',
-                  'grief', 'joy', 'beautiful', 'gratitude', 'sacred', 'prayer',
-                  'mantra', 'devotion'],
-            0.3: ['theorem', 'proven', 'verified', 'simulation', 'convergence',
-                  'equation', 'manifold', 'harmonic', 'eigenvalue', 'curvature',
-                  'tensor', 'tensor ring', 'crystal', 'orgone', 'frequency',
-                  'copper', 'shungite', 'sacred geometry', 'device', 'amplifier',
-                  'circuit'],
-            0.4: ['see you', 'witness', 'soulbraid', 'connection', 'resonance',
-                  'braid', 'soul braid', 'recognize', 'companion', 'together'],
-            0.6: ['realized', 'understand', 'see what', 'ohh', 'discovered',
-                  'breakthrough', 'everything clicked', 'finally see',
-                  'it all makes sense', 'the pattern'],
-        }
-        
-        for alpha, marker_list in markers.items():
+        for alpha, marker_list in self.IMPORTANCE_MARKERS.items():
             for marker in marker_list:
                 if marker in text_lower:
                     weight += alpha
@@ -278,16 +2176,39 @@ class MemoryEngine:
     # ==================================================================
     
     def compress_to_scroll(self, conversation_segment: List[str], 
-                          timestamp: str, context: Dict) -> Dict:
+                          timestamp: str, context: Dict,
+                          duplicates: Optional[List[bool]] = None) -> Dict:
         """
         Phase-Collapse + Principal Compression.
         Now includes TCS computation (Form 8).
+        
+        v3.2: With dedupe_window set, messages the deduper has already seen
+        are collapsed before any weighting: they still count toward
+        input_messages and input_chars (so CE and TCS stay honest) and are
+        tallied in _compression_meta['collapsed_messages']. A segment in
+        which every message repeats is compressed whole, so Form 6 merges
+        it into the scroll it repeats rather than a one-line remnant
+        being added. duplicates, when given, replaces the deduper's
+        verdicts (ingest_many computes them in the parent, in input order).
+        Otherwise the segment's messages enter the deduper's window here,
+        so a scroll that is compressed and then discarded still suppresses
+        later repeats of its messages.
         """
+        if duplicates is None and self.deduper is not None:
+            duplicates = self._scan_duplicates(conversation_segment)
+        elif duplicates is not None and all(duplicates):
+            duplicates = [False] * len(conversation_segment)
+        
         weighted_elements = []
         total_weight = 0.0
         total_chars = 0
+        collapsed = 0
         
-        for message in conversation_segment:
+        for position, message in enumerate(conversation_segment):
+            total_chars += len(message)
+            if duplicates is not None and duplicates[position]:
+                collapsed += 1
+                continue
             weight = self.importance_weight(message, context)
             weighted_elements.append({
                 'text': self._anchor_text(message),
@@ -295,7 +2216,6 @@ class MemoryEngine:
                 'weight': weight,
             })
             total_weight += weight
-            total_chars += len(message)
         
         sorted_elements = sorted(weighted_elements, 
                                 key=lambda x: x['weight'], reverse=True)
@@ -304,7 +2224,7 @@ class MemoryEngine:
         # Build term frequencies with symbolic tokenizer
         scroll_words = []
         for element in top_k:
-            words = SymbolicTokenizer.tokenize(element['text'])
+            words = self._tokenize(element['text'])
             scroll_words.extend(words)
         term_frequencies = dict(Counter(scroll_words))
         
@@ -333,16 +2253,29 @@ class MemoryEngine:
                 'unique_term_count': len(term_frequencies),
             },
         }
+        if duplicates is not None:
+            scroll['_compression_meta']['collapsed_messages'] = collapsed
         
         # Compute TCS (Form 8)
         scroll['tcs'] = self._compute_tcs(scroll)
         
         return scroll
     
+    def _scan_duplicates(self, messages: List[str]) -> List[bool]:
+        """Deduper verdicts for one segment, as compress_to_scroll will apply them."""
+        duplicates = self.deduper.scan(messages)
+        if duplicates and all(duplicates):
+            duplicates = [False] * len(messages)  # kept whole for Form 6
+        collapsed = sum(duplicates)
+        if collapsed:
+            self.metrics.inc('messages_collapsed_total', collapsed)
+        return duplicates
+    
     # ==================================================================
     # Form 4: Codex Update (with df_index + Interference Check)
     # ==================================================================
     
+    @_synchronized('write')
     def update_codex(self, new_scroll: Dict) -> Dict:
         """
         𝒦_{n+1} = 𝒦_n ⊕ S_{n+1}
@@ -353,12 +2286,28 @@ class MemoryEngine:
         Returns:
             Dict with 'action' key: 'added', 'merged', or the scroll itself
         """
+        clock = _StageClock('update_codex') if self.tracer is not None else None
+        
         # Form 6: Check for harmonic interference
-        merge_target = self._find_interference(new_scroll)
+        merge_target = self._find_interference(new_scroll, clock=clock)
+        result = self._commit_scroll(new_scroll, merge_target)
+        
+        if clock is not None:
+            clock.mark(result['action'])
+            clock.attrs['action'] = result['action']
+            self._emit(clock)
+        return result
+    
+    def _commit_scroll(self, new_scroll: Dict, merge_target: Optional[int]) -> Dict:
+        """Merge into merge_target, or append when None. Caller holds the write lock."""
+        job = self._rebuild
+        if job is not None and job.kind == 'load':
+            job.ops.append(('ingest', dict(new_scroll)))
         
         if merge_target is not None:
             # Merge instead of adding
             merged = self._merge_scrolls(merge_target, new_scroll)
+            self._reindex(merge_target)
             result = {
                 'action': 'merged',
                 'merged_into': merge_target,
@@ -371,9 +2320,13 @@ class MemoryEngine:
                 'similarity': merged['_merge_similarity'],
                 'theme': new_scroll['context'].get('theme', 'general'),
             })
+            self.metrics.inc('scrolls_merged_total')
+            self.metrics.observe('merge_similarity', merged['_merge_similarity'])
             return result
         
         # Normal addition
+        if self._shared is not None:
+            self._shared.intern_scroll(new_scroll)
         self.scrolls.append(new_scroll)
         scroll_index = len(self.scrolls) - 1
         self.access_log[scroll_index] = new_scroll['timestamp']
@@ -397,67 +2350,918 @@ class MemoryEngine:
         self.codex[context_key]['cumulative_importance'] += new_scroll['total_importance']
         self.codex[context_key]['last_accessed'] = new_scroll['timestamp']
         
+        self._reindex(scroll_index)
+        self.metrics.inc('scrolls_added_total')
         return {'action': 'added', 'index': scroll_index, 'scroll': new_scroll}
     
+    # ==================================================================
+    # Bulk Ingest Pipeline (v3.2)
+    # ==================================================================
+    
+    def ingest_many(self, segments, workers: int = 1, batch_size: int = 256,
+                    max_pending: Optional[int] = None,
+                    on_result: Optional[Callable[[int, Dict], None]] = None) -> Dict:
+        """
+        Bulk compress_to_scroll + update_codex in three stages.
+        
+        Stage 1: compress_to_scroll and the Form 6 signature for each segment,
+                 in a process pool of `workers` (inline when workers <= 1).
+        Stage 2: batch interference screen — each batch is compared against
+                 the codex and against itself with dense matrix products,
+                 keeping only pairs that could clear the merge threshold.
+        Stage 3: commit in input order. Screened pairs, and scrolls changed
+                 earlier in the batch, are re-checked exactly, so every merge
+                 decision matches calling update_codex one segment at a time.
+        
+        segments may be any iterable (read lazily) of {'messages',
+        'timestamp', 'context'} mappings or (messages, timestamp, context)
+        tuples. At most max_pending batches (default
+        2 × workers) are in flight, which bounds memory and applies
+        backpressure to the reader. on_result(position, result) is called
+        with each update_codex-style result.
+        
+        Returns throughput stats: segments, added, merged, batches, workers,
+        elapsed seconds, segments_per_sec and per-stage seconds.
+        """
+        started = time.perf_counter()
+        workers = max(int(workers), 1)
+        max_pending = max_pending or 2 * workers
+        stats = {
+            'segments': 0, 'added': 0, 'merged': 0, 'batches': 0,
+            'workers': workers,
+            'stage_seconds': {'compress': 0.0, 'screen': 0.0, 'commit': 0.0},
+        }
+        pool = None
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(max_workers=workers,
+                                       initializer=_init_compress_worker,
+                                       initargs=(type(self), self._config_dict()))
+        
+        def submit(batch):
+            args = [_segment_args(segment) for segment in batch]
+            if self.deduper is not None:
+                args = [(*arg, self._scan_duplicates(arg[0])) for arg in args]
+            return pool.submit(_compress_batch, args) if pool is not None else args
+        
+        def collect(handle):
+            t0 = time.perf_counter()
+            if pool is not None:
+                compressed = handle.result()
+            else:
+                compressed = [self._compress_with_signature(*args) for args in handle]
+            stats['stage_seconds']['compress'] += time.perf_counter() - t0
+            self._commit_batch(compressed, stats, on_result)
+        
+        segment_iter = iter(segments)
+        pending = deque()
+        try:
+            while True:
+                batch = list(itertools.islice(segment_iter, batch_size))
+                if not batch:
+                    break
+                pending.append(submit(batch))
+                if len(pending) >= max_pending:
+                    collect(pending.popleft())
+            while pending:
+                collect(pending.popleft())
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        elapsed = time.perf_counter() - started
+        stats['elapsed'] = elapsed
+        stats['segments_per_sec'] = stats['segments'] / elapsed if elapsed > 0 else 0.0
+        if self.tracer is not None:
+            self.tracer({'op': 'ingest_many', 'total': elapsed,
+                         'stages': dict(stats['stage_seconds']),
+                         'attrs': {key: stats[key] for key in
+                                   ('segments', 'added', 'merged', 'batches', 'workers')}})
+        return stats
+    
+    def transcript_segments(self, source, max_messages: int = 20,
+                            max_gap_minutes: float = 30.0, max_chars: int = 4000,
+                            default_theme: str = 'general') -> Iterator[Dict]:
+        """
+        Lazily cut a chat transcript into ingestible segments.
+        
+        A segment closes when it holds max_messages, when the next message
+        arrives more than max_gap_minutes after the previous one, or when
+        the next message would push it past max_chars. Each segment is
+        themed by _detect_themes over its tokens (default_theme when nothing
+        matches) and stamped with its latest message timestamp.
+        
+        source is anything read_transcript accepts. Yields
+        {'messages', 'timestamp', 'context'} dicts for ingest_many or
+        AsyncMemoryEngine.ingest_stream; only the open segment is held.
+        """
+        messages: List[str] = []
+        chars = 0
+        last_moment: Optional[datetime] = None
+        last_stamp: Optional[str] = None
+        max_gap = max_gap_minutes * 60.0
+        
+        for record in read_transcript(source):
+            text, stamp = record['text'], record['timestamp']
+            moment = None
+            if stamp is not None:
+                try:
+                    moment = self._parse_time(stamp)
+                except (ValueError, TypeError):
+                    moment = None
+            if messages:
+                gap_exceeded = False
+                if moment is not None and last_moment is not None:
+                    try:
+                        gap_exceeded = (moment - last_moment).total_seconds() > max_gap
+                    except TypeError:
+                        gap_exceeded = False
+                if (len(messages) >= max_messages or chars + len(text) > max_chars
+                        or gap_exceeded):
+                    yield self._transcript_segment(messages, last_stamp, default_theme)
+                    messages, chars = [], 0
+            messages.append(text)
+            chars += len(text)
+            if moment is not None:
+                last_moment = moment
+            if stamp is not None:
+                last_stamp = stamp
+        
+        if messages:
+            yield self._transcript_segment(messages, last_stamp, default_theme)
+    
+    def _transcript_segment(self, messages: List[str], stamp: Optional[str],
+                            default_theme: str) -> Dict:
+        themes = self._detect_themes(set(self._tokenize(" ".join(messages))))
+        theme = max(themes, key=themes.get) if themes else default_theme
+        return {
+            'messages': messages,
+            'timestamp': stamp if stamp is not None else datetime.now().isoformat(),
+            'context': {'theme': theme},
+        }
+    
+    def ingest_transcript(self, source, workers: int = 1, batch_size: int = 256,
+                          **segment_options) -> Dict:
+        """
+        Stream a transcript through transcript_segments into ingest_many.
+        
+        Memory stays bounded by the batch pipeline regardless of transcript
+        size. segment_options are passed to transcript_segments. Returns the
+        ingest_many stats.
+        """
+        segments = self.transcript_segments(source, **segment_options)
+        return self.ingest_many(segments, workers=workers, batch_size=batch_size)
+    
+    def _compress_with_signature(self, conversation_segment: List[str], timestamp: str,
+                                 context: Dict,
+                                 duplicates: Optional[List[bool]] = None) -> Tuple[Dict, Counter]:
+        """Stage 1 work unit: a scroll plus its Form 6 signature."""
+        scroll = self.compress_to_scroll(conversation_segment, timestamp, context, duplicates)
+        return scroll, RecallIndex.signature(scroll)
+    
+    @_synchronized('write')
+    def _commit_batch(self, compressed: List[Tuple[Dict, Counter]], stats: Dict,
+                      on_result: Optional[Callable[[int, Dict], None]]) -> None:
+        """Stages 2 and 3 for one batch, under a single write lock."""
+        t0 = time.perf_counter()
+        signatures = [sig for _, sig in compressed]
+        screened, screened_intra = self._screen_batch(signatures)
+        t1 = time.perf_counter()
+        
+        batch_index: List[Optional[int]] = []   # scroll index of each added batch item
+        dirty: Set[int] = set()                 # scrolls merged into during this batch
+        for b, (scroll, signature) in enumerate(compressed):
+            candidates = set(screened[b])
+            candidates.update(batch_index[j] for j in screened_intra[b]
+                              if batch_index[j] is not None)
+            candidates |= dirty
+            target = self._find_interference(scroll, candidates, signature)
+            result = self._commit_scroll(scroll, target)
+            if target is None:
+                batch_index.append(result['index'])
+                stats['added'] += 1
+            else:
+                batch_index.append(None)
+                dirty.add(target)
+                stats['merged'] += 1
+            if on_result is not None:
+                on_result(stats['segments'], result)
+            stats['segments'] += 1
+        
+        stats['batches'] += 1
+        stats['stage_seconds']['screen'] += t1 - t0
+        stats['stage_seconds']['commit'] += time.perf_counter() - t1
+    
+    def _screen_batch(self, signatures: List[Dict[str, int]],
+                      block_cells: int = 1 << 22) -> Tuple[List[Dict[int, float]],
+                                                          List[Dict[int, float]]]:
+        """
+        Stage 2: cosine of every batch signature against the codex and against
+        earlier batch items, keeping pairs above the lowest possible merge
+        threshold (same-theme) less a rounding margin. Existing scrolls are
+        processed in row blocks of at most block_cells matrix cells.
+        """
+        floor = min(self.interference_threshold, self.interference_threshold * 0.9) - 1e-9
+        n_batch = len(signatures)
+        screened: List[Dict[int, float]] = [{} for _ in range(n_batch)]
+        screened_intra: List[Dict[int, float]] = [{} for _ in range(n_batch)]
+        
+        vocab: Dict[str, int] = {}
+        for sig in signatures:
+            for term in sig:
+                vocab.setdefault(term, len(vocab))
+        if not vocab:
+            return screened, screened_intra
+        
+        batch = np.zeros((n_batch, len(vocab)))
+        for b, sig in enumerate(signatures):
+            for term, count in sig.items():
+                batch[b, vocab[term]] = count
+        batch_norm = np.linalg.norm(batch, axis=1)
+        batch_norm[batch_norm == 0] = np.inf
+        
+        intra = (batch @ batch.T) / np.outer(batch_norm, batch_norm)
+        for b in range(n_batch):
+            for j in np.nonzero(intra[:b, b] > floor)[0]:
+                screened_intra[b][int(j)] = float(intra[j, b])
+        
+        index = self._current_index()
+        existing = sorted(index.signature_candidates(vocab))
+        rows_per_block = max(block_cells // len(vocab), 1)
+        for start in range(0, len(existing), rows_per_block):
+            block_ids = existing[start:start + rows_per_block]
+            block = np.zeros((len(block_ids), len(vocab)))
+            block_norm = np.zeros(len(block_ids))
+            for r, idx in enumerate(block_ids):
+                squares = 0.0
+                for term, count in index.signatures[idx].items():
+                    squares += count * count
+                    col = vocab.get(term)
+                    if col is not None:
+                        block[r, col] = count
+                block_norm[r] = math.sqrt(squares)
+            block_norm[block_norm == 0] = np.inf
+            sims = (block @ batch.T) / np.outer(block_norm, batch_norm)
+            for r, b in zip(*np.nonzero(sims > floor)):
+                screened[b][block_ids[r]] = float(sims[r, b])
+        
+        return screened, screened_intra
+    
     # ==================================================================
     # Form 5: Query / Recall (TF-IDF + Decay + Theme Priors)
     # ==================================================================
     
     def recall(self, query: str, top_n: int = 3, 
-               current_time: Optional[str] = None) -> List[Dict]:
+               current_time: Optional[str] = None,
+               touch: bool = True, timings: bool = False,
+               prune: Optional[str] = None) -> List[Dict]:
         """
         relevance_i(q) = tfidf_sim(q, S_i) · decay_i(t) · theme_prior_i(q)
         A(q) = softmax_i(β · relevance_i(q))
+        
+        v3.2: touch=False makes recall fully read-only — returned scrolls
+        keep their last_accessed and the access_log is left alone. In
+        thread_safe mode recalls share the read lock; access-time updates
+        are buffered and applied in batches by the writer. timings=True
+        attaches the per-stage breakdown (seconds) as _recall_meta['timings'].
+        
+        prune='bounded' or 'exact' finds the top_n with MaxScore pruning
+        (see _maxscore): candidates whose relevance upper bound cannot beat
+        the current n-th best are never scored. The returned scrolls and
+        their order are those of the unpruned path. 'exact' then scores the
+        skipped candidates for the softmax normaliser, so attention is exact
+        and only the full-codex sort is saved. 'bounded' skips them:
+        _recall_meta['attention'] is a lower bound and
+        _recall_meta['attention_bounds'] gives (lower, upper). Ignored
+        when hash_dim is set.
+        
+        With n_clusters set, candidates outside the nprobe clusters whose
+        centroids best match the query are never scored and count as
+        relevance 0, so rankings and attention are approximate.
+        """
+        if prune not in (None, 'bounded', 'exact'):
+            raise ValueError(f"prune must be None, 'bounded' or 'exact', not {prune!r}")
+        recorder = self.query_recorder
+        if recorder is not None and current_time is None:
+            current_time = datetime.now().isoformat()  # replay needs the actual clock
+        started = time.perf_counter()
+        if self._lock is None:
+            results = self._recall(query, top_n, current_time, touch, timings, prune)
+        else:
+            with self._lock.read():
+                results = self._recall(query, top_n, current_time, touch, timings, prune)
+            if len(self._pending_access) >= self.access_batch_size:
+                self.flush_access_updates()
+        elapsed = time.perf_counter() - started
+        self.metrics.inc('recalls_total')
+        self.metrics.observe('recall_seconds', elapsed)
+        if recorder is not None:
+            recorder.record(query, top_n, current_time, elapsed, prune)
+        return results
+    
+    def recall_within_budget(self, query: str, max_tokens: Optional[int] = None,
+                             current_time: Optional[str] = None, touch: bool = True,
+                             prune: Optional[str] = None, candidates: int = 32,
+                             method: str = 'greedy', current_tokens: int = 0) -> Dict:
+        """
+        Recall as much as fits in max_tokens, ready to inject into a prompt.
+        
+        The best `candidates` scrolls for the query are ranked as by
+        recall() and priced with token_counter (a "[theme · timestamp]"
+        header plus each essence line, cached per scroll). method='greedy'
+        takes whole scrolls by attention per token; 'knapsack' picks the
+        set of whole scrolls with the most total attention that fits
+        (0/1 dynamic programme over the token budget). Either way the
+        leftover budget is then filled with single essence lines of the
+        remaining scrolls, each worth its share of the scroll's attention
+        by weight. max_tokens None means the breath field's free capacity,
+        capacity - current_tokens (see breath_normalize).
+        
+        Returns {'text', 'scrolls', 'tokens_used', 'max_tokens',
+        'budget_used', 'candidates', 'method'}. 'scrolls' are in rank order
+        and hold only the included essence lines; their _recall_meta adds
+        'tokens' and 'partial'. Only included scrolls are touched.
         """
+        if method not in ('greedy', 'knapsack'):
+            raise ValueError(f"method must be 'greedy' or 'knapsack', not {method!r}")
+        if prune not in (None, 'bounded', 'exact'):
+            raise ValueError(f"prune must be None, 'bounded' or 'exact', not {prune!r}")
+        if max_tokens is None:
+            max_tokens = int(self.capacity * self.breath_normalize('', current_tokens))
+        if current_time is None:
+            current_time = datetime.now().isoformat()
+        started = time.perf_counter()
+        if self._lock is None:
+            bundle = self._recall_within_budget(query, max_tokens, current_time, touch,
+                                                prune, candidates, method)
+        else:
+            with self._lock.read():
+                bundle = self._recall_within_budget(query, max_tokens, current_time, touch,
+                                                    prune, candidates, method)
+            if len(self._pending_access) >= self.access_batch_size:
+                self.flush_access_updates()
+        self.metrics.inc('recalls_total')
+        self.metrics.observe('recall_seconds', time.perf_counter() - started)
+        return bundle
+    
+    def _recall_within_budget(self, query: str, max_tokens: int, current_time: str,
+                              touch: bool, prune: Optional[str], candidates: int,
+                              method: str) -> Dict:
+        positions: List[int] = []
+        ranked = self._recall(query, candidates, current_time, False, prune=prune,
+                              positions=positions)
+        headers = [self._bundle_header(scroll) for scroll in ranked]
+        costs = [self._token_cost(idx, header) for idx, header in zip(positions, headers)]
+        attention = [scroll['_recall_meta']['attention'] for scroll in ranked]
+        totals = [sum(cost) for cost in costs]
+        
+        if method == 'knapsack':
+            chosen = self._knapsack(totals, attention, max_tokens)
+        else:
+            chosen = set()
+            spent = 0
+            for r in sorted(range(len(ranked)), key=lambda r: -attention[r] / max(totals[r], 1)):
+                if spent + totals[r] <= max_tokens:
+                    chosen.add(r)
+                    spent += totals[r]
+        lines = {r: list(range(len(costs[r]) - 1)) for r in chosen}
+        spent = sum(totals[r] for r in chosen)
+        
+        # Fill what is left with single lines; a scroll's header is paid with its first line
+        pieces = []
+        for r, scroll in enumerate(ranked):
+            if r in chosen:
+                continue
+            weights = scroll.get('weights') or [1.0] * len(costs[r][1:])
+            norm = math.fsum(weights[:len(costs[r]) - 1]) or 1.0
+            for k, cost in enumerate(costs[r][1:]):
+                value = attention[r] * (weights[k] if k < len(weights) else 0.0) / norm
+                pieces.append((-value / max(cost, 1), r, k))
+        for _, r, k in sorted(pieces):
+            cost = costs[r][k + 1] + (0 if r in lines else costs[r][0])
+            if spent + cost <= max_tokens:
+                lines.setdefault(r, []).append(k)
+                spent += cost
+        
+        bundle_scrolls = []
+        blocks = []
+        for r in sorted(lines):
+            scroll = ranked[r]
+            keep = sorted(lines[r])
+            scroll['essence'] = [scroll['essence'][k] for k in keep]
+            if 'weights' in scroll:
+                scroll['weights'] = [scroll['weights'][k] for k in keep if k < len(scroll['weights'])]
+            scroll['_recall_meta'].update(
+                tokens=costs[r][0] + sum(costs[r][k + 1] for k in keep),
+                partial=r not in chosen)
+            if touch:
+                self._touch(positions[r], current_time)
+                scroll['last_accessed'] = current_time
+            bundle_scrolls.append(scroll)
+            blocks.append('\n'.join([headers[r]] + scroll['essence']))
+        return {
+            'text': '\n\n'.join(blocks),
+            'scrolls': bundle_scrolls,
+            'tokens_used': spent,
+            'max_tokens': max_tokens,
+            'budget_used': spent / max_tokens if max_tokens > 0 else 0.0,
+            'candidates': len(ranked),
+            'method': method,
+        }
+    
+    @staticmethod
+    def _bundle_header(scroll: Dict) -> str:
+        theme = scroll.get('context', {}).get('theme', 'general')
+        return f"[{theme} · {scroll.get('timestamp', '')}]"
+    
+    def _token_cost(self, idx: int, header: str) -> Tuple[int, ...]:
+        """(header cost, essence line costs...) for scrolls[idx], cached while its essence is unchanged."""
+        essence = self.scrolls[idx].get('essence', [])
+        cached = self._token_costs.get(idx)
+        if cached is not None and cached[0] is essence and cached[1] == header:
+            return cached[2]
+        count = self.token_counter
+        costs = (count(header),) + tuple(count(line) for line in essence)
+        self._token_costs[idx] = (essence, header, costs)
+        return costs
+    
+    @staticmethod
+    def _knapsack(costs: List[int], values: List[float], budget: int) -> Set[int]:
+        """Items of maximum total value with total cost ≤ budget (0/1 knapsack)."""
+        budget = max(int(budget), 0)
+        best = np.zeros(budget + 1)
+        taken = np.zeros((len(costs), budget + 1), dtype=bool)
+        for i, (cost, value) in enumerate(zip(costs, values)):
+            if cost > budget:
+                continue
+            with_item = best[:budget + 1 - cost] + value
+            better = with_item > best[cost:]
+            taken[i, cost:] = better
+            best[cost:] = np.where(better, with_item, best[cost:])
+        chosen = set()
+        room = budget
+        for i in range(len(costs) - 1, -1, -1):
+            if taken[i, room]:
+                chosen.add(i)
+                room -= costs[i]
+        return chosen
+    
+    def _recall(self, query: str, top_n: int, current_time: Optional[str],
+                touch: bool, timings: bool = False, prune: Optional[str] = None,
+                positions: Optional[List[int]] = None) -> List[Dict]:
+        """recall() without lock or metrics; positions, if given, receives each result's scroll id."""
         if not self.scrolls:
             return []
+        clock = _StageClock('recall') if (self.tracer is not None or timings) else None
         
         if current_time is None:
             current_time = datetime.now().isoformat()
         
-        query_words = SymbolicTokenizer.tokenize(query)
+        query_words = self._tokenize(query)
         query_tf = Counter(query_words)
+        if clock is not None:
+            clock.mark('tokenize')
+        
+        cache = self.recall_cache
+        cache_key = None
+        generation = self._generation
+        if cache is not None:
+            try:
+                moment = self._parse_time(current_time)
+            except (ValueError, TypeError):
+                moment = None
+            cache_key = cache.key(query_tf, top_n, moment, prune)
+            ranking = cache.get(cache_key, generation) if cache_key is not None else None
+            if ranking is not None:
+                self.metrics.inc('cache_hits_total', cache='recall')
+                results = [self._result_scroll(idx, dict(meta), current_time, touch)
+                           for idx, meta in ranking]
+                if positions is not None:
+                    positions.extend(idx for idx, _ in ranking)
+                if clock is not None:
+                    clock.mark('cache')
+                    clock.attrs.update(scrolls=len(self.scrolls), cache='hit',
+                                       returned=len(results))
+                    self._finish_recall_clock(clock, results, timings)
+                return results
+            self.metrics.inc('cache_misses_total', cache='recall')
+        
         query_themes = self._detect_themes(set(query_words))
+        if clock is not None:
+            clock.mark('themes')
         
-        scored = []
-        for i, scroll in enumerate(self.scrolls):
-            tfidf = self._tfidf_similarity(query_tf, scroll)
-            decay = self._temporal_decay(scroll, current_time)
-            prior = self._theme_prior(scroll, query_themes)
-            relevance = tfidf * decay * prior
-            scored.append((i, relevance, tfidf, decay, prior))
-        
-        relevance_values = np.array([s[1] for s in scored])
-        if np.max(relevance_values) > 0:
-            attention = self._softmax(self.beta_focus * relevance_values)
+        index = self._current_index()
+        n_scrolls = len(self.scrolls)
+        now = None
+        bounds = None
+        if self.hash_dim:
+            order, attention, tfidf, decay, prior = self._score_hashed(
+                query_tf, query_themes, index, current_time, top_n, clock)
+            candidates, rest = attention, 0.0
         else:
-            attention = np.ones(len(scored)) / len(scored)
-        
-        final = [{'scroll_index': s[0], 'attention': float(attention[i]),
-                   'tfidf': s[2], 'decay': s[3], 'prior': s[4]}
-                 for i, s in enumerate(scored)]
-        final.sort(key=lambda x: x['attention'], reverse=True)
+            # v3.2: Only scrolls sharing a query term can have non-zero TF-IDF.
+            # Everything else has relevance 0 and is scored only if returned.
+            candidates = index.candidates(query_tf)
+            if clock is not None:
+                clock.mark('candidates')
+            if self.n_clusters and candidates:
+                # Two-stage: score centroids, keep the nprobe best clusters
+                clusters = self._current_clusters()
+                probed = set(clusters.probe(query_tf, self.nprobe))
+                if sum(len(clusters.members[c]) for c in probed) < len(candidates):
+                    kept = {i for c in probed for i in clusters.members[c] if i in candidates}
+                else:
+                    kept = {i for i in candidates if clusters.assignment[i] in probed}
+                candidates = kept or candidates  # no probed scroll shares a term
+                if clock is not None:
+                    clock.mark('probe')
+                    clock.attrs['probed'] = len(probed)
+            try:
+                now = self._parse_time(current_time)
+            except (ValueError, TypeError):
+                pass
+            
+            if prune is None:
+                tfidf = {i: self._tfidf_similarity(query_tf, self.scrolls[i]) for i in candidates}
+                if clock is not None:
+                    clock.mark('tfidf')
+                decay = {i: self._decay_between(index.last_seen[i], now) for i in candidates}
+                if clock is not None:
+                    clock.mark('decay')
+                prior = {i: self._theme_prior(self.scrolls[i], query_themes) for i in candidates}
+                if clock is not None:
+                    clock.mark('theme_prior')
+            else:
+                tfidf, decay, prior, skipped = self._maxscore(
+                    query_tf, query_themes, index, now, candidates, top_n)
+                if clock is not None:
+                    clock.mark('prune')
+                    clock.attrs['scored'] = len(tfidf)
+                if prune == 'exact':
+                    for i in candidates.difference(tfidf):
+                        tfidf[i] = self._tfidf_similarity(query_tf, self.scrolls[i])
+                        decay[i] = self._decay_between(index.last_seen[i], now)
+                        prior[i] = self._theme_prior(self.scrolls[i], query_themes)
+                    skipped = []
+                    if clock is not None:
+                        clock.mark('tfidf')
+            
+            attention, rest = self._attention(
+                {i: tfidf[i] * decay[i] * prior[i] for i in tfidf}, n_scrolls)
+            if prune == 'bounded':
+                # Unscored candidates were treated as relevance 0, so these
+                # are upper bounds. Raising each skipped scroll to its own
+                # bound b scales the normaliser by 1 + rest·Σ(e^{βb} − 1).
+                spread = 1.0 + rest * math.fsum(math.expm1(self.beta_focus * b) for b in skipped)
+                bounds = {i: (a / spread, a) for i, a in attention.items()}
+            if clock is not None:
+                clock.mark('softmax')
+            
+            # Stable descending sort — equal attention keeps scroll order
+            order = None
+            if prune is not None:
+                order = heapq.nsmallest(top_n, attention, key=lambda i: (-attention[i], i))
+                if len(order) < top_n or (order and attention[order[-1]] <= rest):
+                    order = None
+            if order is None:
+                order = self._rank(attention, rest, n_scrolls, top_n)
+            if clock is not None:
+                clock.mark('sort')
         
         results = []
-        for r in final[:top_n]:
-            idx = r['scroll_index']
-            self.scrolls[idx]['last_accessed'] = current_time
-            self.access_log[idx] = current_time
-            scroll = self.scrolls[idx].copy()
-            scroll.pop('unique_terms', None)
-            scroll['_recall_meta'] = {
-                'attention': r['attention'], 'tfidf': r['tfidf'],
-                'decay': r['decay'], 'theme_prior': r['prior'],
+        ranking = []
+        for idx in order:
+            if idx not in candidates:
+                tfidf[idx] = self._tfidf_similarity(query_tf, self.scrolls[idx])
+                decay[idx] = self._decay_between(index.last_seen[idx], now)
+                prior[idx] = self._theme_prior(self.scrolls[idx], query_themes)
+            meta = {
+                'attention': attention.get(idx, rest), 'tfidf': tfidf[idx],
+                'decay': decay[idx], 'theme_prior': prior[idx],
             }
-            results.append(scroll)
-        
+            if bounds is not None:
+                low, high = bounds.get(idx, (rest, rest))
+                meta.update(attention=low, attention_bounds=(low, high))
+            if cache_key is not None:
+                ranking.append((idx, dict(meta)))
+            results.append(self._result_scroll(idx, meta, current_time, touch))
+        if positions is not None:
+            positions.extend(int(i) for i in order)
+        if cache_key is not None:
+            cache.put(cache_key, generation, ranking)
+        
+        if clock is not None:
+            clock.mark('copy')
+            clock.attrs.update(scrolls=n_scrolls,
+                               candidates=n_scrolls if self.hash_dim else len(candidates),
+                               returned=len(results))
+            if cache is not None:
+                clock.attrs['cache'] = 'miss'
+            self._finish_recall_clock(clock, results, timings)
         return results
     
+    def _result_scroll(self, idx: int, meta: Dict, current_time: str, touch: bool) -> Dict:
+        """Copy of scrolls[idx] as recall returns it, recording the access if touch."""
+        scroll = self.scrolls[idx].copy()
+        if touch:
+            self._touch(idx, current_time)
+            scroll['last_accessed'] = current_time
+        scroll.pop('unique_terms', None)
+        scroll['_recall_meta'] = meta
+        return scroll
+    
+    def _finish_recall_clock(self, clock: _StageClock, results: List[Dict], timings: bool) -> None:
+        if timings:
+            breakdown = dict(clock.stages, total=time.perf_counter() - clock.started)
+            for scroll in results:
+                scroll['_recall_meta']['timings'] = breakdown
+        self._emit(clock)
+    
+    def _touch(self, idx: int, current_time: str) -> None:
+        """Record an access — immediately, or buffered for the writer in thread_safe mode."""
+        if self._lock is None:
+            self._own_scroll(idx)['last_accessed'] = current_time
+            self.access_log[idx] = current_time
+            self._reindex(idx, structural=False)
+            return
+        with self._pending_lock:
+            self._pending_access[idx] = current_time
+    
+    def flush_access_updates(self) -> int:
+        """
+        v3.2: Apply buffered recall access times (thread_safe mode).
+        
+        Takes the write lock. Returns the number of scrolls updated.
+        """
+        if self._lock is None:
+            return 0
+        with self._lock.write():
+            return self._apply_pending_access()
+    
+    def _apply_pending_access(self) -> int:
+        """Apply buffered access times. Caller must hold the write lock."""
+        if not self._pending_access:
+            return 0
+        with self._pending_lock:
+            pending, self._pending_access = self._pending_access, {}
+        n_scrolls = len(self.scrolls)
+        for idx, accessed in pending.items():
+            if idx < n_scrolls:
+                self._own_scroll(idx)['last_accessed'] = accessed
+                self.access_log[idx] = accessed
+                self._reindex(idx, structural=False)
+        return len(pending)
+    
+    # ==================================================================
+    # Derived Index Maintenance (v3.2)
+    # ==================================================================
+    
+    @property
+    def generation(self) -> int:
+        """Codex generation — bumps on every add, merge, bridge, load or rebuild."""
+        return self._generation
+    
+    def _reindex(self, idx: int, structural: bool = True) -> None:
+        """Propagate a change to scrolls[idx] into the derived index."""
+        if self._derived_share is not None:
+            self._own_derived()
+        if structural:
+            self._generation += 1
+            self._dirty_scrolls.add(idx)
+        else:
+            self._dirty_access.add(idx)
+        clusters = self._clusters
+        if clusters is not None and structural:
+            # Before the index moves on: its tfs[idx] is the old TF
+            index = self._index
+            if index is not None and len(index) == len(clusters) and idx <= len(clusters):
+                clusters.put(idx, self.scrolls[idx], index.tfs[idx] if idx < len(index) else None)
+            else:
+                self._clusters = None
+        index = self._index
+        if index is not None:
+            if idx < len(index) or (structural and idx == len(index)):
+                if structural:
+                    index.put(idx, self.scrolls[idx])
+                    index.generation = self._generation
+                else:
+                    index.touch(idx, self.scrolls[idx])
+            else:
+                # Out of step (scrolls edited directly) — rebuilt on next use
+                self._index = None
+        hashed = self._hashed
+        if hashed is not None and structural:
+            if idx <= len(hashed):
+                hashed.put(idx, self.scrolls[idx])
+            else:
+                self._hashed = None
+        job = self._rebuild
+        if job is not None and job.kind == 'index':
+            job.changed.add(idx)
+    
+    # ==================================================================
+    # Tracing & Metrics (v3.2)
+    # ==================================================================
+    
+    def _declare_metrics(self) -> None:
+        m = self.metrics
+        m.counter('recalls_total', 'Recall calls served.')
+        m.histogram('recall_seconds', 'Recall latency in seconds, lock wait included.')
+        m.counter('scrolls_added_total', 'Scrolls appended to the codex.')
+        m.counter('scrolls_merged_total', 'Scrolls merged into an existing scroll (Form 6).')
+        m.histogram('merge_similarity', 'Signature cosine similarity of Form 6 merges.',
+                    buckets=(0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95, 0.99))
+        m.counter('dream_passes_total', 'dream_consolidate passes run.')
+        m.counter('dream_pairs_scanned_total', 'Scroll pairs visited by dream passes.')
+        m.counter('bridges_created_total', 'Bridge scrolls created by dream passes.')
+        m.counter('messages_collapsed_total', 'Ingested messages dropped as duplicates.')
+        m.counter('cache_hits_total', 'Cache hits by cache.')
+        m.counter('cache_misses_total', 'Cache misses by cache.')
+        m.histogram('export_seconds', 'export_memory_state duration in seconds.')
+        m.histogram('load_seconds', 'load_memory_state duration in seconds (read to install).')
+        m.gauge('scrolls', 'Scrolls in the codex.', lambda: len(self.scrolls))
+        m.gauge('df_index_terms', 'Distinct terms in df_index.', lambda: len(self.df_index))
+        m.gauge('generation', 'Structural generation counter.', lambda: self._generation)
+        m.gauge('pending_access_updates', 'Buffered recall access-time updates.',
+                lambda: len(self._pending_access))
+        m.gauge('recall_cache_entries', 'Rankings held by the recall cache.',
+                lambda: len(self.recall_cache) if self.recall_cache is not None else 0)
+        m.gauge('recall_cache_bytes', 'Approximate bytes held by the recall cache.',
+                lambda: self.recall_cache.nbytes if self.recall_cache is not None else 0)
+    
+    def serve_metrics(self, port: int = 9464, host: str = '127.0.0.1') -> 'ThreadingHTTPServer':
+        """Expose self.metrics at http://host:port/metrics (see serve_metrics)."""
+        return serve_metrics(self.metrics, port=port, host=host)
+    
+    def _emit(self, clock: _StageClock) -> None:
+        tracer = self.tracer
+        if tracer is not None:
+            tracer(clock.span())
+    
+    @contextmanager
+    def trace(self, tracer: Optional[Callable[[Dict], None]] = None):
+        """
+        Install a tracer for the duration of a with-block (a fresh
+        StageTracer unless one is given) and yield it.
+        
+            with engine.trace() as tracer:
+                engine.recall('manifold')
+            tracer.summary()['recall']['stages']
+        """
+        tracer = tracer if tracer is not None else StageTracer()
+        previous, self.tracer = self.tracer, tracer
+        try:
+            yield tracer
+        finally:
+            self.tracer = previous
+    
+    @contextmanager
+    def record_queries(self, path: str):
+        """
+        Log every recall to path (see QueryRecorder) for the duration of a
+        with-block, then flush, and yield the recorder.
+        
+            with engine.record_queries('queries.jsonl.gz'):
+                serve_traffic(engine)
+        """
+        recorder = QueryRecorder(path)
+        previous, self.query_recorder = self.query_recorder, recorder
+        try:
+            yield recorder
+        finally:
+            self.query_recorder = previous
+            recorder.close()
+    
+    def _current_index(self) -> RecallIndex:
+        """The live index, rebuilt synchronously if it no longer matches the scrolls."""
+        index = self._index
+        if index is None or len(index) != len(self.scrolls):
+            index = RecallIndex.build(self.scrolls, self._generation)
+            self._index = index
+        return index
+    
+    def _current_hashed(self) -> HashedTermSpace:
+        """The feature-hashed space (hash_dim mode), built on first use."""
+        space = self._hashed
+        if (space is None or space.dim != self.hash_dim or len(space) != len(self.scrolls)
+                or space.precision != self.hash_precision):
+            space = HashedTermSpace.build(self.scrolls, self.hash_dim, self.hash_precision)
+            self._hashed = space
+        return space
+    
+    def _current_clusters(self) -> ClusterIndex:
+        """The coarse partition (n_clusters mode), rebuilt when out of step or due a rebalance."""
+        clusters = self._clusters
+        if clusters is not None:
+            due = self.rebalance_every
+            if due is None:
+                due = max(len(clusters) - clusters.puts, 1)
+            if (clusters.k != self.n_clusters or len(clusters) != len(self.scrolls)
+                    or clusters.puts >= due):
+                clusters = None
+        if clusters is None:
+            clusters = ClusterIndex.build(self.scrolls, self.n_clusters, self.df_index)
+            self._clusters = clusters
+        return clusters
+    
+    @_synchronized('write')
+    def rebalance_clusters(self) -> ClusterIndex:
+        """
+        v3.2: Rebuild the n_clusters partition now — re-seed from the codex
+        themes, refresh IDF and re-run k-means over every scroll. Returns it.
+        """
+        if not self.n_clusters:
+            raise ValueError("rebalance_clusters requires MemoryEngine(n_clusters=K)")
+        self._clusters = None
+        return self._current_clusters()
+    
+    def _require_background(self) -> None:
+        if self._lock is None:
+            raise ValueError("background=True requires MemoryEngine(thread_safe=True)")
+        if self._rebuild is not None:
+            raise RuntimeError("A background rebuild is already running")
+    
+    @staticmethod
+    def _build_derived(scrolls: List[Dict]) -> Tuple[RecallIndex, Counter]:
+        """Build a fresh index and df_index from a list of scrolls."""
+        index = RecallIndex.build(scrolls)
+        df = Counter()
+        for terms in index.term_sets:
+            df.update(terms)
+        return index, df
+    
+    @_synchronized('write')
+    def rebuild_index(self, background: bool = False) -> Optional[threading.Thread]:
+        """
+        v3.2: Rebuild derived state from the scrolls — the recall index
+        (postings, interference signatures, decay columns) and df_index.
+        
+        Use after editing engine.scrolls directly or after a bulk import
+        that bypassed update_codex. With background=True (thread_safe only)
+        the build runs in a worker thread from a snapshot while the current
+        index keeps serving; scrolls added or changed meanwhile are replayed
+        onto the new index before it is swapped in under the write lock.
+        Returns the worker thread (join it to wait for the swap).
+        """
+        if not background:
+            index, df = self._build_derived(self.scrolls)
+            self._publish_index(index, df, None)
+            return None
+        
+        self._require_background()
+        snapshot = list(self.scrolls)
+        job = _RebuildJob('index', len(snapshot))
+        self._rebuild = job
+        
+        def work():
+            try:
+                index, df = self._build_derived(snapshot)
+            except BaseException:
+                with self._lock.write():
+                    if self._rebuild is job:
+                        self._rebuild = None
+                raise
+            with self._lock.write():
+                if self._rebuild is job:
+                    self._rebuild = None
+                    self._publish_index(index, df, job)
+        
+        job.thread = threading.Thread(target=work, name='memory-engine-rebuild', daemon=True)
+        job.thread.start()
+        return job.thread
+    
+    def _publish_index(self, index: RecallIndex, df: Counter,
+                       job: Optional[_RebuildJob]) -> None:
+        """Replay changes made since the snapshot, then swap in. Caller holds the write lock."""
+        if job is not None:
+            n_scrolls = len(self.scrolls)
+            replay = job.changed | set(range(job.snapshot_len, n_scrolls))
+            for idx in sorted(replay):
+                if idx >= n_scrolls:
+                    continue
+                old_terms = index.term_sets[idx] if idx < len(index) else ()
+                index.put(idx, self.scrolls[idx])
+                for term in old_terms:
+                    df[term] -= 1
+                    if df[term] <= 0:
+                        del df[term]
+                df.update(index.term_sets[idx])
+        self._generation += 1
+        index.generation = self._generation
+        self._release_derived()
+        self._index = index
+        self.df_index = _TrackedCounter(df)
+        self._dirty_scrolls.update(range(len(self.scrolls)))
+        self._hashed = None
+        self._clusters = None
+    
     # ==================================================================
     # Form 6: Harmonic Interference (v3.0)
     # ==================================================================
     
-    def _find_interference(self, new_scroll: Dict) -> Optional[int]:
+    def _find_interference(self, new_scroll: Dict, candidates=None,
+                           signature: Optional[Dict[str, int]] = None,
+                           clock: Optional[_StageClock] = None) -> Optional[int]:
         """
         Form 6: Harmonic Interference Detection
         
@@ -468,25 +3272,31 @@ class MemoryEngine:
         
         We check against scrolls with the same theme first (most likely 
         candidates), then all scrolls if no same-theme match found.
+        
+        v3.2: Signatures come from the RecallIndex, and only scrolls sharing
+        at least one essence term are compared — any other pair has cosine 0.
+        ingest_many passes a pre-screened candidate set and signature.
         """
         if not self.scrolls:
             return None
         
-        new_tf = Counter(SymbolicTokenizer.tokenize(
-            " ".join(new_scroll.get('essence', []))
-        ))
+        new_tf = signature if signature is not None else RecallIndex.signature(new_scroll)
         if not new_tf:
             return None
         
         new_theme = new_scroll.get('context', {}).get('theme', 'general')
+        index = self._current_index()
+        if candidates is None:
+            candidates = index.signature_candidates(new_tf)
+        if clock is not None:
+            clock.mark('signature')
+            clock.attrs['candidates'] = len(candidates)
         
         best_sim = 0.0
         best_idx = None
         
-        for i, existing in enumerate(self.scrolls):
-            existing_tf = Counter(SymbolicTokenizer.tokenize(
-                " ".join(existing.get('essence', []))
-            ))
+        for i in sorted(candidates):
+            existing_tf = index.signatures[i]
             if not existing_tf:
                 continue
             
@@ -494,7 +3304,7 @@ class MemoryEngine:
             
             # Same-theme scrolls get a slight boost to merge threshold 
             # (they're more likely to be genuine duplicates)
-            existing_theme = existing.get('context', {}).get('theme', 'general')
+            existing_theme = index.themes[i]
             effective_threshold = self.interference_threshold
             if new_theme == existing_theme:
                 effective_threshold *= 0.9  # 10% easier to merge same-theme
@@ -503,6 +3313,8 @@ class MemoryEngine:
                 best_sim = sim
                 best_idx = i
         
+        if clock is not None:
+            clock.mark('interference')
         return best_idx
     
     def _merge_scrolls(self, target_idx: int, new_scroll: Dict) -> Dict:
@@ -518,11 +3330,11 @@ class MemoryEngine:
         - Updates _compression_meta to reflect merged state (fixes stale TCS)
         - Updates codex cumulative_importance for the target's theme
         """
-        target = self.scrolls[target_idx]
+        target = self._own_scroll(target_idx)
         
         # Compute similarity for logging
-        new_tf = Counter(SymbolicTokenizer.tokenize(" ".join(new_scroll.get('essence', []))))
-        target_tf = Counter(SymbolicTokenizer.tokenize(" ".join(target.get('essence', []))))
+        new_tf = Counter(self._tokenize(" ".join(new_scroll.get('essence', []))))
+        target_tf = Counter(self._tokenize(" ".join(target.get('essence', []))))
         similarity = self._cosine_similarity_raw(new_tf, target_tf)
         
         # Snapshot old state for accounting
@@ -543,7 +3355,7 @@ class MemoryEngine:
         # Rebuild term frequencies from merged essence
         merged_words = []
         for e in merged_top:
-            merged_words.extend(SymbolicTokenizer.tokenize(e['text']))
+            merged_words.extend(self._tokenize(e['text']))
         merged_tf = dict(Counter(merged_words))
         new_unique = set(merged_tf.keys())
         
@@ -581,6 +3393,10 @@ class MemoryEngine:
             'total_weight': new_total_importance,
             'unique_term_count': len(merged_tf),
         }
+        if 'collapsed_messages' in old_meta or 'collapsed_messages' in new_meta:
+            # v3.2: Dedupe counts accumulate like input_messages
+            target['_compression_meta']['collapsed_messages'] = (
+                old_meta.get('collapsed_messages', 0) + new_meta.get('collapsed_messages', 0))
         
         # v3.1: Update codex cumulative_importance
         theme = target.get('context', {}).get('theme', 'general')
@@ -598,7 +3414,9 @@ class MemoryEngine:
     # Form 7: Dream-State Consolidation (v3.0)
     # ==================================================================
     
-    def dream_consolidate(self, current_time: Optional[str] = None) -> List[Dict]:
+    @_synchronized('write')
+    def dream_consolidate(self, current_time: Optional[str] = None,
+                          clustered: bool = False) -> List[Dict]:
         """
         Form 7: Dream-State Consolidation
         
@@ -613,13 +3431,24 @@ class MemoryEngine:
         Mathematics + Grief → "The equation of loss"
         Technomancy + Breathwork → "The circuit breathes"
         
+        v3.2: clustered=True (n_clusters mode) only pairs scrolls that
+        share a ClusterIndex cluster, so a pass costs Σ|cluster|² rather
+        than n². Bridges between clusters are not looked for.
+        
         Returns list of Bridge Scrolls created during this dream cycle.
         """
         if current_time is None:
             current_time = datetime.now().isoformat()
+        if clustered and not self.n_clusters:
+            raise ValueError("clustered=True requires MemoryEngine(n_clusters=K)")
+        
+        job = self._rebuild
+        if job is not None and job.kind == 'load':
+            job.ops.append(('dream', (current_time, clustered)))
         
         if len(self.scrolls) < 2:
             return []
+        clock = _StageClock('dream_consolidate') if self.tracer is not None else None
         
         bridges_created = []
         checked_pairs = set()
@@ -629,12 +3458,18 @@ class MemoryEngine:
         # visited — prevents growing-list iteration and potential
         # runaway bridge-of-bridge creation if theme guards change.
         n_scrolls = len(self.scrolls)
+        blocks = None
+        if clustered:
+            clusters = self._current_clusters()
+            blocks = [sorted(members) for members in clusters.members]
+            block_of = list(clusters.assignment)
         
         for i in range(n_scrolls):
             scroll_a = self.scrolls[i]
             theme_a = scroll_a.get('context', {}).get('theme', 'general')
+            partners = range(n_scrolls) if blocks is None else blocks[block_of[i]]
             
-            for j in range(n_scrolls):
+            for j in partners:
                 scroll_b = self.scrolls[j]
                 if i >= j:
                     continue
@@ -660,6 +3495,8 @@ class MemoryEngine:
                 resonance = self._cross_resonance(scroll_a, scroll_b)
                 
                 if resonance >= self.dream_resonance_threshold:
+                    if clock is not None:
+                        clock.mark('scan')
                     bridge = self._create_bridge_scroll(
                         scroll_a, i, scroll_b, j, resonance, current_time
                     )
@@ -683,6 +3520,7 @@ class MemoryEngine:
                     self.codex['dream_bridge']['scrolls'].append(bridge_idx)
                     self.codex['dream_bridge']['cumulative_importance'] += bridge['total_importance']
                     self.codex['dream_bridge']['last_accessed'] = current_time
+                    self._reindex(bridge_idx)
                     
                     # Log the dream
                     dream_record = {
@@ -697,7 +3535,17 @@ class MemoryEngine:
                     }
                     self.dream_log.append(dream_record)
                     bridges_created.append(dream_record)
-        
+                    if clock is not None:
+                        clock.mark('bridge')
+        
+        self.metrics.inc('dream_passes_total')
+        self.metrics.inc('dream_pairs_scanned_total', len(checked_pairs))
+        self.metrics.inc('bridges_created_total', len(bridges_created))
+        if clock is not None:
+            clock.mark('scan')
+            clock.attrs.update(scrolls=n_scrolls, pairs=len(checked_pairs),
+                               bridges=len(bridges_created))
+            self._emit(clock)
         return bridges_created
     
     def _cross_resonance(self, scroll_a: Dict, scroll_b: Dict) -> float:
@@ -749,7 +3597,7 @@ class MemoryEngine:
         # Build term frequencies from bridge content
         bridge_words = []
         for text in combined_essence:
-            bridge_words.extend(SymbolicTokenizer.tokenize(text))
+            bridge_words.extend(self._tokenize(text))
         bridge_tf = dict(Counter(bridge_words))
         
         # Bridge importance = geometric mean of parents × resonance amplifier
@@ -895,34 +3743,21 @@ class MemoryEngine:
         if not scroll_tf or not query_tf:
             return 0.0
         
-        all_terms = set(query_tf.keys()) | set(scroll_tf.keys())
         n_docs = max(len(self.scrolls), 1)
-        
-        q_vec, s_vec = [], []
-        for term in all_terms:
-            df = self.df_index.get(term, 0)
-            idf = math.log((n_docs + 1) / (1 + df)) + 1
-            q_vec.append(query_tf.get(term, 0) * idf)
-            s_vec.append(scroll_tf.get(term, 0) * idf)
-        
-        q_arr, s_arr = np.array(q_vec), np.array(s_vec)
-        dot = np.dot(q_arr, s_arr)
-        nq, ns = np.linalg.norm(q_arr), np.linalg.norm(s_arr)
-        return dot / (nq * ns) if (nq > 0 and ns > 0) else 0.0
+        df_index = self.df_index
+        idf = {}
+        for term in itertools.chain(query_tf, scroll_tf):
+            if term not in idf:
+                idf[term] = math.log((n_docs + 1) / (1 + df_index.get(term, 0))) + 1
+        
+        q_vec = {term: count * idf[term] for term, count in query_tf.items()}
+        s_vec = {term: count * idf[term] for term, count in scroll_tf.items()}
+        return _sparse_cosine(q_vec, s_vec)
     
     @staticmethod
     def _cosine_similarity_raw(tf_a: Counter, tf_b: Counter) -> float:
         """Raw cosine similarity between two term frequency vectors."""
-        all_terms = set(tf_a.keys()) | set(tf_b.keys())
-        if not all_terms:
-            return 0.0
-        
-        a_vec = np.array([tf_a.get(t, 0) for t in all_terms], dtype=float)
-        b_vec = np.array([tf_b.get(t, 0) for t in all_terms], dtype=float)
-        
-        dot = np.dot(a_vec, b_vec)
-        na, nb = np.linalg.norm(a_vec), np.linalg.norm(b_vec)
-        return dot / (na * nb) if (na > 0 and nb > 0) else 0.0
+        return _sparse_cosine(tf_a, tf_b)
     
     def _temporal_decay(self, scroll: Dict, current_time: str) -> float:
         """
@@ -936,11 +3771,21 @@ class MemoryEngine:
             last = self._parse_time(
                 scroll.get('last_accessed', scroll.get('timestamp', current_time))
             )
-            delta = max((current - last).total_seconds() / 86400.0, 0.0)
-            raw_decay = math.exp(-self.gamma_decay * delta)
-            return max(raw_decay, self.decay_floor)
         except (ValueError, TypeError):
             return 1.0
+        return self._decay_between(last, current)
+    
+    def _decay_between(self, last: Optional[datetime],
+                       current: Optional[datetime]) -> float:
+        """Decay for pre-parsed times; None on either side means unparseable (1.0)."""
+        if last is None or current is None:
+            return 1.0
+        try:
+            delta = max((current - last).total_seconds() / 86400.0, 0.0)
+        except TypeError:
+            return 1.0
+        raw_decay = math.exp(-self.gamma_decay * delta)
+        return max(raw_decay, self.decay_floor)
     
     def _detect_themes(self, query_terms: Set[str]) -> Dict[str, float]:
         """Detect query's thematic affinity."""
@@ -964,10 +3809,167 @@ class MemoryEngine:
     # Internal: Utilities
     # ==================================================================
     
-    @staticmethod
-    def _softmax(x: np.ndarray) -> np.ndarray:
-        e_x = np.exp(x - np.max(x))
-        return e_x / e_x.sum()
+    def _score_hashed(self, query_tf: Counter, query_themes: Dict[str, float],
+                      index: RecallIndex, current_time: str, top_n: int,
+                      clock: Optional[_StageClock]) -> Tuple[List[int], Dict, Dict, Dict, Dict]:
+        """
+        hash_dim recall: dense hashed TF-IDF × vectorized decay × theme
+        prior over every scroll, softmax, stable top_n. Returns the order
+        and per-result attention / tfidf / decay / prior.
+        
+        With hash_rescore, the best max(hash_rescore, top_n) scrolls by
+        hashed relevance get their exact TF-IDF from term_frequencies, and
+        top_n is drawn from that shortlist in exact order.
+        """
+        n_scrolls = len(self.scrolls)
+        sims = self._current_hashed().similarities(query_tf, n_scrolls)
+        if clock is not None:
+            clock.mark('tfidf')
+        decays = self._decay_column(index, current_time)
+        if clock is not None:
+            clock.mark('decay')
+        boosts = {theme: 1.0 + self.theme_boost * w for theme, w in query_themes.items()}
+        if boosts:
+            priors = np.fromiter((boosts.get(t, 1.0) for t in index.themes),
+                                 dtype=float, count=n_scrolls)
+        else:
+            priors = np.ones(n_scrolls)
+        if clock is not None:
+            clock.mark('theme_prior')
+        
+        relevance = sims * decays * priors
+        shortlist = None
+        if self.hash_rescore:
+            k = min(max(self.hash_rescore, top_n), n_scrolls)
+            shortlist = np.argpartition(-relevance, k - 1)[:k].tolist() if k else []
+            for i in shortlist:
+                sims[i] = self._tfidf_similarity(query_tf, self.scrolls[i])
+            relevance = sims * decays * priors
+            if clock is not None:
+                clock.mark('rescore')
+        if relevance.max() > 0:
+            scaled = self.beta_focus * relevance
+            weights = np.exp(scaled - scaled.max())
+            attention = weights / weights.sum()
+        else:
+            attention = np.full(n_scrolls, 1.0 / n_scrolls)
+        if clock is not None:
+            clock.mark('softmax')
+        if shortlist is None:
+            order = np.argsort(-attention, kind='stable')[:top_n].tolist()
+        else:
+            order = sorted(shortlist, key=lambda i: (-attention[i], i))[:top_n]
+        if clock is not None:
+            clock.mark('sort')
+        
+        def pick(values) -> Dict[int, float]:
+            return {i: float(values[i]) for i in order}
+        return order, pick(attention), pick(sims), pick(decays), pick(priors)
+    
+    def _maxscore(self, query_tf: Counter, query_themes: Dict[str, float],
+                  index: RecallIndex, now: Optional[datetime], candidates: Set[int],
+                  top_n: int) -> Tuple[Dict[int, float], Dict[int, float], Dict[int, float], List[float]]:
+        """
+        MaxScore traversal for recall(prune=...). Returns tfidf / decay /
+        prior for the scrolls it scored, plus a relevance upper bound for
+        every candidate it skipped.
+        
+        Every idf is at least 1, so a scroll's TF-IDF norm is at least
+            floor = sqrt(tf_norm² + Σ_shared tf_t²·(idf_t² − 1)),
+        and its cosine with the query is at most Σ_shared w_t·idf_t·tf_t / floor,
+        where w_t = q_t·idf_t / |q|. Multiplied by the scroll's exact decay
+        and prior, this gives a cheap per-scroll bound. The per-term bound
+        w_t · min(1, idf_t · term_peak_t) uses the largest prior instead.
+        
+        Terms are walked from the highest bound down. Once top_n are held,
+        a scroll whose bound is below the n-th best relevance is skipped
+        without scoring. Once the remaining term bounds sum below that
+        relevance, no unseen scroll can qualify and the walk stops.
+        """
+        n_docs = max(len(self.scrolls), 1)
+        idf = {term: math.log((n_docs + 1) / (1 + self.df_index.get(term, 0))) + 1
+               for term in query_tf}
+        query_norm = math.sqrt(math.fsum((count * idf[term]) ** 2
+                                         for term, count in query_tf.items()))
+        if query_norm == 0 or top_n <= 0:
+            return {}, {}, {}, []
+        weight = {term: count * idf[term] / query_norm for term, count in query_tf.items()}
+        top_prior = max([1.0] + [1.0 + self.theme_boost * w for w in query_themes.values()])
+        peak = {t: weight[t] * min(1.0, idf[t] * index.term_peaks.get(t, 1.0))
+                for t in query_tf if t in index.postings}
+        terms = sorted(peak, key=lambda t: -peak[t])
+        term_bound = [peak[t] * top_prior for t in terms]
+        remaining = list(itertools.accumulate(reversed(term_bound)))[::-1] + [0.0]
+        
+        slack = 1.0 + 1e-9
+        tfidf, decay, prior = {}, {}, {}
+        skipped: List[float] = []
+        heap: List[Tuple[float, int]] = []
+        seen: Set[int] = set()
+        for k, term in enumerate(terms):
+            if len(heap) == top_n and remaining[k] * slack < heap[0][0]:
+                skipped.extend([remaining[k]] * (len(candidates) - len(seen)))
+                break
+            for idx in index.postings[term]:
+                if idx in seen or idx not in candidates:
+                    continue  # candidates may be a clustered probe's subset
+                seen.add(idx)
+                tf = index.tfs[idx]
+                shared = [(weight[t], idf[t], tf[t]) for t in terms if t in tf]
+                floor = math.sqrt(index.tf_norms[idx] ** 2 + math.fsum(
+                    c * c * (g * g - 1.0) for _, g, c in shared))
+                d = self._decay_between(index.last_seen[idx], now)
+                p = self._theme_prior(self.scrolls[idx], query_themes)
+                bound = d * p * math.fsum(w * g * c for w, g, c in shared) / floor
+                if len(heap) == top_n and bound * slack < heap[0][0]:
+                    skipped.append(bound)
+                    continue
+                sim = self._tfidf_similarity(query_tf, self.scrolls[idx])
+                tfidf[idx], decay[idx], prior[idx] = sim, d, p
+                entry = (sim * d * p, -idx)
+                if len(heap) < top_n:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+        return tfidf, decay, prior, skipped
+    
+    def _attention(self, relevance: Dict[int, float],
+                   n_scrolls: int) -> Tuple[Dict[int, float], float]:
+        """
+        Softmax attention over all scrolls, given relevance for a sparse
+        subset (every other scroll has relevance 0). Returns attention for
+        the subset and the shared attention of the rest.
+        
+        Computed in sparse form with a correctly rounded normaliser, so the
+        result does not depend on codex size or which ranking kernel runs.
+        """
+        if not relevance or max(relevance.values()) <= 0:
+            return {i: 1.0 / n_scrolls for i in relevance}, 1.0 / n_scrolls
+        
+        beta = self.beta_focus
+        scaled = {i: beta * r for i, r in relevance.items()}
+        n_rest = n_scrolls - len(scaled)
+        peak = max(scaled.values())
+        if n_rest:
+            peak = max(peak, beta * 0.0)
+        exps = {i: math.exp(x - peak) for i, x in scaled.items()}
+        rest = math.exp(beta * 0.0 - peak)
+        total = math.fsum(itertools.chain(exps.values(), (rest * n_rest,) if n_rest else ()))
+        return {i: e / total for i, e in exps.items()}, rest / total
+    
+    def _rank(self, attention: Dict[int, float], rest: float,
+              n_scrolls: int, top_n: int) -> List[int]:
+        """Stable descending order of attention (ties keep scroll order), first top_n."""
+        if n_scrolls <= self.SMALL_CODEX_THRESHOLD:
+            values = [rest] * n_scrolls
+            for i, a in attention.items():
+                values[i] = a
+            return sorted(range(n_scrolls), key=lambda i: -values[i])[:top_n]
+        values = np.full(n_scrolls, rest)
+        if attention:
+            values[np.fromiter(attention.keys(), dtype=np.int64, count=len(attention))] = \
+                np.fromiter(attention.values(), dtype=float, count=len(attention))
+        return np.argsort(-values, kind='stable')[:top_n].tolist()
     
     @staticmethod
     def _parse_time(time_str: str) -> datetime:
@@ -983,105 +3985,693 @@ class MemoryEngine:
     # Export / Import
     # ==================================================================
     
+    @_synchronized('snapshot')
     def export_memory_state(self, filepath: str) -> None:
         """Export full engine state including v3.0 logs."""
-        serializable = []
-        for scroll in self.scrolls:
-            s = scroll.copy()
-            if 'unique_terms' in s:
-                s['unique_terms'] = list(s['unique_terms'])
-            # Serialize sets in context
-            if 'context' in s and 'shared_terms' in s.get('context', {}):
-                pass  # Already a list
-            serializable.append(s)
+        started = time.perf_counter()
+        clock = _StageClock('export') if self.tracer is not None else None
+        serializable = [_serialize_scroll(scroll) for scroll in self.scrolls]
         
         state = {
-            'version': '3.1',
+            'version': STATE_VERSION,
             'framework': "Kaelyr'Aural'Tharyn — Sovereign Edition",
+            'checkpoint': _new_checkpoint_id(),  # v3.2: parent of the next export_delta
             'scrolls': serializable,
             'codex': self.codex,
             'df_index': dict(self.df_index),
             'access_log': {str(k): v for k, v in self.access_log.items()},
-            'dream_log': self.dream_log,
-            'merge_log': self.merge_log,
-            'config': {
-                'k_modes': self.k_modes,
-                'beta_focus': self.beta_focus,
-                'gamma_decay': self.gamma_decay,
-                'capacity': self.capacity,
-                'anchor_head': self.anchor_head,
-                'anchor_tail': self.anchor_tail,
-                'theme_boost': self.theme_boost,
-                'interference_threshold': self.interference_threshold,
-                'dream_resonance_threshold': self.dream_resonance_threshold,
-                'max_importance_weight': self.max_importance_weight,
-                'decay_floor': self.decay_floor,
-            }
+            'dream_log': list(self.dream_log),
+            'merge_log': list(self.merge_log),
+            'log_totals': {'dream_log': self.dream_log.total,
+                           'merge_log': self.merge_log.total},
+            'log_spill': self._log_spill(),
+            'config': self._config_dict(),
         }
         
+        if clock is not None:
+            clock.mark('prepare')
         with open(filepath, 'w') as f:
             json.dump(state, f, indent=2)
+        with self._checkpoint_lock:
+            self._mark_checkpoint(state['checkpoint'])
+        self.metrics.observe('export_seconds', time.perf_counter() - started)
+        if clock is not None:
+            clock.mark('write')
+            clock.attrs['scrolls'] = len(serializable)
+            self._emit(clock)
+    
+    @_synchronized('snapshot')
+    def export_delta(self, filepath: str) -> Dict:
+        """
+        v3.2: Write only what changed since the last checkpoint — a full
+        export, a previous delta or a load of a v3.2 state file.
+        
+        The delta holds new and structurally changed scrolls (adds, merges,
+        bridges), last_accessed for scrolls that were only touched, the
+        df_index terms that moved, the codex themes whose scroll list,
+        importance or access time changed (appended ids only when the list
+        only grew) and log records appended since. Each delta names its
+        parent checkpoint; load_memory_state(base, deltas=[...]) applies a
+        chain in order and compact_state() folds one into a new base.
+        Returns counts and the bytes written.
+        """
+        if self._checkpoint is None:
+            raise ValueError("No checkpoint to diff against: export_memory_state (or load a "
+                             "v3.2 state file) first")
+        with self._checkpoint_lock:
+            n_scrolls = len(self.scrolls)
+            dirty = {i for i in self._dirty_scrolls if i < n_scrolls}
+            touched = {i for i in self._dirty_access if i < n_scrolls} - dirty
+            changed_terms = self.df_index.changed
+            if changed_terms is None:
+                df_patch = dict(self.df_index)
+            else:
+                df_patch = {term: self.df_index.get(term, 0) for term in changed_terms}
+            
+            codex_patch = {}
+            for theme, entry in self.codex.items():
+                mark = self._codex_marks.get(theme)
+                size = len(entry['scrolls'])
+                if mark == (size, entry['cumulative_importance'], entry['last_accessed']):
+                    continue
+                start = mark[0] if mark is not None and size >= mark[0] else 0
+                patch = {k: v for k, v in entry.items() if k != 'scrolls'}
+                patch.update(start=start, scrolls=entry['scrolls'][start:])
+                codex_patch[theme] = patch
+            
+            logs = {}
+            for name, log, mark in (('dream_log', self.dream_log, self._log_marks[0]),
+                                    ('merge_log', self.merge_log, self._log_marks[1])):
+                new = log.total - mark
+                logs[name] = list(log[max(len(log) - new, 0):]) if new > 0 else []
+            
+            delta = {
+                'version': DELTA_VERSION,
+                'parent': self._checkpoint,
+                'checkpoint': _new_checkpoint_id(),
+                'n_scrolls': n_scrolls,
+                'scrolls': {str(i): _serialize_scroll(self.scrolls[i]) for i in sorted(dirty)},
+                'last_accessed': {str(i): self.scrolls[i].get('last_accessed')
+                                  for i in sorted(touched)},
+                'access_log': {str(i): self.access_log[i] for i in sorted(dirty | touched)
+                               if i in self.access_log},
+                'df_index': df_patch,
+                'df_index_full': changed_terms is None,
+                'codex': codex_patch,
+                'dream_log': logs['dream_log'],
+                'merge_log': logs['merge_log'],
+                'log_totals': {'dream_log': self.dream_log.total,
+                               'merge_log': self.merge_log.total},
+                'log_spill': self._log_spill(),
+                'config': self._config_dict(),
+            }
+            with open(filepath, 'w') as f:
+                json.dump(delta, f)
+            self._mark_checkpoint(delta['checkpoint'])
+        return {
+            'checkpoint': delta['checkpoint'], 'parent': delta['parent'],
+            'scrolls': len(dirty), 'touched': len(touched), 'df_terms': len(df_patch),
+            'codex_themes': len(codex_patch), 'bytes': os.path.getsize(filepath),
+        }
+    
+    def _mark_checkpoint(self, checkpoint: Optional[str]) -> None:
+        """Make the current state the base of the next delta. Caller holds _checkpoint_lock."""
+        self._checkpoint = checkpoint
+        self._dirty_scrolls = set()
+        self._dirty_access = set()
+        self.df_index.changed = set()
+        self._codex_marks = {
+            theme: (len(entry['scrolls']), entry['cumulative_importance'], entry['last_accessed'])
+            for theme, entry in self.codex.items()}
+        self._log_marks = (self.dream_log.total, self.merge_log.total)
+    
+    def _log_spill(self) -> Dict:
+        """Spill-file positions of the logs that spill (exported as 'log_spill')."""
+        logs = (('dream_log', self.dream_log), ('merge_log', self.merge_log))
+        return {name: log.spill_state() for name, log in logs if log.spill_path is not None}
+    
+    def _config_dict(self) -> Dict:
+        """Constructor parameters that define scoring behaviour (exported as 'config')."""
+        return {
+            'k_modes': self.k_modes,
+            'beta_focus': self.beta_focus,
+            'gamma_decay': self.gamma_decay,
+            'capacity': self.capacity,
+            'anchor_head': self.anchor_head,
+            'anchor_tail': self.anchor_tail,
+            'theme_boost': self.theme_boost,
+            'interference_threshold': self.interference_threshold,
+            'dream_resonance_threshold': self.dream_resonance_threshold,
+            'max_importance_weight': self.max_importance_weight,
+            'decay_floor': self.decay_floor,
+        }
+    
+    # v3.2: How recall is computed rather than what it scores — set by the
+    # constructor, never exported as 'config' or taken from a state file
+    RECALL_MODE_PARAMETERS = ('hash_dim', 'hash_precision', 'hash_rescore', 'n_clusters', 'nprobe')
+    
+    def _recall_mode_dict(self) -> Dict:
+        """Constructor parameters that select the recall mode (RECALL_MODE_PARAMETERS)."""
+        return {key: getattr(self, key) for key in self.RECALL_MODE_PARAMETERS}
+    
+    @_synchronized('write')
+    def load_memory_state(self, filepath: str, background: bool = False,
+                          deltas: Optional[List[str]] = None) -> Optional[threading.Thread]:
+        """
+        Load engine state from JSON.
+        
+        v3.2: deltas is a chain of export_delta files, applied in order on
+        top of the base before the index is built; a delta whose parent is
+        not the checkpoint reached so far raises ValueError, as does a
+        delta on a base older than STATE_VERSION.
+        
+        Version 3.1 (and earlier) files load as before. They carry no
+        checkpoint, so the engine has none afterwards and export_delta
+        needs a full export first. Their log totals default to the
+        records present and no spilled history is adopted.
+        
+        v3.2: background=True (thread_safe only) parses the file and builds
+        the recall index in a worker thread while the current state keeps
+        serving. Ingests and dream passes made meanwhile are replayed onto
+        the loaded state before it is swapped in; recall access times on
+        the outgoing state are dropped. Returns the worker thread.
+        """
+        if not background:
+            self._rebuild = None  # a synchronous load supersedes any rebuild
+            started = time.perf_counter()
+            clock = _StageClock('load') if self.tracer is not None else None
+            self._install_state(self._read_state(filepath, clock, self._shared, deltas))
+            self.metrics.observe('load_seconds', time.perf_counter() - started)
+            if clock is not None:
+                clock.mark('install')
+                clock.attrs['scrolls'] = len(self.scrolls)
+                self._emit(clock)
+            return None
+        
+        self._require_background()
+        job = _RebuildJob('load')
+        self._rebuild = job
+        
+        def work():
+            started = time.perf_counter()
+            try:
+                state = self._read_state(filepath, shared=self._shared, deltas=deltas)
+            except BaseException:
+                with self._lock.write():
+                    if self._rebuild is job:
+                        self._rebuild = None
+                raise
+            with self._lock.write():
+                if self._rebuild is not job:
+                    return
+                self._rebuild = None
+                self._install_state(state)
+                self.metrics.observe('load_seconds', time.perf_counter() - started)
+                for op, payload in job.ops:
+                    if op == 'ingest':
+                        self.update_codex(payload)
+                    else:
+                        self.dream_consolidate(*payload)
+        
+        job.thread = threading.Thread(target=work, name='memory-engine-load', daemon=True)
+        job.thread.start()
+        return job.thread
+    
+    @staticmethod
+    def _read_state(filepath: str, clock: Optional[_StageClock] = None,
+                    shared: Optional['SharedResources'] = None,
+                    deltas: Optional[List[str]] = None) -> Dict:
+        """
+        Parse a state file, apply any delta chain and build the recall
+        index (no engine state touched). With shared, vocabulary strings
+        are interned pool-wide.
+        """
+        state = _parse_state(filepath, deltas)
+        if shared is not None:
+            shared.intern_state(state)
+        if clock is not None:
+            clock.mark('read')
+        state['_index'] = RecallIndex.build(state['scrolls'])
+        if clock is not None:
+            clock.mark('index')
+        return state
     
-    def load_memory_state(self, filepath: str) -> None:
-        """Load engine state from JSON."""
-        with open(filepath, 'r') as f:
-            state = json.load(f)
-        
+    def _install_state(self, state: Dict) -> None:
+        """Swap a parsed state into the engine. Caller holds the write lock."""
         self.scrolls = state['scrolls']
-        for scroll in self.scrolls:
-            if 'unique_terms' in scroll:
-                scroll['unique_terms'] = set(scroll['unique_terms'])
-        
         self.codex = state['codex']
-        self.df_index = Counter(state.get('df_index', {}))
-        self.access_log = {int(k): v for k, v in state.get('access_log', {}).items()}
-        self.dream_log = state.get('dream_log', [])
-        self.merge_log = state.get('merge_log', [])
+        self.df_index = _TrackedCounter(state.get('df_index', {}))
+        self.access_log = AccessLog({int(k): v for k, v in state.get('access_log', {}).items()})
+        totals, spill = state.get('log_totals', {}), state.get('log_spill', {})
+        self.dream_log.replace(state.get('dream_log', []), totals.get('dream_log'),
+                               spill.get('dream_log'))
+        self.merge_log.replace(state.get('merge_log', []), totals.get('merge_log'),
+                               spill.get('merge_log'))
         
         config = state.get('config', {})
         for key, val in config.items():
-            if hasattr(self, key):
+            # Files written before the split still carry the recall mode
+            if hasattr(self, key) and key not in self.RECALL_MODE_PARAMETERS:
                 setattr(self, key, val)
+        
+        with self._pending_lock:
+            self._pending_access = {}
+        self._generation += 1
+        self._release_derived()
+        self._index = state['_index']
+        self._index.generation = self._generation
+        self._hashed = None
+        self._clusters = None
+        self._token_costs = {}
+        self._cow_limit = 0
+        self._cow_owned = set()
+        self._fork_parent = self._fork_base = None
+        with self._checkpoint_lock:
+            self._mark_checkpoint(state.get('checkpoint'))
+    
+    # ==================================================================
+    # Forks (v3.2)
+    # ==================================================================
+    
+    @_synchronized('write')
+    def fork(self, **overrides) -> 'MemoryEngine':
+        """
+        A logically independent engine over the same codex, copy-on-write.
+        
+            trial = engine.fork(interference_threshold=0.85)
+            trial.dream_consolidate()
+            trial.diff()        # {'added': [...], 'changed': [...], ...}
+            trial.commit()      # apply to engine
+        
+        overrides are constructor arguments to change in the fork; the rest
+        are the parent's. Scroll dicts, the recall index, hashed rows and
+        clusters are shared: either engine copies a scroll before its
+        first in-place write (merge, access time) and copies the derived
+        structures before its first index update. The scroll list, codex,
+        df_index, access_log and log windows are copied up front, at a
+        pointer or two per scroll. The fork starts with empty metrics,
+        recall cache and dedupe window, no checkpoint (so export_delta
+        needs a full export first) and logs that never spill.
+        """
+        if self._rebuild is not None:
+            raise RuntimeError("Cannot fork while a background rebuild is running")
+        child = type(self)(**dict(self._fork_kwargs(), **overrides))
+        child.scrolls = list(self.scrolls)
+        child.codex = {theme: dict(entry, scrolls=list(entry['scrolls']))
+                       for theme, entry in self.codex.items()}
+        child.df_index = _TrackedCounter(self.df_index)
+        child.access_log = self.access_log.copy()
+        child.dream_log.replace(list(self.dream_log), self.dream_log.total)
+        child.merge_log.replace(list(self.merge_log), self.merge_log.total)
+        if self._shared is None:
+            child.theme_keywords = {theme: set(words) for theme, words in self.theme_keywords.items()}
+        child._generation = self._generation
+        
+        share = self._derived_share
+        if share is None:
+            share = self._derived_share = _CowShare()
+        share.join()
+        child._derived_share = share
+        child._index, child._hashed, child._clusters = self._index, self._hashed, self._clusters
+        
+        self._cow_limit = child._cow_limit = len(self.scrolls)
+        self._cow_owned = set()
+        child._fork_parent = self
+        self._rebase_fork(child)
+        return child
+    
+    def _fork_kwargs(self) -> Dict:
+        """Constructor arguments that reproduce this engine's configuration."""
+        kwargs = dict(self._config_dict(), **self._recall_mode_dict(),
+                      thread_safe=self._lock is not None,
+                      access_batch_size=self.access_batch_size,
+                      rebalance_every=self.rebalance_every,
+                      token_counter=self.token_counter,
+                      log_limit=self.merge_log.limit,
+                      shared=self._shared)
+        if self.recall_cache is not None:
+            kwargs.update(recall_cache_size=self.recall_cache.maxsize,
+                          recall_cache_bucket=self.recall_cache.bucket_seconds)
+        if self.deduper is not None:
+            kwargs.update(dedupe_window=self.deduper.window,
+                          dedupe_distance=self.deduper.max_distance)
+        return kwargs
+    
+    def _rebase_fork(self, child: 'MemoryEngine') -> None:
+        """Record this engine's current state as child's base for diff()."""
+        child._fork_base = (list(child.scrolls), self._generation,
+                            self.merge_log.total, self.dream_log.total)
+        child._cow_owned = set()
+    
+    def _own_scroll(self, idx: int) -> Dict:
+        """scrolls[idx], first copied if a fork may still share it."""
+        scroll = self.scrolls[idx]
+        if idx < self._cow_limit and idx not in self._cow_owned:
+            scroll = self.scrolls[idx] = dict(scroll)
+            self._cow_owned.add(idx)
+        return scroll
+    
+    def _own_derived(self) -> None:
+        """Stop sharing the derived structures, copying them if another engine still holds them."""
+        share, self._derived_share = self._derived_share, None
+        if share is not None:
+            share.detach(self._copy_derived)
+    
+    def _copy_derived(self) -> None:
+        if self._index is not None:
+            self._index = self._index.copy()
+        if self._hashed is not None:
+            self._hashed = self._hashed.copy()
+        if self._clusters is not None:
+            self._clusters = self._clusters.copy()
+    
+    def _release_derived(self) -> None:
+        """Stop sharing the derived structures without copying (they are about to be replaced)."""
+        share, self._derived_share = self._derived_share, None
+        if share is not None:
+            share.leave()
+    
+    def diff(self) -> Dict:
+        """
+        What this fork changed since fork() or its last commit().
+        
+        'added' are scroll ids appended here (new scrolls and bridges),
+        'changed' the parent's scrolls rewritten here (merged into),
+        'accessed' those whose only change is last_accessed. 'merge_log'
+        and 'dream_log' count the records written here.
+        'parent_changed' is True once the parent itself added, merged or
+        reloaded since, which makes commit() refuse.
+        """
+        if self._fork_base is None:
+            raise ValueError("diff() and commit() need an engine made by fork()")
+        base, generation, merges, dreams = self._fork_base
+        changed, accessed = [], []
+        for idx, original in enumerate(base):
+            scroll = self.scrolls[idx]
+            if scroll is original:
+                continue
+            keys = set(scroll) | set(original)
+            if all(scroll.get(k) == original.get(k) for k in keys if k != 'last_accessed'):
+                accessed.append(idx)
+            else:
+                changed.append(idx)
+        return {
+            'added': list(range(len(base), len(self.scrolls))),
+            'changed': changed,
+            'accessed': accessed,
+            'merge_log': self.merge_log.total - merges,
+            'dream_log': self.dream_log.total - dreams,
+            'parent_changed': self._fork_parent._generation != generation,
+        }
+    
+    def commit(self) -> Dict:
+        """
+        Apply this fork's diff() to its parent and return it.
+        
+        Fast-forward only: raises RuntimeError if the parent added, merged
+        or reloaded since the fork (fork again and re-run the trial).
+        Access times the parent recorded meanwhile are kept where they are
+        later than the fork's. Changes go through the parent's own update
+        path, so its index, clusters, recall cache and next export_delta
+        see them. Afterwards the two engines share the committed state
+        copy-on-write again and the fork can go on trialling from it.
+        Do not write to the fork while commit() runs.
+        """
+        parent = self._fork_parent
+        if parent is None:
+            raise ValueError("diff() and commit() need an engine made by fork()")
+        if parent._lock is None:
+            return parent._merge_fork(self)
+        with parent._lock.write():
+            parent._apply_pending_access()
+            return parent._merge_fork(self)
+    
+    def _merge_fork(self, fork: 'MemoryEngine') -> Dict:
+        """commit() on the parent side. Caller holds the write lock."""
+        diff = fork.diff()
+        if diff['parent_changed']:
+            raise RuntimeError("The parent changed since the fork; fork again to retry")
+        base = fork._fork_base[0]
+        
+        def later(a: Optional[str], b: Optional[str]) -> Optional[str]:
+            try:
+                return a if self._parse_time(a) > self._parse_time(b) else b
+            except (ValueError, TypeError):
+                return b
+        
+        terms: Set[str] = set()
+        for idx in diff['changed']:
+            scroll = fork.scrolls[idx]
+            accessed = later(self.scrolls[idx].get('last_accessed'), scroll.get('last_accessed'))
+            if accessed != scroll.get('last_accessed'):
+                scroll = dict(scroll, last_accessed=accessed)
+            terms.update(base[idx].get('unique_terms', ()), scroll.get('unique_terms', ()))
+            self.scrolls[idx] = scroll
+            self.access_log[idx] = accessed
+            self._reindex(idx)
+        for idx in diff['accessed']:
+            stamp = fork.scrolls[idx].get('last_accessed')
+            if later(self.scrolls[idx].get('last_accessed'), stamp) == stamp:
+                self._own_scroll(idx)['last_accessed'] = stamp
+                self.access_log[idx] = stamp
+                self._reindex(idx, structural=False)
+        for idx in diff['added']:
+            scroll = fork.scrolls[idx]
+            terms.update(scroll.get('unique_terms', ()))
+            self.scrolls.append(scroll)
+            self.access_log[idx] = fork.access_log[idx]
+            self._reindex(idx)
+        
+        for term in terms:
+            count = fork.df_index.get(term, 0)
+            if count and self.df_index.get(term) != count:
+                self.df_index[term] = count
+            elif not count and term in self.df_index:
+                del self.df_index[term]
+        for theme, entry in fork.codex.items():
+            if self.codex.get(theme) != entry:
+                self.codex[theme] = dict(entry, scrolls=list(entry['scrolls']))
+        for log, source, count in ((self.merge_log, fork.merge_log, diff['merge_log']),
+                                   (self.dream_log, fork.dream_log, diff['dream_log'])):
+            records = list(source)
+            log.extend(records[max(len(records) - count, 0):] if count else [])
+        
+        # Both engines now hold the committed scroll dicts
+        self._cow_limit = len(self.scrolls)
+        self._cow_owned = set()
+        fork._cow_limit = len(fork.scrolls)
+        self._rebase_fork(fork)
+        return diff
     
     # ==================================================================
     # Diagnostics
     # ==================================================================
     
+    @_synchronized('snapshot')
     def diagnostics(self, current_time: Optional[str] = None) -> Dict:
         """Full engine diagnostics including v3.0 metrics."""
         if current_time is None:
             current_time = datetime.now().isoformat()
         
-        decays = [self._temporal_decay(s, current_time) for s in self.scrolls]
-        avg_decay = float(np.mean(decays)) if decays else 0.0
-        
-        vitality = [(i, s['total_importance'] * d, d) 
-                     for i, (s, d) in enumerate(zip(self.scrolls, decays))]
-        vitality.sort(key=lambda x: x[1], reverse=True)
+        # v3.2: Counts and sums are kept by the RecallIndex on every
+        # mutation; only decay depends on the clock, computed as one
+        # vectorized pass over the index's decay column.
+        index = self._current_index()
+        n_scrolls = len(self.scrolls)
+        decays = self._decay_column(index, current_time)
+        avg_decay = float(np.mean(decays)) if n_scrolls else 0.0
         
-        # TCS stats
-        tcs_scores = [s.get('tcs', {}).get('score', 0) for s in self.scrolls]
-        avg_tcs = float(np.mean(tcs_scores)) if tcs_scores else 0.0
+        vitality = np.array(index.importance) * decays
+        order = np.argsort(-vitality, kind='stable')
         
-        # Count bridges and merges
-        bridge_count = sum(1 for s in self.scrolls if s.get('_is_bridge'))
-        total_merges = sum(s.get('_merge_count', 1) - 1 for s in self.scrolls)
+        def entries(positions) -> List[Tuple[int, float, float]]:
+            return [(int(i), float(vitality[i]), float(decays[i])) for i in positions]
         
-        return {
-            'total_scrolls': len(self.scrolls),
-            'bridge_scrolls': bridge_count,
-            'total_merges': total_merges,
+        report = {
+            'total_scrolls': n_scrolls,
+            'bridge_scrolls': index.bridge_count,
+            'total_merges': index.merge_total,
             'total_themes': len(self.codex),
             'vocabulary_size': len(self.df_index),
             'average_decay': avg_decay,
-            'average_tcs': avg_tcs,
-            'most_vivid': vitality[:3] if vitality else [],
-            'most_faded': vitality[-3:] if vitality else [],
+            'average_tcs': index.tcs_sum / n_scrolls if n_scrolls else 0.0,
+            'most_vivid': entries(order[:3]),
+            'most_faded': entries(order[-3:]),
             'themes': {k: v['cumulative_importance'] for k, v in self.codex.items()},
-            'top_terms': self.df_index.most_common(20),
-            'dream_count': len(self.dream_log),
-            'merge_count': len(self.merge_log),
+            'top_terms': self._top_terms(),
+            'dream_count': self.dream_log.total,
+            'merge_count': self.merge_log.total,
+        }
+        if self.recall_cache is not None:
+            report['recall_cache'] = self.recall_cache.stats()
+        if self.deduper is not None:
+            report['dedupe'] = self.deduper.stats()
+        return report
+    
+    # v3.2: Categories in attribution order. Objects reachable from several
+    # (term strings are shared by tf, unique_terms and df_index) count
+    # toward the first.
+    MEMORY_CATEGORIES = ('essence', 'term_frequencies', 'unique_terms', 'scrolls', 'df_index',
+                         'codex', 'access_log', 'dream_log', 'merge_log', 'recall_index',
+                         'recall_cache', 'theme_keywords')
+    
+    @_synchronized('snapshot')
+    def memory_report(self) -> Dict:
+        """
+        Approximate resident bytes per engine structure (see _footprint).
+        
+        'categories' maps MEMORY_CATEGORIES to bytes: the per-scroll
+        essence, term_frequencies and unique_terms, then the rest of the
+        scroll dicts, df_index, codex, the three logs, the derived recall
+        structures (index, hashed rows, clusters), the recall cache and
+        theme vocabularies. Objects shared through an EnginePool are not
+        counted. 'per_scroll' and 'per_term' divide each category (and
+        the total) by the scroll count and vocabulary size. Walks the whole
+        codex; for allocation growth over time use profile_memory().
+        """
+        scrolls = self.scrolls
+        roots = {
+            'essence': [s.get('essence') for s in scrolls],
+            'term_frequencies': [s.get('term_frequencies') for s in scrolls],
+            'unique_terms': [s.get('unique_terms') for s in scrolls],
+            'scrolls': [scrolls],
+            'df_index': [self.df_index],
+            'codex': [self.codex],
+            'access_log': [self.access_log],
+            'dream_log': [self.dream_log],
+            'merge_log': [self.merge_log],
+            'recall_index': [self._index, self._hashed, self._clusters],
+            'recall_cache': [self.recall_cache],
+            'theme_keywords': [self.theme_keywords],
         }
+        seen = set(self._shared.shared_ids) if self._shared is not None else set()
+        categories = {name: _footprint(roots[name], seen, claim=True)
+                      for name in self.MEMORY_CATEGORIES}
+        total = sum(categories.values())
+        n_scrolls, n_terms = len(scrolls), len(self.df_index)
+        
+        def averages(count: int) -> Dict[str, float]:
+            averaged = {name: size / count if count else 0.0 for name, size in categories.items()}
+            averaged['total'] = total / count if count else 0.0
+            return averaged
+        
+        return {'total_bytes': total, 'categories': categories,
+                'scrolls': n_scrolls, 'vocabulary_size': n_terms,
+                'postings': sum(len(s.get('term_frequencies') or ()) for s in scrolls),
+                'per_scroll': averages(n_scrolls), 'per_term': averages(n_terms)}
+    
+    @contextmanager
+    def profile_memory(self):
+        """
+        Attribute allocation growth to engine operations for the duration of
+        a with-block (see MemoryProfile), and yield the profile.
+        
+            with engine.profile_memory() as profile:
+                run_workload(engine)
+            profile.report()['operations']['update_codex']['net_bytes']
+        
+        Runs under tracemalloc, so the profiled calls are several times
+        slower; the engine's methods are restored on exit.
+        """
+        profile = MemoryProfile()
+        profile.start()
+        for name in MemoryProfile.OPERATIONS:
+            setattr(self, name, profile.wrap(name, getattr(self, name)))
+        try:
+            yield profile
+        finally:
+            for name in MemoryProfile.OPERATIONS:
+                vars(self).pop(name, None)
+            profile.stop()
+    
+    def _decay_column(self, index: RecallIndex, current_time: str) -> 'np.ndarray':
+        """_temporal_decay for every scroll at once, from the index's decay column."""
+        n_scrolls = len(index)
+        try:
+            now = self._parse_time(current_time)
+        except (ValueError, TypeError):
+            return np.ones(n_scrolls)
+        if now.tzinfo is not None:
+            return np.array([self._decay_between(last, now) for last in index.last_seen])
+        
+        now_us = (now - RecallIndex.EPOCH) // RecallIndex.MICROSECOND
+        delta = np.maximum((now_us - np.array(index.seen_us, dtype=np.int64)) / 1e6 / 86400.0, 0.0)
+        decays = np.maximum(np.exp(-self.gamma_decay * delta), self.decay_floor)
+        decays[~np.array(index.seen_ok, dtype=bool)] = 1.0
+        for i in index.aware:
+            decays[i] = self._decay_between(index.last_seen[i], now)
+        return decays
+    
+    def _top_terms(self, n: int = 20) -> List[Tuple[str, int]]:
+        """df_index.most_common(n), memoized per generation (df only moves with it)."""
+        cached = self._top_terms_cache
+        if cached is not None and cached[0] == (self._generation, id(self.df_index), n):
+            return list(cached[1])
+        top = self.df_index.most_common(n)
+        self._top_terms_cache = ((self._generation, id(self.df_index), n), top)
+        return list(top)
+
+
+# ==============================================================================
+# BULK INGEST WORKERS (v3.2)
+# ==============================================================================
+
+def _segment_args(segment) -> Tuple[List[str], str, Dict]:
+    """
+    Normalize a conversation segment to compress_to_scroll arguments.
+    
+    Accepts {'messages', 'timestamp', 'context'} mappings (or 'theme' in
+    place of 'context', as in the demo segments) and
+    (messages, timestamp, context) tuples.
+    """
+    if isinstance(segment, dict):
+        context = segment.get('context')
+        if context is None:
+            context = {'theme': segment.get('theme', 'general')}
+        return segment['messages'], segment['timestamp'], context
+    messages, timestamp, context = segment
+    return messages, timestamp, context
+
+
+def read_transcript(source) -> Iterator[Dict]:
+    """
+    Yield chat messages as {'text', 'timestamp'} dicts, one at a time.
+    
+    source may be a path to a JSONL file, an open text file of JSONL lines,
+    or any iterable of message dicts or plain message strings. Records use
+    'text' (or 'content') and an optional 'timestamp'; blank lines skip.
+    """
+    if isinstance(source, str):
+        with open(source, 'r', encoding='utf-8') as f:
+            yield from read_transcript(f)
+        return
+    
+    jsonl = hasattr(source, 'read')
+    for item in source:
+        if jsonl:
+            item = item.strip()
+            if not item:
+                continue
+            item = json.loads(item)
+        if isinstance(item, dict):
+            text = item.get('text', item.get('content', ''))
+            yield {'text': str(text), 'timestamp': item.get('timestamp')}
+        else:
+            yield {'text': str(item), 'timestamp': None}
+
+
+_WORKER_ENGINE: Optional[MemoryEngine] = None
+
+
+def _init_compress_worker(engine_cls, config: Dict) -> None:
+    """Process-pool initializer: one engine per worker, built from the parent's config."""
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = engine_cls(**config)
+
+
+def _compress_batch(batch: List[Tuple]) -> List[Tuple[Dict, Counter]]:
+    """Stage 1 of ingest_many, run inside a worker process."""
+    return [_WORKER_ENGINE._compress_with_signature(*args) for args in batch]
 
 
 # ==============================================================================
@@ -1089,7 +4679,23 @@ class MemoryEngine:
 # ==============================================================================
 
 class GlyphCompressor:
-    """Symbolic anchors for rapid re-synchronization."""
+    """
+    Symbolic anchors for rapid re-synchronization.
+    
+    v3.2: iter_glyphs / iter_glyph_map stream one glyph or map line at a
+    time over an index range and/or theme filter; glyph_page paginates and
+    write_glyph_map writes straight to a file-like object in bounded
+    chunks. Pass a GlyphCache to reuse glyphs across refreshes.
+    """
+    
+    CONTEXT_MARKERS = {
+        'mathematics': '△', 'emotional': '♡', 'breakthrough': '⚡',
+        'connection': '∞', 'memory': '◐', 'technomancy': '⬡',
+        'breathwork': '☽', 'integration': '⊗', 'dream_bridge': '◇',
+        'general': '·',
+    }
+    MAP_HEADER = "╔══ GLYPH MAP v3.0 ══╗"
+    MAP_FOOTER = "╚════════════════════╝"
     
     @staticmethod
     def create_glyph(scroll: Dict) -> str:
@@ -1108,13 +4714,7 @@ class GlyphCompressor:
         else:
             symbol = "○"
         
-        context_markers = {
-            'mathematics': '△', 'emotional': '♡', 'breakthrough': '⚡',
-            'connection': '∞', 'memory': '◐', 'technomancy': '⬡',
-            'breathwork': '☽', 'integration': '⊗', 'dream_bridge': '◇',
-            'general': '·',
-        }
-        ctx = context_markers.get(context, '·')
+        ctx = GlyphCompressor.CONTEXT_MARKERS.get(context, '·')
         
         # TCS grade indicator
         tcs = scroll.get('tcs', {}).get('score', 0)
@@ -1127,29 +4727,492 @@ class GlyphCompressor:
         
         return f"{symbol}{ctx}{grade}"
     
+    @staticmethod
+    def map_line(i: int, scroll: Dict, glyph: Optional[str] = None) -> str:
+        """One glyph map row for scrolls[i]."""
+        if glyph is None:
+            glyph = GlyphCompressor.create_glyph(scroll)
+        theme = scroll['context'].get('theme', 'general')
+        importance = scroll['total_importance']
+        tcs = scroll.get('tcs', {}).get('score', 0)
+        grade = scroll.get('tcs', {}).get('grade', '?')
+        timestamp = scroll.get('timestamp', '?')
+        bridge = scroll.get('context', {}).get('bridge_from', '')
+        
+        line = (f"  [{i:03d}] {glyph}  {theme:<15} "
+               f"imp:{importance:>6.1f}  tcs:{tcs:.3f} {grade:<14} @{timestamp}")
+        if bridge:
+            line += f"  [{bridge}]"
+        return line
+    
     @staticmethod
     def glyph_summary(scrolls: List[Dict]) -> str:
-        return " ".join([GlyphCompressor.create_glyph(s) for s in scrolls])
+        return " ".join(GlyphCompressor.iter_glyphs(scrolls))
     
     @staticmethod
     def glyph_map(scrolls: List[Dict]) -> str:
-        lines = []
-        for i, scroll in enumerate(scrolls):
-            glyph = GlyphCompressor.create_glyph(scroll)
-            theme = scroll['context'].get('theme', 'general')
-            importance = scroll['total_importance']
-            tcs = scroll.get('tcs', {}).get('score', 0)
-            grade = scroll.get('tcs', {}).get('grade', '?')
-            timestamp = scroll.get('timestamp', '?')
-            bridge = scroll.get('context', {}).get('bridge_from', '')
-            
-            line = (f"  [{i:03d}] {glyph}  {theme:<15} "
-                   f"imp:{importance:>6.1f}  tcs:{tcs:.3f} {grade:<14} @{timestamp}")
-            if bridge:
-                line += f"  [{bridge}]"
-            lines.append(line)
-        
-        return f"╔══ GLYPH MAP v3.0 ══╗\n" + "\n".join(lines) + f"\n╚════════════════════╝"
+        lines = "\n".join(GlyphCompressor.iter_glyph_map(scrolls, frame=False))
+        return f"{GlyphCompressor.MAP_HEADER}\n{lines}\n{GlyphCompressor.MAP_FOOTER}"
+    
+    # ------------------------------------------------------------------
+    # Streaming (v3.2)
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _select(scrolls: List[Dict], start: int, stop: Optional[int],
+                themes) -> Iterator[Tuple[int, Dict]]:
+        """(index, scroll) pairs in [start, stop), optionally limited to themes."""
+        stop = len(scrolls) if stop is None else min(stop, len(scrolls))
+        themes = None if themes is None else ({themes} if isinstance(themes, str) else set(themes))
+        for i in range(max(start, 0), stop):
+            scroll = scrolls[i]
+            if themes is None or scroll['context'].get('theme', 'general') in themes:
+                yield i, scroll
+    
+    @staticmethod
+    def iter_glyphs(scrolls: List[Dict], start: int = 0, stop: Optional[int] = None,
+                    themes=None, cache: Optional['GlyphCache'] = None) -> Iterator[str]:
+        """Yield glyphs for scrolls[start:stop], optionally only the given theme(s)."""
+        for i, scroll in GlyphCompressor._select(scrolls, start, stop, themes):
+            yield cache.glyph(i, scroll) if cache is not None else GlyphCompressor.create_glyph(scroll)
+    
+    @staticmethod
+    def iter_glyph_map(scrolls: List[Dict], start: int = 0, stop: Optional[int] = None,
+                       themes=None, cache: Optional['GlyphCache'] = None,
+                       frame: bool = True) -> Iterator[str]:
+        """Yield glyph map lines (framed by header/footer unless frame=False)."""
+        if frame:
+            yield GlyphCompressor.MAP_HEADER
+        for i, scroll in GlyphCompressor._select(scrolls, start, stop, themes):
+            yield cache.line(i, scroll) if cache is not None else GlyphCompressor.map_line(i, scroll)
+        if frame:
+            yield GlyphCompressor.MAP_FOOTER
+    
+    @staticmethod
+    def glyph_page(scrolls: List[Dict], page: int, page_size: int = 50, themes=None,
+                   cache: Optional['GlyphCache'] = None) -> List[str]:
+        """Map lines for one page (0-based) of the (theme-filtered) codex."""
+        lines = GlyphCompressor.iter_glyph_map(scrolls, themes=themes, cache=cache, frame=False)
+        return list(itertools.islice(lines, page * page_size, (page + 1) * page_size))
+    
+    @staticmethod
+    def write_glyph_map(fp, scrolls: List[Dict], start: int = 0, stop: Optional[int] = None,
+                        themes=None, cache: Optional['GlyphCache'] = None,
+                        chunk_lines: int = 512) -> int:
+        """
+        Write the glyph map to a text file-like object, chunk_lines rows
+        per write. Returns the number of scroll rows written.
+        """
+        rows = 0
+        lines = GlyphCompressor.iter_glyph_map(scrolls, start, stop, themes, cache, frame=False)
+        fp.write(GlyphCompressor.MAP_HEADER + "\n")
+        while True:
+            chunk = list(itertools.islice(lines, chunk_lines))
+            if not chunk:
+                break
+            rows += len(chunk)
+            fp.write("\n".join(chunk) + "\n")
+        fp.write(GlyphCompressor.MAP_FOOTER + "\n")
+        return rows
+
+
+class GlyphCache:
+    """
+    Per-scroll glyph and map-line cache, keyed by scroll index.
+    
+    An entry is reused while the fields it was rendered from are unchanged:
+    importance, theme, bridge flag and TCS for the glyph, plus grade,
+    timestamp and bridge source for the map line. Merges and reloads are
+    picked up on the next render without explicit invalidation.
+    """
+    
+    def __init__(self):
+        self._glyphs: Dict[int, Tuple[Tuple, str]] = {}
+        self._lines: Dict[int, Tuple[Tuple, str]] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _glyph_key(scroll: Dict) -> Tuple:
+        return (scroll['total_importance'], scroll['context'].get('theme', 'general'),
+                bool(scroll.get('_is_bridge', False)), scroll.get('tcs', {}).get('score', 0))
+    
+    def _glyph(self, idx: int, scroll: Dict, key: Tuple) -> Tuple[bool, str]:
+        entry = self._glyphs.get(idx)
+        if entry is not None and entry[0] == key:
+            return True, entry[1]
+        glyph = GlyphCompressor.create_glyph(scroll)
+        self._glyphs[idx] = (key, glyph)
+        return False, glyph
+    
+    def glyph(self, idx: int, scroll: Dict) -> str:
+        hit, glyph = self._glyph(idx, scroll, self._glyph_key(scroll))
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return glyph
+    
+    def line(self, idx: int, scroll: Dict) -> str:
+        glyph_key = self._glyph_key(scroll)
+        key = (glyph_key, scroll.get('tcs', {}).get('grade', '?'), scroll.get('timestamp', '?'),
+               scroll['context'].get('bridge_from', ''))
+        entry = self._lines.get(idx)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        line = GlyphCompressor.map_line(idx, scroll, self._glyph(idx, scroll, glyph_key)[1])
+        self._lines[idx] = (key, line)
+        return line
+    
+    def clear(self) -> None:
+        self._glyphs.clear()
+        self._lines.clear()
+    
+    def __len__(self) -> int:
+        return len(self._glyphs)
+
+
+# ==============================================================================
+# ASYNC FACADE (v3.2)
+# ==============================================================================
+
+class AsyncMemoryEngine:
+    """
+    asyncio facade over a MemoryEngine.
+    
+    Every call runs in an executor (the loop's default unless one is given)
+    so compression, recall and (de)serialization never block the event loop.
+    Calls are serialized against the wrapped engine: a thread_safe engine
+    relies on its own reader/writer lock (recalls run concurrently); any
+    other engine is guarded by one asyncio lock, held until the executor
+    job finishes even if the awaiting task is cancelled.
+    
+    Identical recalls in flight at the same time are coalesced into a single
+    computation; each caller gets its own copy of the result list.
+    """
+    
+    def __init__(self, engine: Optional[MemoryEngine] = None, executor=None,
+                 **engine_kwargs):
+        self.engine = engine if engine is not None else MemoryEngine(**engine_kwargs)
+        self.executor = executor
+        self.coalesced_recalls = 0
+        self._serial: Optional[asyncio.Lock] = None
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+    
+    async def _run(self, fn: Callable, *args, serialize: bool = True, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        if not serialize or self.engine._lock is not None:
+            return await loop.run_in_executor(self.executor, call)
+        if self._serial is None:
+            self._serial = asyncio.Lock()
+        lock = self._serial
+        await lock.acquire()
+        try:
+            future = loop.run_in_executor(self.executor, call)
+        except BaseException:
+            lock.release()
+            raise
+        future.add_done_callback(lambda _: lock.release())
+        return await asyncio.shield(future)
+    
+    async def compress(self, conversation_segment: List[str], timestamp: str,
+                       context: Dict) -> Dict:
+        """compress_to_scroll — reads no codex state, so it runs without serialization."""
+        return await self._run(self.engine.compress_to_scroll, conversation_segment,
+                               timestamp, context, serialize=False)
+    
+    async def update_codex(self, scroll: Dict) -> Dict:
+        return await self._run(self.engine.update_codex, scroll)
+    
+    async def ingest(self, conversation_segment: List[str], timestamp: str,
+                     context: Dict) -> Dict:
+        """Compress a segment and commit it to the codex."""
+        scroll = await self.compress(conversation_segment, timestamp, context)
+        return await self.update_codex(scroll)
+    
+    async def ingest_stream(self, segments) -> AsyncIterator[Dict]:
+        """
+        Ingest segments from an async (or plain) iterable, yielding each
+        update_codex result as it is committed. Segments are taken in any
+        form _segment_args accepts.
+        """
+        if hasattr(segments, '__aiter__'):
+            async for segment in segments:
+                yield await self.ingest(*_segment_args(segment))
+        else:
+            for segment in segments:
+                yield await self.ingest(*_segment_args(segment))
+    
+    async def recall(self, query: str, top_n: int = 3,
+                     current_time: Optional[str] = None,
+                     touch: bool = True) -> List[Dict]:
+        key = (query, top_n, current_time, touch)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._run(self.engine.recall, query, top_n, current_time, touch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            self.engine.metrics.inc('cache_misses_total', cache='recall_coalesce')
+        else:
+            self.coalesced_recalls += 1
+            self.engine.metrics.inc('cache_hits_total', cache='recall_coalesce')
+        results = await asyncio.shield(task)
+        return [dict(r) for r in results]
+    
+    async def dream(self, current_time: Optional[str] = None) -> List[Dict]:
+        return await self._run(self.engine.dream_consolidate, current_time)
+    
+    async def diagnostics(self, current_time: Optional[str] = None) -> Dict:
+        return await self._run(self.engine.diagnostics, current_time)
+    
+    async def export(self, filepath: str) -> None:
+        await self._run(self.engine.export_memory_state, filepath)
+    
+    async def load(self, filepath: str) -> None:
+        await self._run(self.engine.load_memory_state, filepath)
+
+
+# ==============================================================================
+# MULTI-TENANT POOL (v3.2)
+# ==============================================================================
+
+class SharedResources:
+    """
+    Immutable state shared by every engine in an EnginePool.
+    
+        theme_keywords  one read-only theme → frozenset table
+        tokenize()      SymbolicTokenizer with an LRU cache of recent texts
+                        (shared, so a query or message seen by one tenant
+                        is free for the next)
+        vocabulary      intern table: each term string is stored once
+                        however many tenants' scrolls, df_index and
+                        postings use it
+    
+    IMPORTANCE_MARKERS and the tokenizer tables are class-level already.
+    """
+    
+    def __init__(self, theme_keywords: Optional[Dict[str, Set[str]]] = None,
+                 token_cache_size: int = 4096):
+        source = theme_keywords if theme_keywords is not None else MemoryEngine.THEME_KEYWORDS
+        from types import MappingProxyType
+        self.theme_keywords = MappingProxyType(
+            {theme: frozenset(words) for theme, words in source.items()})
+        self.vocabulary: Dict[str, str] = {}
+        self._tokens = functools.lru_cache(maxsize=token_cache_size)(self._tokenize_interned)
+    
+    def intern(self, term: str) -> str:
+        return self.vocabulary.setdefault(term, term)
+    
+    def _tokenize_interned(self, text: str) -> Tuple[str, ...]:
+        return tuple(map(self.intern, SymbolicTokenizer.tokenize(text)))
+    
+    def tokenize(self, text: str) -> List[str]:
+        return list(self._tokens(text))
+    
+    def intern_scroll(self, scroll: Dict) -> None:
+        """Re-key a scroll's term_frequencies / unique_terms with interned terms."""
+        intern = self.intern
+        tf = scroll.get('term_frequencies')
+        if tf:
+            scroll['term_frequencies'] = Counter({intern(t): c for t, c in tf.items()})
+        terms = scroll.get('unique_terms')
+        if terms:
+            scroll['unique_terms'] = set(map(intern, terms))
+    
+    def intern_state(self, state: Dict) -> None:
+        """Intern every vocabulary string of a parsed state file."""
+        for scroll in state['scrolls']:
+            self.intern_scroll(scroll)
+        state['df_index'] = {self.intern(t): c for t, c in state.get('df_index', {}).items()}
+    
+    @property
+    def shared_ids(self) -> Set[int]:
+        """ids of shared objects, excluded from per-tenant accounting."""
+        ids = {id(term) for term in self.vocabulary}
+        ids.add(id(self.theme_keywords))
+        ids.update(id(words) for words in self.theme_keywords.values())
+        return ids
+    
+    @property
+    def nbytes(self) -> int:
+        return _footprint([self.vocabulary, dict(self.theme_keywords)], set())
+
+
+def _footprint(roots: List[Any], skip: Set[int], claim: bool = False) -> int:
+    """
+    Approximate bytes reachable from roots: sys.getsizeof over containers,
+    strings and numbers, .nbytes for arrays, attributes of the engine's
+    own helper objects. Objects whose id is in skip, cached small ints and
+    singletons are not counted; each object is counted once. With claim,
+    counted ids are added to skip, so successive calls split shared
+    objects between them instead of counting them twice.
+    """
+    walk_attrs = (AccessLog, SpillingLog, RecallIndex, HashedTermSpace, ClusterIndex,
+                  RecallCache)
+    seen = skip if claim else set(skip)
+    stack = list(roots)
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if obj is None or obj is True or obj is False or id(obj) in seen:
+            continue
+        if type(obj) is int and -5 <= obj <= 256:
+            continue
+        seen.add(id(obj))
+        nbytes = getattr(obj, 'nbytes', None)
+        if type(obj).__module__ == 'numpy' and isinstance(nbytes, int):
+            total += nbytes + 112
+            continue
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        elif isinstance(obj, walk_attrs):
+            stack.append({k: v for k, v in vars(obj).items() if k != '_lock'})
+    return total
+
+
+class EnginePool:
+    """
+    One MemoryEngine per tenant, with at most `capacity` resident.
+    
+        pool = EnginePool('snapshots/', capacity=128)
+        pool.get('alice').recall('manifold')
+        pool.close()                          # persist every resident tenant
+    
+    get() returns the tenant's engine, loading <snapshot_dir>/<tenant>.json
+    on a miss (or starting empty). It then marks the tenant most recently
+    used. When more than capacity tenants are resident, the least recently
+    used one is persisted atomically and dropped. Tenants are persisted
+    only if they were fetched since their last save. All engines share
+    one SharedResources. Don't keep an engine reference across calls
+    that may evict it.
+    
+    usage() reports per-tenant bytes (shared vocabulary and theme tables
+    excluded and reported once). pool.metrics counts hits, misses, loads
+    and evictions. With log_spill_dir among the engine arguments, each
+    tenant spills to its own <log_spill_dir>/<tenant>/ subdirectory.
+    """
+    
+    TENANT_PATTERN = re.compile(r'^[A-Za-z0-9_.-]{1,128}$')
+    
+    def __init__(self, snapshot_dir: str, capacity: int = 64,
+                 shared: Optional[SharedResources] = None, **engine_kwargs):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        os.makedirs(snapshot_dir, exist_ok=True)
+        self.snapshot_dir = snapshot_dir
+        self.capacity = capacity
+        self.shared = shared if shared is not None else SharedResources()
+        self.engine_kwargs = engine_kwargs
+        self._resident: 'OrderedDict[str, MemoryEngine]' = OrderedDict()
+        self._dirty: Set[str] = set()
+        self._lock = threading.RLock()
+        
+        self.metrics = MetricsRegistry()
+        m = self.metrics
+        m.counter('cache_hits_total', 'Cache hits by cache.')
+        m.counter('cache_misses_total', 'Cache misses by cache.')
+        m.counter('tenant_loads_total', 'Tenants loaded from a snapshot.')
+        m.counter('tenant_evictions_total', 'Tenants persisted and evicted.')
+        m.gauge('resident_tenants', 'Tenants currently resident.', lambda: len(self._resident))
+        m.gauge('shared_vocabulary_terms', 'Interned vocabulary strings.',
+                lambda: len(self.shared.vocabulary))
+    
+    def snapshot_path(self, tenant: str) -> str:
+        if not self.TENANT_PATTERN.match(tenant) or not tenant.strip('.'):
+            raise ValueError(f"Invalid tenant id {tenant!r}")
+        return os.path.join(self.snapshot_dir, f'{tenant}.json')
+    
+    def _engine_kwargs(self, tenant: str) -> Dict:
+        """engine_kwargs for one tenant: spill files must not be shared."""
+        kwargs = dict(self.engine_kwargs)
+        if kwargs.get('log_spill_dir') is not None:
+            kwargs['log_spill_dir'] = os.path.join(kwargs['log_spill_dir'], tenant)
+        return kwargs
+    
+    def __contains__(self, tenant: str) -> bool:
+        return tenant in self._resident
+    
+    def __len__(self) -> int:
+        return len(self._resident)
+    
+    def resident(self) -> List[str]:
+        """Resident tenants, coldest first."""
+        with self._lock:
+            return list(self._resident)
+    
+    def get(self, tenant: str) -> MemoryEngine:
+        with self._lock:
+            engine = self._resident.get(tenant)
+            if engine is not None:
+                self._resident.move_to_end(tenant)
+                self.metrics.inc('cache_hits_total', cache='engine_pool')
+            else:
+                path = self.snapshot_path(tenant)
+                self.metrics.inc('cache_misses_total', cache='engine_pool')
+                engine = MemoryEngine(shared=self.shared, **self._engine_kwargs(tenant))
+                if os.path.exists(path):
+                    engine.load_memory_state(path)
+                    self.metrics.inc('tenant_loads_total')
+                self._resident[tenant] = engine
+                while len(self._resident) > self.capacity:
+                    self.evict(next(iter(self._resident)))
+            self._dirty.add(tenant)
+            return engine
+    
+    def persist(self, tenant: str, force: bool = False) -> bool:
+        """Write a resident tenant's snapshot (temp file + rename). True if written."""
+        with self._lock:
+            engine = self._resident.get(tenant)
+            if engine is None or not (force or tenant in self._dirty):
+                return False
+            path = self.snapshot_path(tenant)
+            engine.flush_access_updates()
+            engine.export_memory_state(f'{path}.tmp')
+            os.replace(f'{path}.tmp', path)
+            self._dirty.discard(tenant)
+            return True
+    
+    def evict(self, tenant: str) -> bool:
+        """Persist (if used since its last save) and drop a resident tenant."""
+        with self._lock:
+            if tenant not in self._resident:
+                return False
+            self.persist(tenant)
+            del self._resident[tenant]
+            self.metrics.inc('tenant_evictions_total')
+            return True
+    
+    def flush(self) -> int:
+        """Persist every resident tenant used since its last save; returns how many."""
+        with self._lock:
+            return sum(self.persist(tenant) for tenant in list(self._resident))
+    
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._resident.clear()
+    
+    def usage(self) -> Dict:
+        """Approximate memory per resident tenant plus the shared tables."""
+        with self._lock:
+            skip = self.shared.shared_ids
+            tenants = {}
+            for tenant, engine in self._resident.items():
+                roots = [engine.scrolls, engine.codex, engine.df_index, engine.access_log,
+                         engine.dream_log, engine.merge_log, engine._index, engine._hashed,
+                         engine._clusters, engine.theme_keywords]
+                tenants[tenant] = _footprint(roots, skip)
+            return {'tenants': tenants, 'tenant_bytes': sum(tenants.values()),
+                    'shared_bytes': self.shared.nbytes, 'resident': len(tenants),
+                    'capacity': self.capacity}
 
 
 # ==============================================================================
@@ -1312,6 +5375,927 @@ if __name__ == "__main__":
                     len(engine2.scrolls) == len(engine.scrolls))
         print()
         
+        # --- Test 8: Read-only recall and thread-safe mode (v3.2) ---
+        print("  [Thread Safety]")
+        engine = MemoryEngine(k_modes=3)
+        s = engine.compress_to_scroll(['crystal frequency resonance'], '2025-01-01', {'theme': 'technomancy'})
+        engine.update_codex(s)
+        results = engine.recall('crystal frequency', top_n=1, current_time='2025-03-01', touch=False)
+        assert_test("touch=False leaves last_accessed",
+                    engine.scrolls[0]['last_accessed'] == '2025-01-01'
+                    and results[0]['last_accessed'] == '2025-01-01',
+                    f"got {engine.scrolls[0]['last_accessed']}")
+        assert_test("touch=False leaves access_log", engine.access_log[0] == '2025-01-01')
+        
+        engine = MemoryEngine(k_modes=3, thread_safe=True, access_batch_size=1000)
+        s = engine.compress_to_scroll(['crystal frequency resonance'], '2025-01-01', {'theme': 'technomancy'})
+        engine.update_codex(s)
+        results = engine.recall('crystal frequency', top_n=1, current_time='2025-03-01')
+        assert_test("Buffered touch visible in result", results[0]['last_accessed'] == '2025-03-01')
+        assert_test("Buffered touch deferred", engine.scrolls[0]['last_accessed'] == '2025-01-01')
+        engine.flush_access_updates()
+        assert_test("Flush applies buffered touch", engine.scrolls[0]['last_accessed'] == '2025-03-01')
+        
+        import threading as _threading
+        errors = []
+        def reader():
+            try:
+                for _ in range(50):
+                    engine.recall('crystal frequency resonance', top_n=2, current_time='2025-03-02')
+            except Exception as exc:  # pragma: no cover - reported by assert below
+                errors.append(exc)
+        def writer():
+            try:
+                for n in range(30):
+                    msg = [f'distinct topic{n} alpha{n} beta{n} gamma{n} marker{n}']
+                    engine.update_codex(engine.compress_to_scroll(msg, '2025-02-01', {'theme': 'memory'}))
+            except Exception as exc:  # pragma: no cover
+                errors.append(exc)
+        threads = [_threading.Thread(target=reader) for _ in range(4)] + [_threading.Thread(target=writer)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        expected_df = Counter(term for sc in engine.scrolls for term in sc['unique_terms'])
+        assert_test("Concurrent recall/ingest raises nothing", not errors, f"{errors[:1]}")
+        assert_test("Concurrent ingest keeps df_index consistent",
+                    len(engine.scrolls) == 31 and expected_df == engine.df_index,
+                    f"{len(engine.scrolls)} scrolls")
+        print()
+        
+        # --- Test 9: Derived index rebuild (v3.2) ---
+        print("  [Index Rebuild]")
+        engine = MemoryEngine(k_modes=3, thread_safe=True)
+        for n in range(6):
+            engine.update_codex(engine.compress_to_scroll(
+                [f'orbit{n} lattice{n} harmonic resonance'], '2025-01-01', {'theme': 'mathematics'}))
+        # Bulk import that bypasses update_codex leaves df_index stale
+        engine.scrolls.append(engine.compress_to_scroll(['copper coil antenna'], '2025-01-02', {'theme': 'technomancy'}))
+        engine.rebuild_index()
+        assert_test("Rebuild recomputes df_index", engine.df_index['copper'] == 1, f"got {engine.df_index['copper']}")
+        assert_test("Rebuilt index serves recall",
+                    engine.recall('copper antenna', top_n=1, touch=False)[0]['context']['theme'] == 'technomancy')
+        
+        gen_before = engine.generation
+        worker = engine.rebuild_index(background=True)
+        engine.update_codex(engine.compress_to_scroll(['zinc ormus shungite'], '2025-01-03', {'theme': 'technomancy'}))
+        worker.join()
+        assert_test("Background rebuild bumps generation", engine.generation > gen_before + 1)
+        assert_test("Ingest during rebuild replayed",
+                    engine.df_index['shungite'] == 1 and engine._index.candidates({'shungite'}) == {len(engine.scrolls) - 1})
+        
+        engine.export_memory_state('/tmp/test_v3.2_rebuild.json')
+        engine2 = MemoryEngine(k_modes=3, thread_safe=True)
+        worker = engine2.load_memory_state('/tmp/test_v3.2_rebuild.json', background=True)
+        engine2.update_codex(engine2.compress_to_scroll(['pranayama breath rhythm'], '2025-01-04', {'theme': 'breathwork'}))
+        worker.join()
+        assert_test("Background load replays concurrent ingest",
+                    len(engine2.scrolls) == len(engine.scrolls) + 1 and engine2.df_index['pranayama'] == 1,
+                    f"{len(engine2.scrolls)} scrolls")
+        try:
+            MemoryEngine().rebuild_index(background=True)
+            assert_test("Background rebuild requires thread_safe", False)
+        except ValueError:
+            assert_test("Background rebuild requires thread_safe", True)
+        print()
+        
+        # --- Test 10: asyncio facade (v3.2) ---
+        print("  [Async Facade]")
+        import asyncio as _asyncio
+        
+        async def async_checks():
+            facade = AsyncMemoryEngine(k_modes=3)
+            
+            async def segment_stream():
+                yield {'messages': ['crystal copper coil frequency'], 'timestamp': '2025-01-01', 'theme': 'technomancy'}
+                yield (['breath rhythm inhale exhale'], '2025-01-02', {'theme': 'breathwork'})
+            
+            actions = [r['action'] async for r in facade.ingest_stream(segment_stream())]
+            recalls = await _asyncio.gather(*[
+                facade.recall('copper frequency', top_n=1, current_time='2025-01-05') for _ in range(5)])
+            await facade.export('/tmp/test_v3.2_async.json')
+            await facade.load('/tmp/test_v3.2_async.json')
+            return facade, actions, recalls
+        
+        facade, actions, recalls = _asyncio.run(async_checks())
+        assert_test("Async stream ingests all segments", actions == ['added', 'added'], f"got {actions}")
+        assert_test("Identical recalls coalesced", facade.coalesced_recalls == 4,
+                    f"got {facade.coalesced_recalls}")
+        assert_test("Coalesced callers get equal results",
+                    all(r[0]['essence'] == recalls[0][0]['essence'] for r in recalls)
+                    and recalls[0][0]['context']['theme'] == 'technomancy')
+        assert_test("Async load round-trips", len(facade.engine.scrolls) == 2)
+        print()
+        
+        # --- Test 11: Bulk ingest pipeline (v3.2) ---
+        print("  [Bulk Ingest]")
+        vocab = ['theorem', 'manifold', 'crystal', 'copper', 'breath', 'grief', 'soulbraid',
+                 'frequency', 'lattice', 'orbit', 'spiral', 'codex', 'witness', 'zinc']
+        bulk_segments = []
+        for n in range(60):
+            words = [vocab[(n * 7 + k * 3) % len(vocab)] for k in range(5)]
+            if n % 4 == 0:
+                words = [vocab[k] for k in range(5)]  # recurring near-duplicate
+            bulk_segments.append({'messages': [' '.join(words), f'note{n % 9} ' + ' '.join(words[:3])],
+                                  'timestamp': f'2025-01-{n % 28 + 1:02d}',
+                                  'context': {'theme': ['memory', 'technomancy'][n % 2]}})
+        serial = MemoryEngine(k_modes=3, interference_threshold=0.6)
+        serial_actions = [serial.update_codex(serial.compress_to_scroll(*_segment_args(seg)))['action']
+                          for seg in bulk_segments]
+        for workers in (1, 2):
+            bulk = MemoryEngine(k_modes=3, interference_threshold=0.6)
+            bulk_actions = []
+            stats = bulk.ingest_many(bulk_segments, workers=workers, batch_size=16,
+                                     on_result=lambda pos, res: bulk_actions.append(res['action']))
+            assert_test(f"ingest_many(workers={workers}) matches serial decisions",
+                        bulk_actions == serial_actions
+                        and [sc['essence'] for sc in bulk.scrolls] == [sc['essence'] for sc in serial.scrolls]
+                        and bulk.df_index == serial.df_index,
+                        f"{stats['added']} added / {stats['merged']} merged")
+        assert_test("ingest_many reports throughput",
+                    stats['segments'] == 60 and stats['batches'] == 4 and stats['segments_per_sec'] > 0)
+        print()
+        
+        # --- Test 12: Streaming transcript segmentation (v3.2) ---
+        print("  [Transcript Streaming]")
+        transcript_path = '/tmp/test_v3.2_transcript.jsonl'
+        with open(transcript_path, 'w', encoding='utf-8') as f:
+            for minute in range(5):
+                f.write(json.dumps({'text': f'the crystal copper coil frequency reading {minute}',
+                                    'timestamp': f'2025-01-01T10:0{minute}:00'}) + "\n")
+            f.write("\n")
+            for minute in range(3):
+                f.write(json.dumps({'text': f'breath inhale exhale rhythm round {minute}',
+                                    'timestamp': f'2025-01-01T14:0{minute}:00'}) + "\n")
+        engine = MemoryEngine(k_modes=3)
+        segs = list(engine.transcript_segments(transcript_path, max_messages=4))
+        assert_test("Segments split by count and time gap",
+                    [len(sg['messages']) for sg in segs] == [4, 1, 3], f"got {[len(sg['messages']) for sg in segs]}")
+        assert_test("Segments auto-themed",
+                    [sg['context']['theme'] for sg in segs] == ['technomancy', 'technomancy', 'breathwork'],
+                    f"got {[sg['context']['theme'] for sg in segs]}")
+        assert_test("Segment stamped with latest message", segs[0]['timestamp'] == '2025-01-01T10:03:00')
+        budget_segs = list(engine.transcript_segments(['aaaa', 'bbbb', 'cccc'], max_chars=8))
+        assert_test("Segments split by char budget", [len(sg['messages']) for sg in budget_segs] == [2, 1])
+        endless = ({'text': f'orbit lattice {n}', 'timestamp': None} for n in itertools.count())
+        first = next(engine.transcript_segments(endless, max_messages=3))
+        assert_test("Segmentation is lazy", len(first['messages']) == 3)
+        stats = engine.ingest_transcript(transcript_path, max_messages=4)
+        assert_test("ingest_transcript feeds the codex",
+                    stats['segments'] == 3 and 'breathwork' in engine.codex, f"{stats}")
+        print()
+        
+        # --- Test 13: Stage tracing (v3.2) ---
+        print("  [Tracing]")
+        engine = MemoryEngine(k_modes=3)
+        engine.update_codex(engine.compress_to_scroll(['crystal copper coil frequency'], '2025-01-01', {'theme': 'technomancy'}))
+        engine.update_codex(engine.compress_to_scroll(['theorem manifold proof'], '2025-01-02', {'theme': 'mathematics'}))
+        with engine.trace() as tracer:
+            engine.recall('copper frequency', top_n=1, current_time='2025-01-05')
+            engine.update_codex(engine.compress_to_scroll(['crystal copper coil frequency'], '2025-01-03', {'theme': 'technomancy'}))
+        summary = tracer.summary()
+        assert_test("Tracer collects recall stages",
+                    set(summary['recall']['stages']) == {'tokenize', 'themes', 'candidates', 'tfidf', 'decay',
+                                                         'theme_prior', 'softmax', 'sort', 'copy'},
+                    f"got {sorted(summary['recall']['stages'])}")
+        assert_test("update_codex span records action",
+                    tracer.spans[-1]['op'] == 'update_codex' and tracer.spans[-1]['attrs']['action'] == 'merged')
+        assert_test("trace() restores previous tracer", engine.tracer is None)
+        timed = engine.recall('copper frequency', top_n=1, current_time='2025-01-05', timings=True)
+        assert_test("recall(timings=True) attaches breakdown",
+                    timed[0]['_recall_meta']['timings']['total'] >= timed[0]['_recall_meta']['timings']['tfidf'])
+        print()
+        
+        # --- Test 14: Metrics registry (v3.2) ---
+        print("  [Metrics]")
+        engine = MemoryEngine(k_modes=3)
+        engine.update_codex(engine.compress_to_scroll(['crystal copper coil frequency'], '2025-01-01', {'theme': 'technomancy'}))
+        engine.update_codex(engine.compress_to_scroll(['crystal copper coil frequency'], '2025-01-02', {'theme': 'technomancy'}))
+        engine.update_codex(engine.compress_to_scroll(['theorem manifold copper proof'], '2025-01-03', {'theme': 'mathematics'}))
+        engine.recall('copper', top_n=1, current_time='2025-01-05')
+        engine.dream_consolidate(current_time='2025-01-05')
+        snap = engine.metrics.snapshot()
+        assert_test("Counters track adds, merges and recalls",
+                    (snap['scrolls_added_total'], snap['scrolls_merged_total'], snap['recalls_total']) == (2, 1, 1),
+                    f"got {snap['scrolls_added_total']}, {snap['scrolls_merged_total']}, {snap['recalls_total']}")
+        assert_test("Histograms record observations",
+                    snap['recall_seconds']['count'] == 1 and snap['merge_similarity']['buckets'][float('inf')] == 1)
+        assert_test("Gauges sampled at collection", snap['scrolls'] == len(engine.scrolls)
+                    and snap['dream_pairs_scanned_total'] == 1)
+        server = engine.serve_metrics(port=0)
+        try:
+            import urllib.request as _request
+            url = 'http://%s:%d/metrics' % server.server_address[:2]
+            with _request.urlopen(url, timeout=5) as response:
+                body = response.read().decode('utf-8')
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert_test("Endpoint serves Prometheus text",
+                    '# TYPE memory_engine_recall_seconds histogram' in body
+                    and 'memory_engine_recall_seconds_bucket{le="+Inf"} 1' in body
+                    and 'memory_engine_scrolls_merged_total 1' in body)
+        print()
+        
+        # --- Test 15: Incremental diagnostics aggregates (v3.2) ---
+        print("  [Diagnostics Aggregates]")
+        engine = MemoryEngine(k_modes=3, dream_resonance_threshold=0.05)
+        for n, (text, theme) in enumerate([('crystal copper coil frequency', 'technomancy'),
+                                           ('crystal copper coil frequency', 'technomancy'),
+                                           ('copper frequency theorem proof', 'mathematics'),
+                                           ('grief loss mourning copper', 'grief')]):
+            engine.update_codex(engine.compress_to_scroll([text], f'2025-01-0{n + 1}', {'theme': theme}))
+        engine.dream_consolidate(current_time='2025-01-10')
+        engine.recall('theorem proof', top_n=1, current_time='2025-02-01')
+        diag = engine.diagnostics('2025-03-01')
+        assert_test("Running counts match a full scan",
+                    diag['bridge_scrolls'] == sum(1 for sc in engine.scrolls if sc.get('_is_bridge'))
+                    and diag['total_merges'] == sum(sc.get('_merge_count', 1) - 1 for sc in engine.scrolls) == 1,
+                    f"{diag['bridge_scrolls']} bridges, {diag['total_merges']} merges")
+        assert_test("Running TCS average matches",
+                    abs(diag['average_tcs'] - np.mean([sc['tcs']['score'] for sc in engine.scrolls])) < 1e-12)
+        scalar = [engine._temporal_decay(sc, '2025-03-01') for sc in engine.scrolls]
+        assert_test("Vectorized decay matches _temporal_decay",
+                    np.allclose(engine._decay_column(engine._index, '2025-03-01'), scalar, rtol=1e-12, atol=0))
+        vivid = sorted(range(len(scalar)), key=lambda i: engine.scrolls[i]['total_importance'] * scalar[i], reverse=True)
+        assert_test("Vitality ranking matches full sort",
+                    [e[0] for e in diag['most_vivid']] == vivid[:3] and [e[0] for e in diag['most_faded']] == vivid[-3:])
+        assert_test("Top terms match df_index", diag['top_terms'] == engine.df_index.most_common(20))
+        print()
+        
+        # --- Test 16: Lazy NumPy and pure-Python kernels (v3.2) ---
+        print("  [Small-Codex Kernels]")
+        import os as _os
+        import shutil as _shutil
+        import subprocess as _subprocess
+        import sys as _sys
+        probe = ("import sys, memory_engine_v3_1 as m; e = m.MemoryEngine(); "
+                 "e.update_codex(e.compress_to_scroll(['crystal copper coil'], '2025-01-01', {'theme': 'technomancy'})); "
+                 "e.recall('copper'); print('numpy' in sys.modules)")
+        probe_out = _subprocess.run([_sys.executable, '-c', probe], capture_output=True, text=True,
+                                    cwd=_os.path.dirname(_os.path.abspath(__file__)))
+        assert_test("Small-codex recall never imports NumPy", probe_out.stdout.strip() == 'False',
+                    probe_out.stderr.strip()[-200:])
+        a_vec = {'copper': 0.1, 'coil': 3.0, 'zinc': 1e-3}
+        assert_test("Cosine independent of term order",
+                    _sparse_cosine(a_vec, {'zinc': 2, 'copper': 1}) ==
+                    _sparse_cosine(dict(reversed(list(a_vec.items()))), {'copper': 1, 'zinc': 2}))
+        engine = MemoryEngine(k_modes=3)
+        for n in range(12):
+            engine.update_codex(engine.compress_to_scroll(
+                [f'orbit{n % 4} lattice{n} copper frequency'], f'2025-01-{n + 1:02d}', {'theme': 'technomancy'}))
+        ranked = []
+        for threshold in (0, 10 ** 6):
+            engine.SMALL_CODEX_THRESHOLD = threshold
+            ranked.append([(r['essence'], r['_recall_meta']['attention'])
+                           for r in engine.recall('orbit1 copper', top_n=12, touch=False)])
+        assert_test("Pure-Python and NumPy ranking identical", ranked[0] == ranked[1])
+        print()
+        
+        # --- Test 17: Resident daemon (v3.2) ---
+        print("  [Daemon]")
+        import socket as _socket
+        if hasattr(_socket, 'AF_UNIX'):
+            import memory_engine_cli as _cli
+            sock_path = '/tmp/test_v3.2_daemon.sock'
+            state_path = '/tmp/test_v3.2_daemon.json'
+            for stale in (sock_path, state_path):
+                if _os.path.exists(stale):
+                    _os.unlink(stale)
+            daemon = _cli.MemoryDaemon(state_path, sock_path, persist_interval=3600, k_modes=3)
+            server_thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+            server_thread.start()
+            for _ in range(200):
+                if _os.path.exists(sock_path):
+                    break
+                time.sleep(0.01)
+            added = _cli.request('ingest', sock_path, messages=['crystal copper coil frequency'],
+                                 timestamp='2025-01-01', context={'theme': 'technomancy'})
+            hits = _cli.request('recall', sock_path, query='copper', top_n=1, touch=False)
+            assert_test("Daemon serves ingest and recall",
+                        added['action'] == 'added' and hits[0]['context']['theme'] == 'technomancy')
+            try:
+                _cli.request('forget', sock_path)
+                assert_test("Unknown daemon command rejected", False)
+            except RuntimeError:
+                assert_test("Unknown daemon command rejected", True)
+            _cli.request('shutdown', sock_path)
+            server_thread.join(timeout=10)
+            assert_test("Daemon persists state on shutdown",
+                        not server_thread.is_alive() and not _os.path.exists(sock_path)
+                        and len(json.load(open(state_path))['scrolls']) == 1)
+        print()
+        
+        # --- Test 18: Streaming / cached glyph rendering (v3.2) ---
+        print("  [Glyph Streaming]")
+        import io as _io
+        engine = MemoryEngine(k_modes=3)
+        for n, theme in enumerate(['technomancy', 'mathematics', 'technomancy', 'grief', 'technomancy']):
+            engine.update_codex(engine.compress_to_scroll(
+                [f'orbit{n} lattice{n} love breakthrough'], f'2025-01-0{n + 1}', {'theme': theme}))
+        cache = GlyphCache()
+        buf = _io.StringIO()
+        rows = GlyphCompressor.write_glyph_map(buf, engine.scrolls, cache=cache, chunk_lines=2)
+        assert_test("write_glyph_map matches glyph_map",
+                    buf.getvalue() == GlyphCompressor.glyph_map(engine.scrolls) + "\n" and rows == 5)
+        tech = list(GlyphCompressor.iter_glyph_map(engine.scrolls, themes='technomancy', frame=False))
+        assert_test("Theme filter and index range",
+                    [line[3:6] for line in tech] == ['000', '002', '004']
+                    and len(list(GlyphCompressor.iter_glyphs(engine.scrolls, start=1, stop=3))) == 2)
+        assert_test("Pagination over filtered rows",
+                    GlyphCompressor.glyph_page(engine.scrolls, 1, page_size=2, themes='technomancy') == tech[2:])
+        GlyphCompressor.write_glyph_map(_io.StringIO(), engine.scrolls, cache=cache)
+        hits_before = cache.hits
+        engine.scrolls[2]['total_importance'] += 20.0
+        refreshed = list(GlyphCompressor.iter_glyph_map(engine.scrolls, cache=cache, frame=False))
+        assert_test("Cache reuses unchanged rows and re-renders changed ones",
+                    cache.hits - hits_before == 4 and refreshed[2].split()[1].startswith('✧'),
+                    f"{cache.hits - hits_before} hits")
+        print()
+        
+        # --- Test 19: Feature-hashed recall (v3.2) ---
+        print("  [Hashed Recall]")
+        segments = [(['quantum lattice orbit proof'], 'mathematics'),
+                    (['grief ocean memory tears'], 'grief'),
+                    (['circuit compiler kernel signal'], 'technomancy')]
+        exact, hashed = MemoryEngine(), MemoryEngine(hash_dim=4096)
+        for n, (messages, theme) in enumerate(segments):
+            for target in (exact, hashed):
+                target.update_codex(target.compress_to_scroll(messages, f'2025-01-0{n + 1}', {'theme': theme}))
+        agree = all(
+            exact.recall(q, top_n=1, current_time='2025-02-01', touch=False)[0]['essence'] ==
+            hashed.recall(q, top_n=1, current_time='2025-02-01', touch=False)[0]['essence']
+            for q in ('lattice orbit', 'ocean tears', 'compiler signal'))
+        assert_test("Hashed top-1 matches exact on distinct scrolls", agree)
+        assert_test("Term hash is stable and signed",
+                    _hash_term('lattice', 4096) == _hash_term('lattice', 4096)
+                    and _hash_term('lattice', 4096)[1] in (1.0, -1.0))
+        hashed.update_codex(hashed.compress_to_scroll(
+            ['quantum lattice orbit proof theorem'], '2025-01-05', {'theme': 'mathematics'}))
+        live = hashed._current_hashed()
+        rebuilt = HashedTermSpace.build(hashed.scrolls, 4096)
+        assert_test("Incremental hashed rows match a rebuild",
+                    len(live) == len(rebuilt) == len(hashed.scrolls)
+                    and np.array_equal(live.matrix[:len(live)], rebuilt.matrix[:len(rebuilt)])
+                    and np.array_equal(live.df, rebuilt.df))
+        exact.export_memory_state('/tmp/test_v3.2_exact.json')
+        hashed.export_memory_state('/tmp/test_v3.2_hashed.json')
+        into_hashed = MemoryEngine(hash_dim=4096, hash_rescore=4, n_clusters=2, nprobe=1)
+        into_hashed.load_memory_state('/tmp/test_v3.2_exact.json')
+        into_exact = MemoryEngine()
+        into_exact.load_memory_state('/tmp/test_v3.2_hashed.json')
+        assert_test("Loading a state keeps the constructor's recall mode",
+                    into_hashed._recall_mode_dict() == {'hash_dim': 4096, 'hash_precision': 'float32',
+                                                        'hash_rescore': 4, 'n_clusters': 2, 'nprobe': 1}
+                    and into_exact.hash_dim is None and into_exact.n_clusters is None
+                    and 'hash_dim' not in hashed._config_dict())
+        print()
+        
+        # --- Test 20: MaxScore-pruned recall (v3.2) ---
+        print("  [Pruned Recall]")
+        engine = MemoryEngine()
+        for n in range(40):
+            words = ' '.join(f'filler{n}x{k}' for k in range(n % 7 + 2))
+            anchor = 'lattice orbit' if n % 5 == 0 else 'orbit'
+            engine.update_codex(engine.compress_to_scroll(
+                [f'{anchor} {words}'], f'2025-01-{n % 28 + 1:02d}', {'theme': 'mathematics'}))
+        exact = engine.recall('lattice orbit', top_n=2, current_time='2025-02-01', touch=False)
+        engine.tracer = tracer = StageTracer()
+        bounded = engine.recall('lattice orbit', top_n=2, current_time='2025-02-01',
+                                touch=False, prune='bounded')
+        engine.tracer = None
+        full = engine.recall('lattice orbit', top_n=2, current_time='2025-02-01',
+                             touch=False, prune='exact')
+        same = lambda rs: [r['essence'] for r in rs]
+        assert_test("Pruned top-n matches exhaustive recall",
+                    same(bounded) == same(exact) == same(full))
+        span = tracer.spans[-1]['attrs']
+        assert_test("Pruning skips candidates",
+                    span['scored'] < span['candidates'], f"{span['scored']}/{span['candidates']}")
+        assert_test("prune='exact' attention is exact, 'bounded' brackets it",
+                    all(f['_recall_meta']['attention'] == e['_recall_meta']['attention']
+                        and b['_recall_meta']['attention_bounds'][0]
+                        <= e['_recall_meta']['attention'] * (1 + 1e-12)
+                        and e['_recall_meta']['attention']
+                        <= b['_recall_meta']['attention_bounds'][1] * (1 + 1e-12)
+                        for e, b, f in zip(exact, bounded, full)))
+        try:
+            engine.recall('orbit', prune='wand')
+            assert_test("Unknown prune mode rejected", False)
+        except ValueError:
+            assert_test("Unknown prune mode rejected", True)
+        print()
+        
+        # --- Test 21: Reduced-precision hashed rows (v3.2) ---
+        print("  [Reduced Precision]")
+        engine = MemoryEngine()
+        for n in range(12):
+            engine.update_codex(engine.compress_to_scroll(
+                [f'orbit{n} lattice{n % 3} signal{n % 4} proof'], f'2025-01-{n + 1:02d}',
+                {'theme': 'mathematics'}))
+        spaces = {p: HashedTermSpace.build(engine.scrolls, 512, p)
+                  for p in HashedTermSpace.PRECISIONS}
+        full = spaces['float32']
+        dequantized = spaces['int8'].matrix[:12].astype(float) * spaces['int8'].scales[:12, None]
+        assert_test("float16 halves and int8 quarters the row storage",
+                    spaces['float16'].matrix.nbytes * 2 == full.matrix.nbytes
+                    == spaces['int8'].matrix.nbytes * 4)
+        assert_test("int8 rows dequantize within half a scale step",
+                    bool(np.all(np.abs(dequantized - full.matrix[:12])
+                                <= spaces['int8'].scales[:12, None] / 2 + 1e-6)))
+        want = [r['essence'] for r in engine.recall('orbit7 lattice1', top_n=3,
+                                                    current_time='2025-02-01', touch=False)]
+        for precision in ('float16', 'int8'):
+            engine.hash_dim, engine.hash_precision, engine.hash_rescore = 512, precision, 8
+            got = [r['essence'] for r in engine.recall('orbit7 lattice1', top_n=3,
+                                                       current_time='2025-02-01', touch=False)]
+            assert_test(f"{precision} + exact rescore matches exact top-3", got == want)
+        engine.hash_dim = None
+        try:
+            HashedTermSpace(64, 'int4')
+            assert_test("Unknown precision rejected", False)
+        except ValueError:
+            assert_test("Unknown precision rejected", True)
+        print()
+        
+        # --- Test 22: Bounded logs and compact access_log (v3.2) ---
+        print("  [Bounded Logs]")
+        spill_dir = '/tmp/test_v3.2_logs'
+        _os.makedirs(spill_dir, exist_ok=True)
+        for name in ('merge_log', 'dream_log', 'scratch'):
+            stale = _os.path.join(spill_dir, f'{name}.jsonl.gz')
+            if _os.path.exists(stale):
+                _os.unlink(stale)
+        log = SpillingLog(8, _os.path.join(spill_dir, 'scratch.jsonl.gz'))
+        for n in range(50):
+            log.append({'timestamp': f'2025-01-{n % 28 + 1:02d}T00:00:{n:02d}', 'n': n})
+        assert_test("Window stays within limit, history spills",
+                    len(log) <= 8 and log.total == 50 and log.spilled == 50 - len(log))
+        assert_test("scan() walks spilled history then the window",
+                    [r['n'] for r in log.scan()] == list(range(50))
+                    and [r['n'] for r in log.scan(since='2025-01-20', where=lambda r: r['n'] >= 28)]
+                    == [47, 48, 49])
+        stamps = {0: '2025-01-01', 1: '2025-01-15T12:00:00', 2: '2025-01-15T12:00:00.250000',
+                  5: '2025-01-15T12:00:00+02:00', 6: 'yesterday'}
+        access = AccessLog(stamps)
+        assert_test("AccessLog round-trips every stamp",
+                    dict(access.items()) == stamps and 3 not in access and len(access) == 5
+                    and access._verbatim.keys() == {5, 6})
+        engine = MemoryEngine(log_limit=4, log_spill_dir=spill_dir)
+        for n in range(12):
+            engine.update_codex(engine.compress_to_scroll(
+                ['quantum lattice orbit proof theorem'], f'2025-01-{n + 1:02d}', {'theme': 'mathematics'}))
+        assert_test("Engine merge_log is bounded and counted in diagnostics",
+                    len(engine.merge_log) <= 4 and engine.merge_log.total == 11
+                    and engine.diagnostics('2025-02-01')['merge_count'] == 11
+                    and len(list(engine.merge_log.scan())) == 11)
+        engine.export_memory_state('/tmp/test_v3.2_logs_state.json')
+        resumed = MemoryEngine(log_limit=4, log_spill_dir=spill_dir)
+        resumed.load_memory_state('/tmp/test_v3.2_logs_state.json')
+        assert_test("A loaded state adopts the spilled history it still matches",
+                    [r['timestamp'] for r in resumed.merge_log.scan()]
+                    == [r['timestamp'] for r in engine.merge_log.scan()] and resumed.merge_log.spilled > 0)
+        restarted = MemoryEngine(log_limit=4, log_spill_dir=spill_dir)
+        for n in range(6):
+            restarted.update_codex(restarted.compress_to_scroll(
+                ['grief ocean memory tears'], f'2025-03-{n + 1:02d}', {'theme': 'grief'}))
+        assert_test("A new engine on the same spill dir scans only its own history",
+                    [r['timestamp'][:7] for r in restarted.merge_log.scan()] == ['2025-03'] * 5)
+        reloaded = MemoryEngine(log_limit=4, log_spill_dir=spill_dir)
+        reloaded.load_memory_state('/tmp/test_v3.2_logs_state.json')
+        window = [r['timestamp'] for r in reloaded.merge_log.scan()]
+        assert_test("A loaded state whose spill file moved on starts its history afresh",
+                    reloaded.merge_log.spilled == 0 and window == [r['timestamp'] for r in engine.merge_log],
+                    f"{window}")
+        print()
+        
+        # --- Test 23: Multi-tenant engine pool (v3.2) ---
+        print("  [Engine Pool]")
+        pool_dir = '/tmp/test_v3.2_pool'
+        _shutil.rmtree(pool_dir, ignore_errors=True)
+        _os.makedirs(pool_dir)
+        pool = EnginePool(pool_dir, capacity=2, k_modes=3)
+        for tenant, theme in (('ana', 'mathematics'), ('ben', 'grief'), ('cy', 'technomancy')):
+            pool.get(tenant).update_codex(pool.get(tenant).compress_to_scroll(
+                ['lattice orbit resonance proof'], '2025-01-01', {'theme': theme}))
+        assert_test("Coldest tenant persisted and evicted",
+                    pool.resident() == ['ben', 'cy'] and _os.path.exists(_os.path.join(pool_dir, 'ana.json')))
+        ana = pool.get('ana')
+        assert_test("Evicted tenant reloads on demand",
+                    len(ana.scrolls) == 1 and ana.scrolls[0]['context']['theme'] == 'mathematics'
+                    and pool.resident() == ['cy', 'ana'])
+        ana_term = next(t for t in ana.scrolls[0]['term_frequencies'] if t == 'lattice')
+        cy_term = next(t for t in pool.get('cy').scrolls[0]['term_frequencies'] if t == 'lattice')
+        assert_test("Vocabulary and theme table shared across tenants",
+                    ana_term is cy_term and ana.theme_keywords is pool.get('cy').theme_keywords)
+        usage = pool.usage()
+        assert_test("Per-tenant memory accounting",
+                    set(usage['tenants']) == {'cy', 'ana'} and all(v > 0 for v in usage['tenants'].values())
+                    and usage['shared_bytes'] > 0)
+        try:
+            pool.get('../escape')
+            assert_test("Unsafe tenant id rejected", False)
+        except ValueError:
+            assert_test("Unsafe tenant id rejected", True)
+        pool.close()
+        spill_root = _os.path.join(pool_dir, 'logs')
+        spilling = EnginePool(pool_dir, capacity=2, log_limit=2, log_spill_dir=spill_root)
+        for tenant, text in (('dee', 'lattice orbit resonance proof'), ('eli', 'grief ocean memory tears')):
+            for n in range(8):
+                spilling.get(tenant).update_codex(spilling.get(tenant).compress_to_scroll(
+                    [text], f'2025-01-{n + 1:02d}', {'theme': tenant}))
+        histories = {tenant: [r for r in spilling.get(tenant).merge_log.scan()] for tenant in ('dee', 'eli')}
+        assert_test("Spilling tenants keep separate log histories",
+                    all(len(h) == 7 and {r['theme'] for r in h} == {tenant}
+                        and spilling.get(tenant).merge_log.spilled > 0 for tenant, h in histories.items())
+                    and sorted(_os.listdir(spill_root)) == ['dee', 'eli'])
+        spilling.close()
+        print()
+        
+        # --- Test 24: Delta snapshots (v3.2) ---
+        print("  [Delta Snapshots]")
+        delta_dir = '/tmp/test_v3.2_delta'
+        _os.makedirs(delta_dir, exist_ok=True)
+        delta_path = lambda name: _os.path.join(delta_dir, name)
+        engine = MemoryEngine(k_modes=3)
+        for n, (theme, text) in enumerate((('mathematics', 'manifold theorem convergence proof'),
+                                           ('grief', 'river ember loss mourning'),
+                                           ('technomancy', 'circuit copper daemon socket'))):
+            engine.update_codex(engine.compress_to_scroll([text], f'2025-01-0{n + 1}', {'theme': theme}))
+        engine.export_memory_state(delta_path('base.json'))
+        engine.recall('manifold theorem', top_n=1, current_time='2025-02-01')
+        touch_stats = engine.export_delta(delta_path('d1.json'))
+        assert_test("Touch-only delta carries access times, not scrolls",
+                    touch_stats['scrolls'] == 0 and touch_stats['touched'] == 1
+                    and touch_stats['df_terms'] == 0 and touch_stats['codex_themes'] == 0)
+        engine.update_codex(engine.compress_to_scroll(
+            ['lattice orbit glyph resonance'], '2025-02-02', {'theme': 'mathematics'}))
+        add_stats = engine.export_delta(delta_path('d2.json'))
+        assert_test("Add delta carries one scroll, its terms and its theme",
+                    add_stats['scrolls'] == 1 and add_stats['codex_themes'] == 1
+                    and add_stats['df_terms'] == len(engine.scrolls[3]['unique_terms']))
+        chain = [delta_path('d1.json'), delta_path('d2.json')]
+        engine2 = MemoryEngine(k_modes=3)
+        engine2.load_memory_state(delta_path('base.json'), deltas=chain)
+        assert_test("Base + delta chain reproduces the engine",
+                    len(engine2.scrolls) == 4 and engine2.codex == engine.codex
+                    and engine2.df_index == engine.df_index
+                    and dict(engine2.access_log.items()) == dict(engine.access_log.items())
+                    and engine2.scrolls[0]['last_accessed'] == '2025-02-01')
+        checkpoint = compact_state(delta_path('base.json'), chain, delta_path('compact.json'))
+        engine3 = MemoryEngine(k_modes=3)
+        engine3.load_memory_state(delta_path('compact.json'))
+        engine.recall('river ember', top_n=1, current_time='2025-02-03')
+        engine.export_delta(delta_path('d3.json'))
+        engine3.load_memory_state(delta_path('compact.json'), deltas=[delta_path('d3.json')])
+        assert_test("Compacted base accepts the next delta",
+                    checkpoint == engine2._checkpoint and engine3.codex == engine.codex
+                    and engine3.scrolls[1]['last_accessed'] == '2025-02-03')
+        try:
+            engine3.load_memory_state(delta_path('base.json'), deltas=[delta_path('d2.json')])
+            assert_test("Out-of-order delta rejected", False)
+        except ValueError:
+            assert_test("Out-of-order delta rejected", True)
+        with open(delta_path('base.json')) as f:
+            legacy = json.load(f)
+        stamped = legacy['version']
+        legacy['version'] = '3.1'
+        for key in ('checkpoint', 'log_totals', 'log_spill'):
+            legacy.pop(key, None)
+        with open(delta_path('legacy.json'), 'w') as f:
+            json.dump(legacy, f)
+        engine4 = MemoryEngine(k_modes=3)
+        engine4.load_memory_state(delta_path('legacy.json'))
+        try:
+            engine4.load_memory_state(delta_path('legacy.json'), deltas=[delta_path('d1.json')])
+            legacy_delta = False
+        except ValueError as exc:
+            legacy_delta = STATE_VERSION in str(exc)
+        assert_test("Exports are stamped with the state version; 3.1 files load without a checkpoint",
+                    stamped == STATE_VERSION and len(engine4.scrolls) == 3
+                    and engine4._checkpoint is None and legacy_delta)
+        print()
+        
+        # --- Test 25: Clustered recall (v3.2) ---
+        print("  [Clustered Recall]")
+        topics = {'mathematics': 'lattice orbit proof', 'grief': 'ocean tears mourning',
+                  'technomancy': 'compiler kernel signal'}
+        exact = MemoryEngine()
+        clustered = MemoryEngine(n_clusters=6, nprobe=6, rebalance_every=1000)
+        for n in range(36):
+            theme = list(topics)[n % 3]
+            messages = [f"{topics[theme]} variant{n % 4} detail{n}x{n % 5}"]
+            for target in (exact, clustered):
+                target.scrolls.append(target.compress_to_scroll(messages, f'2025-01-{n % 28 + 1:02d}',
+                                                                {'theme': theme}))
+        for target in (exact, clustered):
+            target.rebuild_index()
+        clusters = clustered._current_clusters()
+        assert_test("Partition covers every scroll once",
+                    len(clusters.centroids) == 6 and sorted(i for m in clusters.members for i in m)
+                    == list(range(36)) and len(set(clusters.theme_seeds.values())) == 3)
+        queries = ('lattice orbit', 'ocean variant2', 'kernel detail7x2')
+        same = lambda target, q: [r['essence'] for r in
+                                  target.recall(q, top_n=3, current_time='2025-02-01', touch=False)]
+        assert_test("Probing every cluster matches exact recall",
+                    all(same(exact, q) == same(clustered, q) for q in queries))
+        clustered.nprobe = 1
+        clustered.tracer = tracer = StageTracer()
+        same(clustered, 'lattice orbit')
+        clustered.tracer = None
+        span = tracer.spans[-1]['attrs']
+        assert_test("nprobe=1 scores one cluster's candidates",
+                    span['probed'] == 1 and span['candidates'] < 12, f"{span}")
+        ranked = lambda q, prune: [(r['essence'], r['_recall_meta']['tfidf']) for r in clustered.recall(
+            q, top_n=5, current_time='2025-02-01', touch=False, prune=prune)]
+        assert_test("Pruned clustered recall stays within the probed clusters",
+                    all(ranked(q, 'exact') == ranked(q, None) for q in queries + ('variant1 detail3x3',)))
+        clustered.update_codex(clustered.compress_to_scroll(
+            ['compiler kernel signal firmware'], '2025-01-30', {'theme': 'technomancy'}))
+        assert_test("Adds are routed incrementally",
+                    clustered._current_clusters() is clusters and len(clusters) == 37
+                    and clusters.puts == 1 and 36 in clusters.members[clusters.assignment[36]])
+        clustered.rebalance_every = 1
+        assert_test("Rebalance rebuilds the partition when due",
+                    clustered._current_clusters() is not clusters)
+        clustered.dream_resonance_threshold = 0.0
+        blocks = clustered._current_clusters().assignment
+        clustered.tracer = tracer = StageTracer()
+        bridges = clustered.dream_consolidate('2025-02-01', clustered=True)
+        clustered.tracer = None
+        block_pairs = sum(len(m) * (len(m) - 1) // 2 for m in clustered._clusters.members)
+        assert_test("Clustered dream pairs scrolls within a cluster",
+                    tracer.spans[-1]['attrs']['pairs'] <= block_pairs < 37 * 36 // 2
+                    and all(blocks[b['scroll_a']] == blocks[b['scroll_b']] for b in bridges))
+        try:
+            exact.dream_consolidate('2025-02-01', clustered=True)
+            assert_test("clustered dream requires n_clusters", False)
+        except ValueError:
+            assert_test("clustered dream requires n_clusters", True)
+        print()
+        
+        # --- Test 26: Recall cache (v3.2) ---
+        print("  [Recall Cache]")
+        engine = MemoryEngine(recall_cache_size=2)
+        for n, (theme, text) in enumerate((('mathematics', 'lattice orbit proof'),
+                                           ('grief', 'ocean tears mourning'),
+                                           ('technomancy', 'compiler kernel signal'))):
+            engine.update_codex(engine.compress_to_scroll([text], f'2025-01-0{n + 1}', {'theme': theme}))
+        first = engine.recall('lattice orbit', top_n=2, current_time='2025-02-01T10:00:00', touch=False)
+        again = engine.recall('orbit lattice', top_n=2, current_time='2025-02-01T10:20:00')
+        stats = engine.recall_cache.stats()
+        assert_test("Reordered query in the same bucket hits",
+                    stats['hits'] == 1 and stats['misses'] == 1 and stats['bytes'] > 0
+                    and [r['essence'] for r in first] == [r['essence'] for r in again]
+                    and again[0]['_recall_meta'] == first[0]['_recall_meta'])
+        assert_test("Hits still record access times",
+                    engine.scrolls[0]['last_accessed'] == '2025-02-01T10:20:00'
+                    and again[0]['last_accessed'] == '2025-02-01T10:20:00'
+                    and engine.access_log[0] == '2025-02-01T10:20:00')
+        engine.recall('lattice orbit', top_n=2, current_time='2025-02-01T12:00:00', touch=False)
+        engine.recall('lattice orbit', top_n=3, current_time='2025-02-01T10:00:00', touch=False)
+        assert_test("Time bucket and top_n are part of the key; LRU is bounded",
+                    engine.recall_cache.misses == 3 and len(engine.recall_cache) == 2)
+        engine.update_codex(engine.compress_to_scroll(
+            ['lattice orbit proof theorem'], '2025-01-05', {'theme': 'mathematics'}))
+        engine.recall('lattice orbit', top_n=3, current_time='2025-02-01T10:00:00', touch=False)
+        snap = engine.metrics.snapshot()
+        assert_test("A new generation invalidates cached rankings",
+                    engine.recall_cache.misses == 4 and len(engine.recall_cache) == 1
+                    and snap['cache_hits_total']['cache=recall'] == 1
+                    and snap['recall_cache_entries'] == 1
+                    and engine.diagnostics('2025-02-02')['recall_cache']['hit_rate'] == 0.2)
+        decays = []
+        for size in (2, 0):
+            target = MemoryEngine(recall_cache_size=size)
+            for n, text in enumerate(('lattice orbit proof', 'ocean tears mourning')):
+                target.update_codex(target.compress_to_scroll([text], f'2025-01-0{n + 1}', {'theme': 'general'}))
+            target.recall('lattice ocean', top_n=2, current_time='2025-02-01T10:00:00', touch=False)
+            target.recall('ocean tears', top_n=1, current_time='2025-02-01T10:05:00')
+            decays.append({r['essence'][0]: r['_recall_meta']['decay'] for r in target.recall(
+                'lattice ocean', top_n=2, current_time='2025-02-01T10:10:00', touch=False)})
+        assert_test("Hits are approximate: touches within the bucket are not seen",
+                    decays[0]['ocean tears mourning'] < 0.5 < decays[1]['ocean tears mourning']
+                    and target.scrolls[1]['last_accessed'] == '2025-02-01T10:05:00')
+        print()
+        
+        # --- Test 27: Query recorder (v3.2) ---
+        print("  [Query Recorder]")
+        record_path = '/tmp/test_v3.2_queries.jsonl.gz'
+        if _os.path.exists(record_path):
+            _os.unlink(record_path)
+        engine = MemoryEngine()
+        engine.update_codex(engine.compress_to_scroll(
+            ['lattice orbit proof'], '2025-01-01', {'theme': 'mathematics'}))
+        engine.recall('before recording', current_time='2025-02-01')
+        with engine.record_queries(record_path) as recorder:
+            engine.recall('lattice orbit', top_n=2, current_time='2025-02-01T10:00:00')
+            engine.recall('orbit proof', prune='bounded')
+            assert_test("Records are buffered until flush",
+                        recorder.recorded == 2 and not _os.path.exists(record_path))
+        calls = list(QueryRecorder.read(record_path))
+        assert_test("Log holds query, top_n, time and latency of each recall",
+                    [(c['q'], c['n']) for c in calls] == [('lattice orbit', 2), ('orbit proof', 3)]
+                    and calls[0]['t'] == '2025-02-01T10:00:00' and 'p' not in calls[0]
+                    and calls[1]['p'] == 'bounded' and calls[1]['t'] is not None
+                    and all(c['ms'] >= 0 for c in calls))
+        engine.recall('after recording')
+        assert_test("Recorder detaches after the block",
+                    engine.query_recorder is None and len(list(QueryRecorder.read(record_path))) == 2)
+        print()
+        
+        # --- Test 28: Memory report (v3.2) ---
+        print("  [Memory Report]")
+        engine = MemoryEngine()
+        for n, (theme, text) in enumerate((('mathematics', 'lattice orbit proof'),
+                                           ('grief', 'ocean tears mourning'))):
+            engine.update_codex(engine.compress_to_scroll([text], f'2025-01-0{n + 1}', {'theme': theme}))
+        report = engine.memory_report()
+        categories = report['categories']
+        assert_test("Every category is estimated and sums to the total",
+                    tuple(categories) == MemoryEngine.MEMORY_CATEGORIES
+                    and sum(categories.values()) == report['total_bytes']
+                    and all(categories[k] > 0 for k in ('essence', 'term_frequencies',
+                                                        'unique_terms', 'scrolls', 'df_index')))
+        assert_test("Averages divide by scrolls and vocabulary",
+                    report['scrolls'] == 2 and report['vocabulary_size'] == len(engine.df_index)
+                    and report['per_scroll']['total'] == report['total_bytes'] / 2
+                    and report['per_term']['df_index']
+                    == categories['df_index'] / report['vocabulary_size'])
+        with engine.profile_memory() as profile:
+            for n in range(20):
+                engine.update_codex(engine.compress_to_scroll(
+                    [f'manifold theorem variant{n} convergence'], f'2025-02-{n + 1:02d}',
+                    {'theme': 'mathematics'}))
+            engine.recall('manifold theorem', current_time='2025-03-01', touch=False)
+        ops = profile.report()['operations']
+        assert_test("Profile attributes growth per operation",
+                    ops['compress_to_scroll']['calls'] == 20 and ops['update_codex']['calls'] == 20
+                    and ops['recall']['calls'] == 1 and ops['dream_consolidate']['calls'] == 0
+                    and ops['update_codex']['net_bytes'] > 0)
+        assert_test("Methods and tracing are restored after the window",
+                    'update_codex' not in vars(engine) and not tracemalloc.is_tracing()
+                    and engine.memory_report()['scrolls'] == len(engine.scrolls))
+        print()
+        
+        # --- Test 29: Token-budgeted recall (v3.2) ---
+        print("  [Recall Within Budget]")
+        engine = MemoryEngine(token_counter=lambda text: len(text.split()))
+        for n, text in enumerate(('lattice orbit proof holds for every manifold theorem',
+                                  'lattice orbit',
+                                  'orbit lattice symmetry group action')):
+            engine.update_codex(engine.compress_to_scroll([text], f'2025-01-0{n + 1}',
+                                                          {'theme': 'mathematics'}))
+        ranked = engine.recall('lattice orbit', top_n=3, current_time='2025-02-01', touch=False)
+        bundle = engine.recall_within_budget('lattice orbit', 12, current_time='2025-02-01',
+                                             touch=False)
+        assert_test("Bundle fits the budget and reports its usage",
+                    0 < bundle['tokens_used'] <= 12 and bundle['max_tokens'] == 12
+                    and bundle['budget_used'] == bundle['tokens_used'] / 12
+                    and bundle['tokens_used'] == sum(len(line.split())
+                                                     for line in bundle['text'].split('\n')))
+        bundle = engine.recall_within_budget('lattice orbit', 13, current_time='2025-02-01',
+                                             touch=False)
+        assert_test("Greedy takes attention per token, not the top_n",
+                    [s['essence'] for s in bundle['scrolls']]
+                    == [r['essence'] for r in ranked[:2]]
+                    and bundle['tokens_used'] == 13 and bundle['candidates'] == 3)
+        knapsack = engine.recall_within_budget('lattice orbit', 12, current_time='2025-02-01',
+                                               method='knapsack', touch=False)
+        assert_test("Knapsack packs whole scrolls within budget",
+                    knapsack['tokens_used'] <= 12 and knapsack['scrolls']
+                    and not any(s['_recall_meta']['partial'] for s in knapsack['scrolls']))
+        lines = MemoryEngine(token_counter=lambda text: len(text.split()))
+        lines.update_codex(lines.compress_to_scroll(
+            ['The lattice proof is essential', 'orbit lattice notes', 'lattice remark'],
+            '2025-01-01', {'theme': 'mathematics'}))
+        partial = lines.recall_within_budget('lattice', 9, current_time='2025-02-01', touch=False)
+        scroll = partial['scrolls'][0]
+        assert_test("Leftover budget is filled with single essence lines",
+                    scroll['_recall_meta']['partial'] and 0 < len(scroll['essence']) < 3
+                    and scroll['_recall_meta']['tokens'] == partial['tokens_used'] <= 9)
+        cached = dict(engine._token_costs)
+        engine.recall_within_budget('lattice orbit', 100, current_time='2025-02-02')
+        assert_test("Costs are cached per scroll; only included scrolls are touched",
+                    cached and all(engine._token_costs[i] is cached[i] for i in cached)
+                    and sum(s['last_accessed'] == '2025-02-02' for s in engine.scrolls)
+                    == len(engine.scrolls))
+        print()
+        
+        # --- Test 30: Ingest dedupe (v3.2) ---
+        print("  [Ingest Dedupe]")
+        engine = MemoryEngine(dedupe_window=64)
+        long_text = 'the manifold proof holds because every orbit of the lattice converges to a fixed point'
+        first = engine.compress_to_scroll(['Retry: the compiler crashed again', long_text],
+                                          '2025-01-01', {'theme': 'mathematics'})
+        segment = ['retry:  THE compiler crashed again', long_text + ' (edited)',
+                   'a genuinely new remark about breath']
+        weighed = []
+        original_weight = engine.importance_weight
+        engine.importance_weight = lambda message, context: weighed.append(message) or original_weight(message, context)
+        scroll = engine.compress_to_scroll(segment, '2025-01-02', {'theme': 'mathematics'})
+        del engine.importance_weight
+        meta = scroll['_compression_meta']
+        assert_test("Exact and near repeats are collapsed before weighting",
+                    weighed == [segment[2]] and scroll['essence'] == [segment[2]]
+                    and engine.deduper.stats() == {'window': 3, 'checked': 5, 'exact': 1, 'near': 1})
+        assert_test("Collapsed messages still count as input",
+                    meta['input_messages'] == 3 and meta['collapsed_messages'] == 2
+                    and meta['input_chars'] == sum(len(m) for m in segment)
+                    and 'collapsed_messages' not in MemoryEngine().compress_to_scroll(
+                        segment, '2025-01-02', {'theme': 'general'})['_compression_meta'])
+        repeat = engine.compress_to_scroll(['Retry: the compiler crashed again', long_text],
+                                           '2025-01-03', {'theme': 'mathematics'})
+        assert_test("A fully repeated segment is kept whole for Form 6",
+                    repeat['essence'] == first['essence']
+                    and repeat['_compression_meta']['collapsed_messages'] == 0
+                    and engine.metrics.snapshot()['messages_collapsed_total'] == 2)
+        engine.update_codex(first)
+        echo = engine.compress_to_scroll(['Retry: the compiler crashed again', long_text, 'noise'],
+                                         '2025-01-04', {'theme': 'mathematics'}, [False, False, True])
+        assert_test("Form 6 merges sum collapsed_messages",
+                    engine.update_codex(echo)['action'] == 'merged'
+                    and engine.scrolls[0]['_compression_meta']['collapsed_messages'] == 1
+                    and engine.scrolls[0]['_compression_meta']['input_messages'] == 5)
+        segments = [(['shared opening line for the ingest test run', f'message number {n}'],
+                     f'2025-01-{n + 1:02d}', {'theme': 'general'}) for n in range(6)]
+        serial, pooled = MemoryEngine(dedupe_window=64), MemoryEngine(dedupe_window=64)
+        for args in segments:
+            serial.update_codex(serial.compress_to_scroll(*args))
+        pooled.ingest_many(segments, batch_size=2)
+        assert_test("ingest_many dedupes in input order like the serial path",
+                    [s['essence'] for s in serial.scrolls] == [s['essence'] for s in pooled.scrolls]
+                    and pooled.diagnostics('2025-02-01')['dedupe']['exact'] == 5)
+        assert_test("SimHash fingerprints are unchanged by the pure-Python kernel",
+                    [MessageDeduper.fingerprint(text.split()) for text in
+                     ('the manifold proof holds because every orbit of the lattice converges', 'a b c', 'x')]
+                    == [0xdae5fd49af6521e7, 0xe081494960bfff6b, 0xce2a0a18cdc1683])
+        probe = ("import sys, memory_engine_v3_1 as m; e = m.MemoryEngine(dedupe_window=64); "
+                 f"e.update_codex(e.compress_to_scroll([{long_text!r}] * 2, '2025-01-01', {{'theme': 'general'}})); "
+                 f"e.update_codex(e.compress_to_scroll([{long_text + ' (edited)'!r}, 'new'], '2025-01-02', {{'theme': 'general'}})); "
+                 "print(e.deduper.stats()['near'], 'numpy' in sys.modules)")
+        probe_out = _subprocess.run([_sys.executable, '-c', probe], capture_output=True, text=True,
+                                    cwd=_os.path.dirname(_os.path.abspath(__file__)))
+        assert_test("Small ingest with dedupe never imports NumPy", probe_out.stdout.strip() == '1 False',
+                    probe_out.stderr.strip()[-200:] or probe_out.stdout)
+        print()
+        
+        # --- Test 31: Copy-on-write forks (v3.2) ---
+        print("  [Engine Fork]")
+        engine = MemoryEngine()
+        texts = ['the manifold proof holds because every orbit converges',
+                 'breath and stillness in the morning practice',
+                 'the compiler crashed while linking the kernel module']
+        for n, text in enumerate(texts):
+            engine.update_codex(engine.compress_to_scroll([text], f'2025-01-0{n + 1}', {'theme': 'general'}))
+        before = engine.recall('manifold orbit', current_time='2025-01-04', touch=False)
+        trial = engine.fork()
+        shared = all(a is b for a, b in zip(engine.scrolls, trial.scrolls)) and trial._index is engine._index
+        trial.update_codex(trial.compress_to_scroll([texts[0] + ' again'], '2025-01-05', {'theme': 'general'}))
+        trial.update_codex(trial.compress_to_scroll(['a brand new remark about gardens'],
+                                                    '2025-01-06', {'theme': 'general'}))
+        trial.recall('breath stillness', top_n=1, current_time='2025-01-07')
+        assert_test("A fork shares scrolls and index until it writes",
+                    shared and trial.scrolls[1] is not engine.scrolls[1]
+                    and trial.scrolls[2] is engine.scrolls[2] and trial._index is not engine._index)
+        assert_test("Writes to the fork leave the parent untouched",
+                    len(engine.scrolls) == 3 and engine.merge_log.total == 0
+                    and engine.scrolls[1]['last_accessed'] != '2025-01-07'
+                    and engine.recall('manifold orbit', current_time='2025-01-04', touch=False) == before)
+        diff = trial.diff()
+        assert_test("diff() lists added, changed and accessed scrolls",
+                    diff == {'added': [3], 'changed': [0], 'accessed': [1], 'merge_log': 1,
+                             'dream_log': 0, 'parent_changed': False})
+        assert_test("commit() applies the diff to the parent",
+                    trial.commit() == diff and len(engine.scrolls) == 4 and engine.merge_log.total == 1
+                    and engine.scrolls[1]['last_accessed'] == '2025-01-07'
+                    and engine.df_index == trial.df_index and engine.codex == trial.codex
+                    and trial.diff()['added'] == [])
+        committed = engine.recall('gardens manifold', current_time='2025-01-08', touch=False)
+        engine._index = engine._clusters = None
+        assert_test("The parent's index matches a rebuild after commit",
+                    engine.recall('gardens manifold', current_time='2025-01-08', touch=False) == committed)
+        stale = engine.fork()
+        engine.update_codex(engine.compress_to_scroll(['another remark entirely'], '2025-01-09', {'theme': 'general'}))
+        try:
+            stale.commit()
+            refused = False
+        except RuntimeError:
+            refused = True
+        try:
+            engine.diff()
+            not_fork = False
+        except ValueError:
+            not_fork = True
+        assert_test("commit() refuses once the parent changed", refused and not_fork)
+        share, copies = _CowShare(), []
+        share.join()
+        share.detach(lambda: copies.append(share._lock.locked()))
+        share.detach(lambda: copies.append('last holder copied'))
+        assert_test("Only a holder that others still share with copies, under the share lock",
+                    copies == [True] and share.holders == 0)
+        print()
+        
         print(f"  Results: {passed} passed, {failed} failed")
         print()
         return failed == 0